@@ -0,0 +1,114 @@
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class ConversationMetrics:
+    call_duration_seconds: float
+    agent_talk_ratio: Optional[float]
+    silence_seconds: float
+    overlap_seconds: float
+    interruption_count: int
+    longest_monologue_seconds: float
+    longest_monologue_speaker: Optional[str]
+    agent_words_per_minute: Optional[float]
+    customer_words_per_minute: Optional[float]
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def word_timings_from_transcript(transcript_response: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extract per-word timings from raw AWS Transcribe output.
+
+    Returns:
+        (starts, ends, speakers) arrays in time order; speakers holds the labels (e.g. "spk_0")
+    """
+    items = [
+        item for item in transcript_response.get('results', {}).get('items', [])
+        if item.get('type') == 'pronunciation' and 'start_time' in item
+    ]
+    starts = np.fromiter((float(item['start_time']) for item in items), dtype=np.float64, count=len(items))
+    ends = np.fromiter(
+        (float(item.get('end_time', item['start_time'])) for item in items),
+        dtype=np.float64,
+        count=len(items)
+    )
+    speakers = np.array([item.get('speaker_label', 'spk_0') for item in items], dtype=str)
+
+    order = np.argsort(starts, kind="stable")
+    return starts[order], ends[order], speakers[order]
+
+
+def compute_conversation_metrics(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        speakers: np.ndarray,
+        agent_label: str = "spk_0",
+        customer_label: str = "spk_1"
+) -> ConversationMetrics:
+    """
+    Compute call-level conversation metrics from word timings in one vectorized pass.
+
+    Args:
+        starts: Word start times in seconds, sorted ascending
+        ends: Word end times in seconds
+        speakers: Speaker label per word
+        agent_label: Speaker label of the agent
+        customer_label: Speaker label of the customer
+
+    Returns:
+        ConversationMetrics for the call
+    """
+    if len(starts) == 0:
+        return ConversationMetrics(0.0, None, 0.0, 0.0, 0, 0.0, None, None, None)
+
+    labels, codes = np.unique(speakers, return_inverse=True)
+    durations = np.maximum(ends - starts, 0.0)
+
+    # Talk time and word counts per speaker
+    talk_time = np.bincount(codes, weights=durations, minlength=len(labels))
+    word_count = np.bincount(codes, minlength=len(labels))
+
+    # Silence: gaps between the furthest end reached so far and the next word start
+    reach = np.maximum.accumulate(ends)
+    gaps = starts[1:] - reach[:-1]
+    silence = float(gaps[gaps > 0].sum())
+
+    # Overlap and interruptions: a speaker starts while the previous word is still going
+    change = codes[1:] != codes[:-1]
+    overlap = np.clip(np.minimum(ends[:-1], ends[1:]) - starts[1:], 0.0, None)
+    overlapping_changes = change & (overlap > 0)
+
+    # Monologues: runs of consecutive words by the same speaker
+    run_starts = np.flatnonzero(np.concatenate(([True], change)))
+    run_ends = np.maximum.reduceat(ends, run_starts)
+    run_lengths = run_ends - starts[run_starts]
+    longest = int(np.argmax(run_lengths))
+
+    def share(label: str) -> Optional[int]:
+        index = np.searchsorted(labels, label)
+        return int(index) if index < len(labels) and labels[index] == label else None
+
+    agent, customer = share(agent_label), share(customer_label)
+    total_talk = float(talk_time.sum())
+
+    def words_per_minute(index: Optional[int]) -> Optional[float]:
+        if index is None or talk_time[index] <= 0:
+            return None
+        return float(word_count[index] / talk_time[index] * 60.0)
+
+    return ConversationMetrics(
+        call_duration_seconds=float(reach[-1] - starts[0]),
+        agent_talk_ratio=float(talk_time[agent] / total_talk) if agent is not None and total_talk > 0 else None,
+        silence_seconds=silence,
+        overlap_seconds=float(overlap[change].sum()),
+        interruption_count=int(overlapping_changes.sum()),
+        longest_monologue_seconds=float(run_lengths[longest]),
+        longest_monologue_speaker=str(labels[codes[run_starts[longest]]]),
+        agent_words_per_minute=words_per_minute(agent),
+        customer_words_per_minute=words_per_minute(customer)
+    )
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+
+from app.analytics.quantile_sketch import QuantileSketch
+
+# Rollup column prefix -> InteractionMetric score column
+ROLLUP_METRICS: Dict[str, str] = {
+    "grade": "internal_qa_score",
+    "csat": "csat_score",
+}
+
+SUMMARY_QUANTILES = (0.5, 0.9)
+
+
+def month_start(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+@dataclass
+class MetricAggregate:
+    """Count, sum, min/max and quantile sketch of one score over an agent-month."""
+    count: int = 0
+    total: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.sketch.add(value)
+
+    def remove(self, value: float) -> bool:
+        """
+        Take a previously added value back out.
+
+        Returns:
+            True if min/max may now be stale and have to be recomputed from the contributions
+        """
+        self.count -= 1
+        self.total -= value
+        self.sketch.add(value, count=-1)
+        if self.count <= 0:
+            self.count, self.total, self.minimum, self.maximum = 0, 0.0, None, None
+            return False
+        return value == self.minimum or value == self.maximum
+
+    def merge(self, other: "MetricAggregate") -> None:
+        self.count += other.count
+        self.total += other.total
+        if other.minimum is not None:
+            self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        if other.maximum is not None:
+            self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+
+    def summary(self, quantiles: Iterable[float] = SUMMARY_QUANTILES) -> dict:
+        result = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+        for q in quantiles:
+            value = self.sketch.quantile(q) if self.count else None
+            # The sketch is approximate; never report a quantile outside the exact range
+            if value is not None:
+                value = min(max(value, self.minimum), self.maximum)
+            result[f"p{round(q * 100)}"] = value
+        return result
+
+    def to_columns(self, prefix: str) -> dict:
+        return {
+            f"{prefix}_count": self.count,
+            f"{prefix}_sum": self.total,
+            f"{prefix}_min": self.minimum,
+            f"{prefix}_max": self.maximum,
+            f"{prefix}_sketch": self.sketch.to_json() if self.count else None,
+        }
+
+    @classmethod
+    def from_columns(cls, prefix: str, row) -> "MetricAggregate":
+        return cls(
+            count=row[f"{prefix}_count"] or 0,
+            total=row[f"{prefix}_sum"] or 0.0,
+            minimum=row[f"{prefix}_min"],
+            maximum=row[f"{prefix}_max"],
+            sketch=QuantileSketch.from_json(row[f"{prefix}_sketch"])
+        )
@@ -0,0 +1,87 @@
+import json
+import math
+from typing import Dict, Optional
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch for non-negative scores (log-bucketed, DDSketch style).
+
+    Values are counted in buckets whose width grows geometrically, so any quantile
+    is returned within `relative_accuracy` of the true value. Two sketches built
+    with the same accuracy merge by adding bucket counts, and a value is removed
+    by adding it with count=-1. Values at or below zero share a single bucket.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= 0:
+            self.zero_count += count
+            return
+        key = self._key(value)
+        total = self.bins.get(key, 0) + count
+        if total:
+            self.bins[key] = total
+        else:
+            self.bins.pop(key, None)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            total = self.bins.get(key, 0) + count
+            if total:
+                self.bins[key] = total
+            else:
+                self.bins.pop(key, None)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), or None if the sketch is empty."""
+        total = self.count
+        if total <= 0:
+            return None
+        rank = round(q * (total - 1))
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.bins))
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "a": self.relative_accuracy,
+            "z": self.zero_count,
+            "b": {str(key): self.bins[key] for key in sorted(self.bins)}
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, data: Optional[str], relative_accuracy: float = 0.01) -> "QuantileSketch":
+        if not data:
+            return cls(relative_accuracy)
+        payload = json.loads(data)
+        sketch = cls(payload.get("a", relative_accuracy))
+        sketch.zero_count = payload.get("z", 0)
+        sketch.bins = {int(key): count for key, count in payload.get("b", {}).items()}
+        return sketch
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Body, status
 from typing import List
 import uuid
 
+from app.core.responses import FastJSONResponse
 from app.schemas.document import (
     DocumentResponse, DocumentCreate, DocumentUpdate,
     DocumentSearchQuery, DocumentSearchResponse
@@ -52,7 +53,8 @@ async def read_all_documents(
     doc_service: DocumentService = Depends(get_document_service)
 ):
     documents = await doc_service.get_all_documents(skip=skip, limit=limit)
-    return documents
+    # Already DocumentResponse models: encode them without validating again
+    return FastJSONResponse(documents)
 
 @router.put(
     "/{doc_id}",
@@ -97,7 +99,7 @@ async def search_documents_endpoint(
     doc_service: DocumentService = Depends(get_document_service)
 ):
     search_results = await doc_service.search_documents(search_query=search_params)
-    return search_results
+    return FastJSONResponse(search_results)
 
 # LLM-powered Endpoints (Placeholders for US2, US3)
 @router.post(
@@ -1,11 +1,12 @@
-from datetime import datetime
-
 from fastapi import FastAPI, HTTPException, APIRouter
-import boto3
+from fastapi.concurrency import run_in_threadpool
 import uuid
 
 from pydantic import BaseModel
 
+from app.call.meeting_pool import MeetingPool, create_meeting_with_attendees
+from app.call.meeting_store import create_meeting_store
+from app.core.clients import clients
 from app.core.config import settings
 
 router = APIRouter(
@@ -13,16 +14,26 @@ router = APIRouter(
     tags=["call"]
 )
 
-# Initialize Chime client
-chime_sdk = boto3.client(
-    'chime-sdk-meetings',
-    region_name='ap-southeast-1',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
-)
+# Chime client, created on first use (see app.core.clients)
+chime_sdk = clients.lazy("chime")
+
+# Expiring meeting storage; use a shared backend when running several workers
+meetings_db = create_meeting_store(settings)
+
 
-# In-memory storage for hackathon
-meetings_db = {}
+# Optional pool of pre-created meetings (CHIME_MEETING_POOL_SIZE > 0), started by the app lifespan
+meeting_pool = MeetingPool(
+    chime_sdk,
+    size=settings.CHIME_MEETING_POOL_SIZE,
+    max_age_seconds=settings.CHIME_MEETING_POOL_MAX_AGE_SECONDS
+) if settings.CHIME_MEETING_POOL_SIZE > 0 else None
+
+
+async def _store(method, *args):
+    """Call a meeting store method, off the event loop if the backend does I/O"""
+    if meetings_db.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
 
 
 class CreateMeetingRequest(BaseModel):
@@ -34,46 +45,28 @@ async def create_meeting(request: CreateMeetingRequest):
     """Create a new one-on-one meeting"""
     try:
         meeting_id = str(uuid.uuid4())
-        external_meeting_id = f"meeting-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-
-        # Create meeting with required parameters
-        meeting_response = chime_sdk.create_meeting(
-            ClientRequestToken=meeting_id,
-            MediaRegion='ap-southeast-1',
-            ExternalMeetingId=external_meeting_id,  # Required parameter
-            MeetingFeatures={
-                'Audio': {'EchoReduction': 'AVAILABLE'}
-            }
-        )
-
-        # Create agent attendee
-        agent_attendee = chime_sdk.create_attendee(
-            MeetingId=meeting_response['Meeting']['MeetingId'],
-            ExternalUserId=f"agent-{request.agent_id}"
-        )
-
-        # Create customer attendee
-        customer_attendee = chime_sdk.create_attendee(
-            MeetingId=meeting_response['Meeting']['MeetingId'],
-            ExternalUserId=f"customer-{uuid.uuid4()}"
-        )
+
+        # Take a pre-created meeting when the pool has one, otherwise create it now
+        meeting_data = meeting_pool.take() if meeting_pool else None
+        if meeting_data is None:
+            meeting_data = await create_meeting_with_attendees(
+                chime_sdk,
+                agent_user_id=f"agent-{request.agent_id}",
+                customer_user_id=f"customer-{uuid.uuid4()}",
+                request_token=meeting_id
+            )
 
         # Store meeting data
-        meetings_db[meeting_id] = {
-            'meeting': meeting_response['Meeting'],
-            'agent_attendee': agent_attendee['Attendee'],
-            'customer_attendee': customer_attendee['Attendee'],
-            'external_meeting_id': external_meeting_id
-        }
+        await _store(meetings_db.put, meeting_id, {**meeting_data, 'agent_id': request.agent_id})
 
         return {
             "meeting_id": meeting_id,
             "agent_join_data": {
-                "meeting": meeting_response['Meeting'],
-                "attendee": agent_attendee['Attendee']
+                "meeting": meeting_data['meeting'],
+                "attendee": meeting_data['agent_attendee']
             },
             "customer_join_link": f"/get-customer-join-data/{meeting_id}",
-            "external_meeting_id": external_meeting_id
+            "external_meeting_id": meeting_data['external_meeting_id']
         }
 
     except Exception as e:
@@ -84,7 +77,7 @@ async def create_meeting(request: CreateMeetingRequest):
 async def get_customer_join_data(meeting_id: str):
     """Get customer join data"""
     try:
-        meeting_data = meetings_db.get(meeting_id)
+        meeting_data = await _store(meetings_db.get, meeting_id)
         if not meeting_data:
             raise HTTPException(status_code=404, detail="Meeting not found")
 
@@ -92,6 +85,8 @@ async def get_customer_join_data(meeting_id: str):
             "meeting": meeting_data['meeting'],
             "attendee": meeting_data['customer_attendee']
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -99,6 +94,6 @@ async def get_customer_join_data(meeting_id: str):
 @router.get("/meeting-info/{meeting_id}")
 async def get_meeting_info(meeting_id: str):
     """Check meeting status"""
-    if meeting_id not in meetings_db:
+    if await _store(meetings_db.get, meeting_id) is None:
         raise HTTPException(status_code=404, detail="Meeting not found")
     return {"status": "active", "meeting_id": meeting_id}
\ No newline at end of file
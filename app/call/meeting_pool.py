@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+async def create_meeting_with_attendees(
+        client: Any,
+        agent_user_id: str,
+        customer_user_id: str,
+        request_token: Optional[str] = None
+) -> dict:
+    """
+    Create a Chime meeting and both attendees in two round trips, off the event loop.
+
+    Both attendees are created with a single batch_create_attendee call.
+    """
+    external_meeting_id = f"meeting-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    meeting_response = await run_in_threadpool(
+        client.create_meeting,
+        ClientRequestToken=request_token or str(uuid.uuid4()),
+        MediaRegion='ap-southeast-1',
+        ExternalMeetingId=external_meeting_id,  # Required parameter
+        MeetingFeatures={
+            'Audio': {'EchoReduction': 'AVAILABLE'}
+        }
+    )
+    meeting = meeting_response['Meeting']
+
+    attendees_response = await run_in_threadpool(
+        client.batch_create_attendee,
+        MeetingId=meeting['MeetingId'],
+        Attendees=[
+            {'ExternalUserId': agent_user_id},
+            {'ExternalUserId': customer_user_id}
+        ]
+    )
+    if attendees_response.get('Errors'):
+        raise RuntimeError(f"Failed to create attendees: {attendees_response['Errors']}")
+    attendees = {attendee['ExternalUserId']: attendee for attendee in attendees_response['Attendees']}
+
+    return {
+        'meeting': meeting,
+        'agent_attendee': attendees[agent_user_id],
+        'customer_attendee': attendees[customer_user_id],
+        'external_meeting_id': external_meeting_id
+    }
+
+
+class MeetingPool:
+    """
+    Keeps `size` Chime meetings (with agent and customer attendees) ready to hand out.
+
+    A background task replenishes the pool after every take. Chime ends meetings
+    nobody joins within about five minutes, so pooled meetings older than
+    `max_age_seconds` are discarded and replaced. Pooled agent attendees carry a
+    generic "agent-pool-..." external user ID; the real agent is recorded in the
+    meeting store.
+    """
+
+    def __init__(self, client: Any, size: int, max_age_seconds: float = 240.0, refill_concurrency: int = 2):
+        self.client = client
+        self.size = size
+        self.max_age_seconds = max_age_seconds
+        self.refill_concurrency = max(refill_concurrency, 1)
+        self._ready: Deque[Tuple[float, dict]] = deque()
+        self._creating = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Deletes of expired meetings still in flight; held so they are not garbage-collected mid-call
+        self._pending_deletes: Set[asyncio.Task] = set()
+
+    @property
+    def available(self) -> int:
+        return len(self._ready)
+
+    def take(self) -> Optional[dict]:
+        """Pop a ready meeting, or None if the pool is empty."""
+        deadline = time.monotonic() - self.max_age_seconds
+        entry = None
+        while self._ready:
+            created_at, candidate = self._ready.popleft()
+            if created_at > deadline:
+                entry = candidate
+                break
+        self._wakeup.set()
+        return entry
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending_deletes:
+            await asyncio.gather(*self._pending_deletes, return_exceptions=True)
+        # Release meetings nobody will use
+        while self._ready:
+            _, entry = self._ready.popleft()
+            await self._delete(entry)
+
+    async def _create_one(self) -> None:
+        token = uuid.uuid4().hex
+        try:
+            entry = await create_meeting_with_attendees(
+                self.client,
+                agent_user_id=f"agent-pool-{token}",
+                customer_user_id=f"customer-{uuid.uuid4()}"
+            )
+            self._ready.append((time.monotonic(), entry))
+        except Exception as e:
+            logger.warning("failed to pre-create meeting: %s", e)
+            await asyncio.sleep(1)
+        finally:
+            self._creating -= 1
+
+    async def _delete(self, entry: dict) -> None:
+        try:
+            await run_in_threadpool(self.client.delete_meeting, MeetingId=entry['meeting']['MeetingId'])
+        except Exception:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            # Drop meetings that are about to be ended by Chime
+            deadline = time.monotonic() - self.max_age_seconds
+            while self._ready and self._ready[0][0] <= deadline:
+                _, stale = self._ready.popleft()
+                task = asyncio.create_task(self._delete(stale))
+                self._pending_deletes.add(task)
+                task.add_done_callback(self._pending_deletes.discard)
+
+            missing = self.size - len(self._ready) - self._creating
+            batch = min(missing, self.refill_concurrency)
+            if batch > 0:
+                self._creating += batch
+                await asyncio.gather(*(self._create_one() for _ in range(batch)))
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.max_age_seconds / 4)
+            except asyncio.TimeoutError:
+                pass
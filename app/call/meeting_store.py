@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import Column, Float, MetaData, String, Table, Text, delete, insert, select
+from sqlalchemy.engine import Engine
+
+from app.core.database import sqlite_wal_engine
+
+
+class MeetingStore(ABC):
+    """
+    Storage for active meetings, keyed by our meeting_id.
+
+    Entries expire `ttl_seconds` after they were stored. Backends that do I/O set
+    `blocking = True` so callers know to run them off the event loop.
+    """
+
+    blocking = True
+
+    def __init__(self, ttl_seconds: float, sweep_interval: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+
+    @abstractmethod
+    def get(self, meeting_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def put(self, meeting_id: str, data: dict) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, meeting_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Remove expired meetings; returns how many were removed."""
+        ...
+
+    def _maybe_sweep(self) -> None:
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            self.sweep()
+
+
+class InMemoryMeetingStore(MeetingStore):
+    """
+    Per-process store with a fixed TTL and an LRU cap on the number of meetings.
+    Lookups are O(1); expired entries are dropped on access and by periodic sweeps.
+    """
+
+    blocking = False
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000, sweep_interval: float = 60.0):
+        super().__init__(ttl_seconds, sweep_interval)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, meeting_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(meeting_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[meeting_id]
+                return None
+            self._entries.move_to_end(meeting_id)
+            return entry[1]
+
+    def put(self, meeting_id: str, data: dict) -> None:
+        with self._lock:
+            self._entries[meeting_id] = (time.time() + self.ttl_seconds, data)
+            self._entries.move_to_end(meeting_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._maybe_sweep()
+
+    def delete(self, meeting_id: str) -> None:
+        with self._lock:
+            self._entries.pop(meeting_id, None)
+
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+        return len(expired)
+
+
+class SQLMeetingStore(MeetingStore):
+    """
+    Store shared by all workers, backed by any SQLAlchemy engine (SQLite in WAL
+    mode locally, or the application's Postgres database).
+    """
+
+    def __init__(self, engine: Engine, ttl_seconds: float, sweep_interval: float = 60.0):
+        super().__init__(ttl_seconds, sweep_interval)
+        self.engine = engine
+        metadata = MetaData()
+        self.table = Table(
+            "meeting_store",
+            metadata,
+            Column("meeting_id", String(64), primary_key=True),
+            Column("data", Text, nullable=False),
+            Column("expires_at", Float, nullable=False, index=True),
+        )
+        metadata.create_all(engine)
+
+    def get(self, meeting_id: str) -> Optional[dict]:
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                select(self.table.c.data).where(
+                    self.table.c.meeting_id == meeting_id,
+                    self.table.c.expires_at > time.time()
+                )
+            ).first()
+        return json.loads(row[0]) if row else None
+
+    def put(self, meeting_id: str, data: dict) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(self.table).where(self.table.c.meeting_id == meeting_id))
+            connection.execute(
+                insert(self.table).values(
+                    meeting_id=meeting_id,
+                    data=json.dumps(data, default=str),
+                    expires_at=time.time() + self.ttl_seconds
+                )
+            )
+        self._maybe_sweep()
+
+    def delete(self, meeting_id: str) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(self.table).where(self.table.c.meeting_id == meeting_id))
+
+    def sweep(self) -> int:
+        with self.engine.begin() as connection:
+            result = connection.execute(delete(self.table).where(self.table.c.expires_at <= time.time()))
+        return result.rowcount
+
+
+def create_meeting_store(settings) -> MeetingStore:
+    """Build the meeting store selected by MEETING_STORE_BACKEND."""
+    backend = settings.MEETING_STORE_BACKEND
+    if backend == "memory":
+        return InMemoryMeetingStore(
+            ttl_seconds=settings.MEETING_TTL_SECONDS,
+            max_entries=settings.MEETING_STORE_MAX_ENTRIES,
+            sweep_interval=settings.MEETING_STORE_SWEEP_SECONDS
+        )
+    if backend == "sqlite":
+        os.makedirs(os.path.dirname(os.path.abspath(settings.MEETING_STORE_SQLITE_PATH)), exist_ok=True)
+        return SQLMeetingStore(
+            sqlite_wal_engine(settings.MEETING_STORE_SQLITE_PATH),
+            ttl_seconds=settings.MEETING_TTL_SECONDS,
+            sweep_interval=settings.MEETING_STORE_SWEEP_SECONDS
+        )
+    if backend == "database":
+        from app.core.database import engine
+        return SQLMeetingStore(
+            engine,
+            ttl_seconds=settings.MEETING_TTL_SECONDS,
+            sweep_interval=settings.MEETING_STORE_SWEEP_SECONDS
+        )
+    raise ValueError(f"Unknown MEETING_STORE_BACKEND '{backend}'. Use memory, sqlite or database")
@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.routing import Match
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry, metrics_registry
+from app.core.responses import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Retry-After never asks clients to wait longer than this
+MAX_RETRY_AFTER_SECONDS = 120
+
+
+class AdmissionLimiter:
+    """
+    Admission for one class of endpoints in this worker: at most
+    `max_concurrent` requests, and with `max_bytes` set at most that many
+    declared request body bytes, are in flight; up to `max_queue` more wait
+    in arrival order, each for at most `queue_timeout` seconds.
+
+    Anything beyond that is shed straight away instead of piling up threads,
+    memory and timeouts: 429 when the queue is full, 503 when a queued
+    request's deadline passes, 413 for a body larger than `max_bytes`. Shed
+    responses carry a Retry-After estimated from recent service times.
+
+    Only the event loop thread uses a limiter, so there are no locks.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            max_concurrent: int,
+            max_queue: int,
+            queue_timeout: float,
+            max_bytes: Optional[int] = None,
+            min_retry_after: int = 1,
+            registry: MetricsRegistry = metrics_registry
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_bytes = max_bytes
+        self.min_retry_after = min_retry_after
+        self.registry = registry
+        self.in_flight = 0
+        self.bytes_in_flight = 0
+        # Moving average of how long admitted requests take, for Retry-After
+        self.service_seconds: Optional[float] = None
+        self._waiters: Deque[Tuple[asyncio.Future, int]] = deque()
+        registry.admission[name] = self
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until the requests ahead of a new one should have drained"""
+        service = self.service_seconds or float(self.min_retry_after)
+        estimate = math.ceil(service * (self.waiting + 1) / self.max_concurrent)
+        return min(MAX_RETRY_AFTER_SECONDS, max(self.min_retry_after, estimate))
+
+    @asynccontextmanager
+    async def admit(self, size: int = 0) -> AsyncIterator[None]:
+        """Hold a slot (and `size` bytes) for the duration of the block"""
+        await self.acquire(size)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(size, time.perf_counter() - started)
+
+    async def acquire(self, size: int = 0) -> None:
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.registry.observe_admission(self.name, "too_large")
+            raise HTTPException(
+                status_code=413,
+                detail=f"Request body of {size} bytes exceeds the {self.max_bytes} byte limit"
+            )
+        if not self._waiters and self._fits(size):
+            self._take(size)
+            self.registry.observe_admission(self.name, "admitted", 0.0)
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._shed(429, "queue_full", f"Too many {self.name} requests in progress, retry later")
+
+        started = time.perf_counter()
+        entry = (asyncio.get_running_loop().create_future(), size)
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(entry[0], self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not self._granted(entry[0]):
+                self._discard(entry)
+                self._shed(503, "timeout", f"Timed out waiting for a {self.name} slot, retry later")
+            # Granted just as the deadline passed: go ahead
+        except asyncio.CancelledError:
+            # The client went away while queued
+            if self._granted(entry[0]):
+                self.release(size)
+            else:
+                self._discard(entry)
+            raise
+        self.registry.observe_admission(self.name, "admitted", time.perf_counter() - started)
+
+    def release(self, size: int = 0, seconds: Optional[float] = None) -> None:
+        """Give back a slot; `seconds` is how long the request was served"""
+        if seconds is not None:
+            self.service_seconds = seconds if self.service_seconds is None else 0.8 * self.service_seconds + 0.2 * seconds
+        self.in_flight -= 1
+        self.bytes_in_flight -= size
+        self._wake()
+
+    def _fits(self, size: int) -> bool:
+        if self.in_flight >= self.max_concurrent:
+            return False
+        return self.max_bytes is None or self.bytes_in_flight + size <= self.max_bytes
+
+    def _take(self, size: int) -> None:
+        self.in_flight += 1
+        self.bytes_in_flight += size
+
+    def _wake(self) -> None:
+        # Strict arrival order, so a large upload at the head is not starved by small ones
+        while self._waiters:
+            future, size = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if not self._fits(size):
+                break
+            self._waiters.popleft()
+            self._take(size)
+            future.set_result(None)
+
+    def _discard(self, entry: Tuple[asyncio.Future, int]) -> None:
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            pass
+        # The head may have been what held the others back
+        self._wake()
+
+    @staticmethod
+    def _granted(future: asyncio.Future) -> bool:
+        return future.done() and not future.cancelled()
+
+    def _shed(self, status_code: int, outcome: str, detail: str) -> None:
+        self.registry.observe_admission(self.name, outcome)
+        raise HTTPException(status_code=status_code, detail=detail, headers={"Retry-After": str(self.retry_after())})
+
+    def status(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "bytes_in_flight": self.bytes_in_flight,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "max_bytes": self.max_bytes,
+            "retry_after": self.retry_after(),
+        }
+
+
+class AdmissionController:
+    """
+    Maps routes to the limiter of their endpoint class. `routes` keys are
+    "METHOD /route/template", the same labels as request metrics, e.g.
+    "GET /transcribe/helper/{job_id}"; unlisted routes are not limited.
+    Routes are bound to limiters on the first request, once the app has all
+    of its routes.
+    """
+
+    def __init__(self, limiters: Dict[str, AdmissionLimiter], routes: Dict[str, str], enabled: bool = True):
+        self.limiters = limiters
+        self.routes = routes
+        self.enabled = enabled
+        self._bound: Optional[List[tuple]] = None
+
+    def bind(self, app_routes) -> None:
+        bound = []
+        found = set()
+        for route in app_routes:
+            for method in sorted(getattr(route, "methods", None) or ()):
+                key = f"{method} {route.path}"
+                if key not in self.routes:
+                    continue
+                found.add(key)
+                limiter = self.limiters.get(self.routes[key])
+                if limiter is None:
+                    logger.warning("admission route %r names unknown class %r", key, self.routes[key])
+                    continue
+                bound.append((method, route, limiter))
+        for key in self.routes.keys() - found:
+            logger.warning("admission route %r matches no endpoint", key)
+        self._bound = bound
+
+    def match(self, scope) -> Optional[AdmissionLimiter]:
+        """The limiter for a request, leaving the matched route in the scope as the router would"""
+        if self._bound is None:
+            self.bind(scope["app"].routes)
+        for method, route, limiter in self._bound:
+            if method != scope["method"]:
+                continue
+            match, child_scope = route.matches(scope)
+            if match is Match.FULL:
+                scope.update(child_scope)
+                return limiter
+        return None
+
+    def status(self) -> dict:
+        return {name: limiter.status() for name, limiter in self.limiters.items()}
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware putting requests to limited routes through their
+    class's AdmissionLimiter before the body is read, and holding the slot
+    until the response is sent. Shed requests get a JSON error response
+    with Retry-After without reaching the endpoint.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.controller.enabled:
+            await self.app(scope, receive, send)
+            return
+        limiter = self.controller.match(scope)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        size = _content_length(scope)
+        if size is None:
+            # Chunked body of unknown size: charge a fair share of the byte budget
+            size = limiter.max_bytes // limiter.max_concurrent if limiter.max_bytes else 0
+        try:
+            await limiter.acquire(size)
+        except HTTPException as e:
+            response = FastJSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(size, time.perf_counter() - started)
+
+
+def _content_length(scope) -> Optional[int]:
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+# Endpoint classes of this worker, installed by main.py and reported on /metrics
+admission = AdmissionController(
+    limiters={
+        "upload": AdmissionLimiter(
+            "upload",
+            max_concurrent=settings.ADMISSION_UPLOAD_CONCURRENCY,
+            max_queue=settings.ADMISSION_UPLOAD_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            max_bytes=settings.ADMISSION_UPLOAD_MAX_BYTES,
+            min_retry_after=settings.ADMISSION_MIN_RETRY_AFTER_SECONDS
+        ),
+        "llm": AdmissionLimiter(
+            "llm",
+            max_concurrent=settings.ADMISSION_LLM_CONCURRENCY,
+            max_queue=settings.ADMISSION_LLM_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+            min_retry_after=settings.ADMISSION_MIN_RETRY_AFTER_SECONDS
+        ),
+    },
+    routes=settings.ADMISSION_ROUTES,
+    enabled=settings.ADMISSION_ENABLED
+)
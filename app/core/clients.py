@@ -0,0 +1,154 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from app.core.config import settings
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class ClientRegistry:
+    """
+    External service clients (boto3, OpenAI), created on first use and cached
+    per process.
+
+    Nothing is built at import, so a worker boots without credentials or the
+    ~100 ms a boto3 client takes to load its service model. Clients created
+    before a fork are never handed to the child: the cache is dropped when
+    the process id changes. Creation is serialised because boto3's default
+    session is not thread-safe.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._clients: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.creation_seconds: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        override = self._overrides.get(name)
+        if override is not None:
+            return override
+        if self._pid != os.getpid():
+            self._forget()
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    started = time.perf_counter()
+                    client = self._clients[name] = self._factories[name]()
+                    self.creation_seconds[name] = time.perf_counter() - started
+        return client
+
+    def lazy(self, name: str) -> "LazyClient":
+        """A stand-in for module-level names that resolves the client when first used"""
+        if name not in self._factories:
+            raise KeyError(f"No client registered as {name!r}")
+        return LazyClient(self, name)
+
+    def override(self, name: str, client: Any) -> None:
+        """Serve `client` instead of building one (benchmarks and local fakes); None removes it"""
+        if client is None:
+            self._overrides.pop(name, None)
+        else:
+            self._overrides[name] = client
+
+    def create_all(self) -> Dict[str, str]:
+        """Create every registered client now (warmup); returns the errors by client name"""
+        errors = {}
+        for name in self._factories:
+            try:
+                self.get(name)
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+        return errors
+
+    @property
+    def created(self) -> List[str]:
+        return sorted(self._clients)
+
+    def _forget(self) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._clients.clear()
+                self.creation_seconds.clear()
+                self._pid = os.getpid()
+
+    def close(self) -> None:
+        """Close every client this process created; they are rebuilt if used again"""
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning("failed to close %s: %s", name, e)
+
+
+class LazyClient:
+    """Forwards attribute access to the registry's client, creating it the first time"""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ClientRegistry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._registry.get(self._name), attribute)
+
+    def __repr__(self) -> str:
+        return f"<LazyClient {self._name}>"
+
+
+def _boto3_client(service: str, **options):
+    # boto3 and botocore take ~130 ms to import; only pay for it when a client is needed
+    import boto3
+
+    client = boto3.client(
+        service,
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        **options
+    )
+    # Every AWS call gets a span in the current request's trace and in /metrics
+    return tracer.instrument_boto3(client)
+
+
+def _s3_client():
+    from botocore.config import Config
+
+    return _boto3_client(
+        's3',
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        # The connection pool must cover all concurrent part uploads
+        config=Config(
+            max_pool_connections=max(settings.S3_MAX_POOL_CONNECTIONS, settings.S3_UPLOAD_CONCURRENCY)
+        )
+    )
+
+
+def _openai_client():
+    from openai import DefaultHttpxClient, OpenAI
+
+    return OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=DefaultHttpxClient(event_hooks=tracer.httpx_event_hooks("openai"))
+    )
+
+
+clients = ClientRegistry()
+clients.register("transcribe", lambda: _boto3_client('transcribe'))
+clients.register("s3", _s3_client)
+clients.register("chime", lambda: _boto3_client('chime-sdk-meetings'))
+clients.register("openai", _openai_client)
@@ -1,14 +1,102 @@
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+
+def _pool_options(url: str) -> dict:
+    """Connection pool tuning; SQLite uses its own single-file pools"""
+    # No `echo`: it adds a synchronous stderr handler; DB_ECHO is applied by configure_logging
+    options = {
+        "query_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        )
+    return options
+
+
+def async_database_url(url: str) -> str:
+    """Map DATABASE_URL onto its async driver (asyncpg for Postgres, aiosqlite for SQLite)"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg").update_query_dict(
+            # asyncpg keeps prepared statements per connection; size that cache here
+            {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+    elif parsed.get_backend_name() == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def sqlite_wal_engine(path: str) -> Engine:
+    """SQLite engine tuned for many readers and short writes from several processes (local stores, job queue)."""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 5})
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    return engine
+
 
-from app.core.config import Settings
+@lru_cache(maxsize=None)
+def get_engine():
+    """The sync engine, created on first use so importing the app stays cheap"""
+    return create_engine(
+        settings.DATABASE_URL,
+        **_pool_options(settings.DATABASE_URL)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_async_engine():
+    """Async engine for request handlers, so queries never block the event loop"""
+    return create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        **_pool_options(settings.DATABASE_URL)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_async_session_factory():
+    return async_sessionmaker(get_async_engine(), class_=AsyncSession, expire_on_commit=False)
+
+
+_LAZY = {
+    "engine": get_engine,
+    "async_engine": get_async_engine,
+    "async_session_factory": get_async_session_factory,
+}
+
+
+def __getattr__(name: str):
+    # `engine`, `async_engine` and `async_session_factory` are still importable by name
+    if name in _LAZY:
+        return _LAZY[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Create the database engine
-engine = create_engine(
-    Settings().DATABASE_URL,
-    echo=True
-)
 
 # Dependency to get the database session
 def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+    with Session(get_engine()) as session:
+        yield session
+
+
+# Dependency to get an async database session
+async def get_async_session():
+    async with get_async_session_factory()() as session:
+        yield session
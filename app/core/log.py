@@ -0,0 +1,185 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from app.core.config import settings
+from app.core.tracing import current_trace
+
+# Attributes every LogRecord has; anything else came in through `extra=` and is written out
+_RECORD_FIELDS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+# Chatty libraries log per call at INFO; LOG_LEVELS overrides these
+LIBRARY_LEVELS = {"sqlalchemy.engine": "WARNING", "botocore": "WARNING", "urllib3": "WARNING", "httpx": "WARNING"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, trace id, `extra` fields, exception"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class QueueLogHandler(logging.Handler):
+    """
+    Hands records to a background thread that formats and writes them in
+    batches, so a request never waits on stdout. The message and any
+    exception are resolved on the caller's thread (arguments may change
+    after the call returns), along with the id of the request's trace. When
+    the queue is full records are dropped and counted rather than blocking.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, max_queue: int = 10000):
+        super().__init__()
+        self.stream = stream or sys.stdout
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        trace = current_trace()
+        if trace is not None:
+            record.trace_id = trace.trace_id
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+        except Exception:
+            self.handleError(record)
+            return
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out queued records and stop the writer thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        super().close()
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Optional[logging.LogRecord]] = [self._queue.get()]
+            while len(batch) < 500:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for record in batch:
+                if record is None:
+                    continue
+                try:
+                    lines.append(self.format(record))
+                except Exception:
+                    self.handleError(record)
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except Exception as e:
+                    sys.__stderr__.write(f"QueueLogHandler: failed to write {len(lines)} records: {e}\n")
+            if None in batch:
+                break
+
+
+class DebugSampler(logging.Filter):
+    """
+    Thins out DEBUG records, which come from hot paths: keeps a random
+    `sample_rate` of them, then at most `per_second` per call site (source
+    line). The first record let through after a suppressed stretch carries
+    the number suppressed. INFO and above always pass.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, per_second: float = 20.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.per_second = per_second
+        self.suppressed = 0
+        # call site -> [window start, records passed, records suppressed]
+        self._windows: Dict[Tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.suppressed += 1
+            return False
+        now = time.monotonic()
+        window = self._windows.get((record.pathname, record.lineno))
+        if window is None or now - window[0] >= 1.0:
+            suppressed = window[2] if window is not None else 0
+            window = self._windows[(record.pathname, record.lineno)] = [now, 0, 0]
+            if suppressed:
+                record.suppressed = suppressed
+        if window[1] >= self.per_second:
+            window[2] += 1
+            self.suppressed += 1
+            return False
+        window[1] += 1
+        return True
+
+
+def configure_logging(stream: Optional[TextIO] = None) -> QueueLogHandler:
+    """
+    Send all logging (the app, SQLAlchemy, boto3, uvicorn's access log)
+    through one QueueLogHandler on the root logger, with levels from
+    LOG_LEVEL and LOG_LEVELS. Calling it again replaces the handler.
+    """
+    handler = QueueLogHandler(stream, max_queue=settings.LOG_QUEUE_SIZE)
+    handler.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+    handler.addFilter(DebugSampler(settings.LOG_DEBUG_SAMPLE_RATE, settings.LOG_DEBUG_PER_SECOND))
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if isinstance(h, QueueLogHandler)]:
+        root.removeHandler(existing)
+        existing.close()
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    levels = dict(LIBRARY_LEVELS)
+    if settings.DB_ECHO:
+        levels["sqlalchemy.engine"] = "INFO"
+    levels.update(settings.LOG_LEVELS)
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    # uvicorn installs its own synchronous stream handlers before importing the app
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        logger.propagate = True
+
+    atexit.register(handler.close)
+    return handler
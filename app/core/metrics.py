@@ -0,0 +1,434 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Requests no route matched share one label, so scanners cannot blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class _Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class _Outbound:
+    __slots__ = ("histogram", "errors", "retries", "bytes_sent", "bytes_received")
+
+    def __init__(self, size: int):
+        self.histogram = _Histogram(size)
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class MetricsRegistry:
+    """
+    Per-worker HTTP metrics: request counts by route, method and status,
+    latency histograms by route and method, the number of requests in
+    flight, and latency, errors, retries and bytes of outbound calls by
+    dependency and operation, and per endpoint class of admission control
+    (app.core.admission) the requests admitted and shed, queue waits, and
+    the requests and upload bytes in flight and queued.
+
+    Only the event loop thread records requests, so plain dicts and ints are
+    enough; there are no locks on the request path. Outbound calls (see
+    app.core.tracing) also finish on worker threads and take a lock. With `multiproc_dir` set every
+    worker also writes a snapshot to <dir>/<pid>.json, and render() adds the
+    other workers' snapshots to its own numbers.
+    """
+
+    def __init__(
+            self,
+            buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+            multiproc_dir: Optional[str] = None,
+            flush_interval: float = 5.0
+    ):
+        self.buckets = buckets
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        self.in_flight = 0
+        # Set by app.core.warmup
+        self.ready = False
+        self.warmup_seconds: Optional[float] = None
+        self._warmup: Dict[str, Tuple[float, int]] = {}
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        self._latency: Dict[Tuple[str, str], _Histogram] = {}
+        self._outbound: Dict[Tuple[str, str], _Outbound] = {}
+        self._outbound_lock = threading.Lock()
+        # AdmissionLimiters by class; their gauges are read at snapshot time
+        self.admission: Dict[str, object] = {}
+        self._admission: Dict[Tuple[str, str], int] = {}
+        self._admission_wait: Dict[str, _Histogram] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, status)
+        self._requests[key] = self._requests.get(key, 0) + 1
+        histogram = self._latency.get((method, route))
+        if histogram is None:
+            histogram = self._latency[(method, route)] = _Histogram(len(self.buckets) + 1)
+        histogram.counts[bisect_left(self.buckets, seconds)] += 1
+        histogram.total += seconds
+
+    def observe_outbound(
+            self,
+            dependency: str,
+            operation: str,
+            seconds: float,
+            error: bool = False,
+            retries: int = 0,
+            bytes_sent: int = 0,
+            bytes_received: int = 0
+    ) -> None:
+        with self._outbound_lock:
+            entry = self._outbound.get((dependency, operation))
+            if entry is None:
+                entry = self._outbound[(dependency, operation)] = _Outbound(len(self.buckets) + 1)
+            entry.histogram.counts[bisect_left(self.buckets, seconds)] += 1
+            entry.histogram.total += seconds
+            entry.errors += error
+            entry.retries += retries
+            entry.bytes_sent += bytes_sent
+            entry.bytes_received += bytes_received
+
+    def record_warmup(self, step: str, seconds: float, ok: bool) -> None:
+        """Duration of a warmup step's latest attempt; failures are counted"""
+        _, failures = self._warmup.get(step, (0.0, 0))
+        self._warmup[step] = (seconds, failures + (not ok))
+
+    def observe_admission(self, name: str, outcome: str, wait_seconds: Optional[float] = None) -> None:
+        """Outcome of an admission decision; `wait_seconds` is the queue wait of admitted requests"""
+        self._admission[(name, outcome)] = self._admission.get((name, outcome), 0) + 1
+        if wait_seconds is not None:
+            histogram = self._admission_wait.get(name)
+            if histogram is None:
+                histogram = self._admission_wait[name] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[bisect_left(self.buckets, wait_seconds)] += 1
+            histogram.total += wait_seconds
+
+    def snapshot(self) -> dict:
+        with self._outbound_lock:
+            outbound = [
+                [*key, list(entry.histogram.counts), entry.histogram.total,
+                 entry.errors, entry.retries, entry.bytes_sent, entry.bytes_received]
+                for key, entry in self._outbound.items()
+            ]
+        return {
+            "pid": os.getpid(),
+            "in_flight": self.in_flight,
+            "requests": [[*key, count] for key, count in self._requests.items()],
+            "latency": [[*key, histogram.counts, histogram.total] for key, histogram in self._latency.items()],
+            "outbound": outbound,
+            "ready": self.ready,
+            "warmup_seconds": self.warmup_seconds,
+            "warmup": [[step, seconds, failures] for step, (seconds, failures) in self._warmup.items()],
+            "admission": [
+                [name, limiter.in_flight, limiter.waiting, limiter.bytes_in_flight, limiter.max_concurrent, limiter.max_queue]
+                for name, limiter in self.admission.items()
+            ],
+            "admission_outcomes": [[*key, count] for key, count in self._admission.items()],
+            "admission_wait": [[name, histogram.counts, histogram.total] for name, histogram in self._admission_wait.items()],
+        }
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.multiproc_dir, f"{pid}.json")
+
+    def write_snapshot(self) -> None:
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(self.snapshot(), file, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+
+    def _other_snapshots(self) -> List[dict]:
+        if not self.multiproc_dir or not os.path.isdir(self.multiproc_dir):
+            return []
+        snapshots = []
+        for name in os.listdir(self.multiproc_dir):
+            if not name.endswith(".json") or name == f"{os.getpid()}.json":
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, name)) as file:
+                    snapshots.append(json.load(file))
+            except (OSError, ValueError):
+                # Being replaced right now or unreadable; the next scrape picks it up
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        """All workers' metrics in the Prometheus text exposition format (0.0.4)"""
+        return render_snapshots([self.snapshot()] + self._other_snapshots(), self.buckets)
+
+    async def render_async(self) -> str:
+        if self.multiproc_dir:
+            return await run_in_threadpool(self.render)
+        return self.render()
+
+    async def start(self) -> None:
+        if self.multiproc_dir and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # Keep this worker's final counts for the workers that outlive it
+            await run_in_threadpool(self.write_snapshot)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.write_snapshot)
+            except Exception as e:
+                logger.warning("failed to write snapshot: %s", e)
+            await asyncio.sleep(self.flush_interval)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        pass
+    return True
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _add(merged: List[float], values: List[float]) -> List[float]:
+    if not merged:
+        return list(values)
+    for position, value in enumerate(values):
+        merged[position] += value
+    return merged
+
+
+def _histogram_lines(
+        name: str,
+        labels: dict,
+        counts: List[float],
+        total: float,
+        buckets: Tuple[float, ...]
+) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip([*map(str, buckets), "+Inf"], counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {float(total)}")
+    lines.append(f"{name}_count{_labels(**labels)} {cumulative}")
+    return lines
+
+
+def render_snapshots(snapshots: Iterable[dict], buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> str:
+    """
+    Sum worker snapshots into one Prometheus exposition. Counters and
+    histograms of exited workers are kept so totals never go backwards;
+    their in-flight gauges are not.
+    """
+    requests: Dict[Tuple[str, str, int], int] = {}
+    latency: Dict[Tuple[str, str], List[float]] = {}
+    outbound: Dict[Tuple[str, str], List[float]] = {}
+    warmup: Dict[str, List[float]] = {}
+    admission: Dict[str, List[float]] = {}
+    admission_outcomes: Dict[Tuple[str, str], int] = {}
+    admission_wait: Dict[str, List[float]] = {}
+    in_flight = 0
+    ready = 0
+    warmup_seconds = None
+    for snapshot in snapshots:
+        if snapshot["pid"] == os.getpid() or _alive(snapshot["pid"]):
+            in_flight += snapshot["in_flight"]
+            ready += bool(snapshot.get("ready"))
+            # Gauges of exited workers are dropped; durations report the slowest live worker
+            if snapshot.get("warmup_seconds") is not None:
+                warmup_seconds = max(warmup_seconds or 0.0, snapshot["warmup_seconds"])
+            for step, seconds, failures in snapshot.get("warmup", []):
+                slowest, failed = warmup.get(step, [0.0, 0])
+                warmup[step] = [max(slowest, seconds), failed + failures]
+            for name, *gauges in snapshot.get("admission", []):
+                admission[name] = _add(admission.get(name, []), gauges)
+        for method, route, status, count in snapshot["requests"]:
+            requests[(method, route, status)] = requests.get((method, route, status), 0) + count
+        for method, route, counts, total in snapshot["latency"]:
+            latency[(method, route)] = _add(latency.get((method, route), []), [*counts, total])
+        for dependency, operation, counts, *totals in snapshot.get("outbound", []):
+            outbound[(dependency, operation)] = _add(outbound.get((dependency, operation), []), [*counts, *totals])
+        for name, outcome, count in snapshot.get("admission_outcomes", []):
+            admission_outcomes[(name, outcome)] = admission_outcomes.get((name, outcome), 0) + count
+        for name, counts, total in snapshot.get("admission_wait", []):
+            admission_wait[name] = _add(admission_wait.get(name, []), [*counts, total])
+
+    lines = [
+        "# HELP http_requests_total HTTP requests by route, method and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(requests.items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds HTTP request latency by route and method.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), merged in sorted(latency.items()):
+        lines += _histogram_lines(
+            "http_request_duration_seconds", {"method": method, "route": route}, merged[:-1], merged[-1], buckets
+        )
+
+    lines += [
+        "# HELP http_requests_in_flight HTTP requests currently being served.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {in_flight}",
+    ]
+
+    lines += [
+        "# HELP app_workers_ready Worker processes that finished warmup and accept traffic.",
+        "# TYPE app_workers_ready gauge",
+        f"app_workers_ready {ready}",
+    ]
+    if warmup_seconds is not None:
+        lines += [
+            "# HELP app_warmup_duration_seconds Time from startup until ready (slowest worker).",
+            "# TYPE app_warmup_duration_seconds gauge",
+            f"app_warmup_duration_seconds {warmup_seconds}",
+        ]
+    if warmup:
+        lines += [
+            "# HELP app_warmup_step_duration_seconds Duration of the latest attempt of each warmup step (slowest worker).",
+            "# TYPE app_warmup_step_duration_seconds gauge",
+        ]
+        lines += [f"app_warmup_step_duration_seconds{_labels(step=step)} {seconds}" for step, (seconds, _) in sorted(warmup.items())]
+        lines += [
+            "# HELP app_warmup_step_failures Failed attempts of each warmup step in live workers.",
+            "# TYPE app_warmup_step_failures gauge",
+        ]
+        lines += [f"app_warmup_step_failures{_labels(step=step)} {failed}" for step, (_, failed) in sorted(warmup.items())]
+
+    if admission:
+        for position, (name, help_text) in enumerate((
+                ("admission_in_flight", "Admitted requests being served, by endpoint class."),
+                ("admission_queue_depth", "Requests waiting for admission, by endpoint class."),
+                ("admission_in_flight_bytes", "Declared request body bytes of admitted requests, by endpoint class."),
+                ("admission_concurrency_limit", "Requests each endpoint class may serve at once (summed over workers)."),
+                ("admission_queue_limit", "Requests each endpoint class may queue (summed over workers)."),
+        )):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{_labels(**{'class': cls})} {gauges[position]}" for cls, gauges in sorted(admission.items())]
+    if admission_outcomes:
+        lines += [
+            "# HELP admission_requests_total Admission decisions by endpoint class and outcome "
+            "(admitted, queue_full, timeout, too_large).",
+            "# TYPE admission_requests_total counter",
+        ]
+        for (cls, outcome), count in sorted(admission_outcomes.items()):
+            lines.append(f"admission_requests_total{_labels(**{'class': cls, 'outcome': outcome})} {count}")
+    if admission_wait:
+        lines += [
+            "# HELP admission_queue_wait_seconds Time admitted requests spent queued, by endpoint class.",
+            "# TYPE admission_queue_wait_seconds histogram",
+        ]
+        for cls, merged in sorted(admission_wait.items()):
+            lines += _histogram_lines("admission_queue_wait_seconds", {"class": cls}, merged[:-1], merged[-1], buckets)
+
+    size = len(buckets) + 1
+    if outbound:
+        lines += [
+            "# HELP outbound_request_duration_seconds Latency of calls to AWS, OpenAI and other dependencies.",
+            "# TYPE outbound_request_duration_seconds histogram",
+        ]
+        for (dependency, operation), merged in sorted(outbound.items()):
+            lines += _histogram_lines(
+                "outbound_request_duration_seconds",
+                {"dependency": dependency, "operation": operation},
+                merged[:size],
+                merged[size],
+                buckets
+            )
+        for name, position, help_text in (
+                ("outbound_request_errors_total", 1, "Outbound calls that failed."),
+                ("outbound_request_retries_total", 2, "Retries made by the client libraries."),
+                ("outbound_request_sent_bytes_total", 3, "Request body bytes sent."),
+                ("outbound_request_received_bytes_total", 4, "Response body bytes received."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (dependency, operation), merged in sorted(outbound.items()):
+                lines.append(f"{name}{_labels(dependency=dependency, operation=operation)} {merged[size + position]}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording every HTTP request in a MetricsRegistry.
+
+    Requests are labelled with the route template (e.g. /kpi/agents/{agent_id}/monthly/{month}),
+    which FastAPI leaves in the scope once it has matched the request. The
+    latency covers the whole response, including streamed bodies.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.in_flight -= 1
+            route = scope.get("route")
+            registry.observe(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status,
+                time.perf_counter() - started
+            )
+
+
+# Metrics of this worker process, shared by the middleware and the /metrics endpoint
+metrics_registry = MetricsRegistry(
+    multiproc_dir=settings.METRICS_MULTIPROC_DIR,
+    flush_interval=settings.METRICS_FLUSH_SECONDS
+)
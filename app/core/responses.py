@@ -0,0 +1,41 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # orjson handles dict/list/str/int/float/bool/None, datetime, UUID, enums and dataclasses itself
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson, which is several times faster than the
+    json module on large payloads. The app's default response class.
+
+    Returning one from an endpoint also skips FastAPI's response_model
+    validation and jsonable_encoder pass, for data the app built itself
+    (pydantic models in the content are dumped as they are).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """Content that is already JSON (e.g. a cached transcript), sent without decoding it"""
+
+    media_type = "application/json"
@@ -0,0 +1,444 @@
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Ids in OpenAI paths (thread_..., run_..., msg_...) become placeholders so operations stay few
+_OPENAI_ID = re.compile(r"/(thread|run|msg|asst|file|vs|step)_[A-Za-z0-9]+")
+WATERFALL_WIDTH = 40
+
+
+class Span:
+    """One outbound call made while serving a request (or from a background task)"""
+
+    __slots__ = (
+        "dependency", "operation", "span_id", "started_at", "duration",
+        "bytes_sent", "bytes_received", "retries", "error", "_start"
+    )
+
+    def __init__(self, dependency: str, operation: str):
+        self.dependency = dependency
+        self.operation = operation
+        self.span_id = uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+
+
+class Trace:
+    """An incoming request and the outbound spans recorded while it was served"""
+
+    def __init__(self, method: str, path: str):
+        self.trace_id = uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.started_at = time.time()
+        self.duration = 0.0
+        # Appended to from worker threads too; list.append is atomic
+        self.spans: List[Span] = []
+
+    def summary(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "method": self.method,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2),
+            "spans": len(self.spans),
+            "outbound_ms": round(sum(span.duration for span in self.spans) * 1000, 2),
+        }
+
+    def waterfall(self) -> dict:
+        """Spans in start order with offsets from the start of the request, plus a text bar each"""
+        scale = WATERFALL_WIDTH / self.duration if self.duration > 0 else 0
+        spans = []
+        by_dependency: Dict[str, float] = {}
+        for span in sorted(self.spans, key=lambda item: item.started_at):
+            offset = max(span.started_at - self.started_at, 0.0)
+            start = min(int(offset * scale), WATERFALL_WIDTH - 1)
+            length = max(1, min(round(span.duration * scale), WATERFALL_WIDTH - start))
+            by_dependency[span.dependency] = by_dependency.get(span.dependency, 0.0) + span.duration
+            spans.append({
+                "span_id": span.span_id,
+                "dependency": span.dependency,
+                "operation": span.operation,
+                "offset_ms": round(offset * 1000, 2),
+                "duration_ms": round(span.duration * 1000, 2),
+                "bytes_sent": span.bytes_sent,
+                "bytes_received": span.bytes_received,
+                "retries": span.retries,
+                "error": span.error,
+                "bar": "." * start + "#" * length + "." * (WATERFALL_WIDTH - start - length),
+            })
+        return {
+            **self.summary(),
+            "path": self.path,
+            "by_dependency_ms": {name: round(seconds * 1000, 2) for name, seconds in by_dependency.items()},
+            "waterfall": spans,
+        }
+
+
+def _attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _nanos(seconds: float) -> str:
+    return str(int(seconds * 1e9))
+
+
+def otlp_payload(trace: Trace, service_name: str) -> dict:
+    """The trace as an OTLP/HTTP JSON export request (one server span plus one client span per call)"""
+    spans = [{
+        "traceId": trace.trace_id,
+        "spanId": trace.span_id,
+        "name": f"{trace.method} {trace.route or trace.path}",
+        "kind": 2,
+        "startTimeUnixNano": _nanos(trace.started_at),
+        "endTimeUnixNano": _nanos(trace.started_at + trace.duration),
+        "attributes": [
+            _attribute("http.request.method", trace.method),
+            _attribute("http.route", trace.route or ""),
+            _attribute("url.path", trace.path),
+            _attribute("http.response.status_code", trace.status or 0),
+        ],
+        "status": {"code": 2 if (trace.status or 500) >= 500 else 1},
+    }]
+    for span in trace.spans:
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": trace.span_id,
+            "name": f"{span.dependency} {span.operation}",
+            "kind": 3,
+            "startTimeUnixNano": _nanos(span.started_at),
+            "endTimeUnixNano": _nanos(span.started_at + span.duration),
+            "attributes": [
+                _attribute("peer.service", span.dependency),
+                _attribute("operation", span.operation),
+                _attribute("bytes_sent", span.bytes_sent),
+                _attribute("bytes_received", span.bytes_received),
+                _attribute("retries", span.retries),
+            ] + ([_attribute("error.message", span.error)] if span.error else []),
+            "status": {"code": 2 if span.error else 1},
+        })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", service_name)]},
+            "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+class TraceExporter:
+    """
+    Writes finished traces on a background thread, as OTLP JSON: one export
+    request per line of a local JSONL file, and/or POSTed to an OTLP/HTTP
+    collector (e.g. http://collector:4318/v1/traces). When the queue is full
+    new traces are dropped rather than slowing requests down. Once the file
+    reaches `max_bytes` it is moved to `<path>.1` (replacing the previous
+    one) and a new file is started.
+    """
+
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            otlp_endpoint: Optional[str] = None,
+            service_name: str = "nexus-api",
+            max_queue: int = 1000,
+            max_bytes: int = 100 * 1024 * 1024
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.otlp_endpoint = otlp_endpoint
+        self.service_name = service_name
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Trace]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path or self.otlp_endpoint)
+
+    def export(self, trace: Trace) -> None:
+        if not self.enabled:
+            return
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued traces and stop the exporter thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        import httpx
+
+        client = httpx.Client(timeout=5.0) if self.otlp_endpoint else None
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 100:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            payloads = [otlp_payload(trace, self.service_name) for trace in batch if trace is not None]
+            try:
+                if payloads and self.path:
+                    self._rotate()
+                    with open(self.path, "a") as file:
+                        file.writelines(json.dumps(payload, separators=(",", ":")) + "\n" for payload in payloads)
+                if payloads and client is not None:
+                    client.post(self.otlp_endpoint, json={
+                        "resourceSpans": [spans for payload in payloads for spans in payload["resourceSpans"]]
+                    })
+            except Exception as e:
+                logger.warning("failed to export %d traces: %s", len(payloads), e)
+            if stop:
+                break
+        if client is not None:
+            client.close()
+
+    def _rotate(self) -> None:
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return
+        if size >= self.max_bytes:
+            os.replace(self.path, f"{self.path}.1")
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+class Tracer:
+    """
+    Records spans for outbound calls and links them to the request being
+    served, which TracingMiddleware keeps in a context variable. Context
+    variables follow the request into run_in_threadpool and tasks it starts,
+    so calls made on worker threads land in the right trace. Every span is
+    also summarised in the metrics registry; finished traces with at least
+    one span are kept in memory for the waterfall endpoint and exported.
+    """
+
+    def __init__(self, registry: MetricsRegistry, exporter: TraceExporter, buffer_size: int = 500):
+        self.registry = registry
+        self.exporter = exporter
+        self._recent: Deque[Trace] = deque(maxlen=buffer_size)
+
+    def start_span(self, dependency: str, operation: str) -> Span:
+        return Span(dependency, operation)
+
+    def end_span(self, span: Span) -> None:
+        span.duration = time.perf_counter() - span._start
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.spans.append(span)
+        self.registry.observe_outbound(
+            span.dependency,
+            span.operation,
+            span.duration,
+            error=span.error is not None,
+            retries=span.retries,
+            bytes_sent=span.bytes_sent,
+            bytes_received=span.bytes_received
+        )
+
+    @contextmanager
+    def span(self, dependency: str, operation: str):
+        """Time the enclosed call; set bytes_sent / bytes_received / retries on the yielded span"""
+        span = self.start_span(dependency, operation)
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"[:200]
+            raise
+        finally:
+            self.end_span(span)
+
+    def start_trace(self, method: str, path: str) -> tuple:
+        trace = Trace(method, path)
+        return trace, _current_trace.set(trace)
+
+    def finish_trace(self, trace: Trace, token, route: Optional[str], status: Optional[int]) -> None:
+        _current_trace.reset(token)
+        trace.duration = time.time() - trace.started_at
+        trace.route = route
+        trace.status = status
+        if trace.spans:
+            self._recent.append(trace)
+            self.exporter.export(trace)
+
+    def recent(self, limit: int = 50, route: Optional[str] = None, min_duration_ms: float = 0) -> List[dict]:
+        traces = [
+            trace for trace in reversed(self._recent)
+            if (route is None or trace.route == route) and trace.duration * 1000 >= min_duration_ms
+        ]
+        return [trace.summary() for trace in traces[:limit]]
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        for trace in reversed(self._recent):
+            if trace.trace_id == trace_id:
+                return trace
+        return None
+
+    def instrument_boto3(self, client, dependency: Optional[str] = None):
+        """
+        Record a span for every API call of a boto3 client, via botocore's
+        event hooks. The span covers all retries; their number comes from the
+        response metadata.
+        """
+        service = client.meta.service_model.service_id.hyphenize()
+        dependency = dependency or service
+
+        def before_call(model, params, context, **kwargs):
+            span = self.start_span(dependency, model.name)
+            body = params.get("body")
+            if isinstance(body, (bytes, bytearray)):
+                span.bytes_sent = len(body)
+            elif isinstance(body, str):
+                span.bytes_sent = len(body.encode())
+            elif hasattr(body, "seek") and hasattr(body, "tell"):
+                # S3 uploads arrive here already wrapped in a file-like object; one that
+                # cannot seek (a stream) is left unmeasured rather than failing the call
+                try:
+                    position = body.tell()
+                    span.bytes_sent = body.seek(0, 2) - position
+                    body.seek(position)
+                except (OSError, ValueError):
+                    span.bytes_sent = 0
+            context["trace_span"] = span
+
+        def after_call(http_response, parsed, context, **kwargs):
+            span = context.pop("trace_span", None)
+            if span is None:
+                return
+            span.retries = parsed.get("ResponseMetadata", {}).get("RetryAttempts", 0)
+            span.bytes_received = int(http_response.headers.get("content-length") or 0)
+            if http_response.status_code >= 300:
+                span.error = parsed.get("Error", {}).get("Code") or f"HTTP {http_response.status_code}"
+            self.end_span(span)
+
+        def after_call_error(exception, context, **kwargs):
+            span = context.pop("trace_span", None)
+            if span is not None:
+                span.error = f"{type(exception).__name__}: {exception}"[:200]
+                self.end_span(span)
+
+        client.meta.events.register(f"before-call.{service}", before_call)
+        client.meta.events.register(f"after-call.{service}", after_call)
+        client.meta.events.register(f"after-call-error.{service}", after_call_error)
+        return client
+
+    def httpx_event_hooks(self, dependency: str) -> dict:
+        """
+        httpx event hooks recording one span per HTTP attempt (for the OpenAI
+        client: pass them to DefaultHttpxClient). A span ends when the
+        response headers arrive; OpenAI's retry count header is kept.
+        """
+
+        def on_request(request):
+            path = _OPENAI_ID.sub(r"/\1_{id}", request.url.path)
+            span = self.start_span(dependency, f"{request.method} {path}")
+            span.bytes_sent = int(request.headers.get("content-length") or 0)
+            span.retries = int(request.headers.get("x-stainless-retry-count") or 0)
+            request.extensions["trace_span"] = span
+
+        def on_response(response):
+            span = response.request.extensions.pop("trace_span", None)
+            if span is None:
+                return
+            span.bytes_received = int(response.headers.get("content-length") or 0)
+            if response.status_code >= 400:
+                span.error = f"HTTP {response.status_code}"
+            self.end_span(span)
+
+        return {"request": [on_request], "response": [on_response]}
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware starting a trace for every HTTP request. The trace id
+    is returned in the X-Trace-Id response header so a slow response can be
+    looked up at /traces/{trace_id}.
+    """
+
+    def __init__(self, app, tracer: "Tracer"):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace, token = self.tracer.start_trace(scope["method"], scope["path"])
+        status = None
+        header = (b"x-trace-id", trace.trace_id.encode())
+
+        async def send_with_trace_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            route = scope.get("route")
+            self.tracer.finish_trace(trace, token, route.path if route is not None else None, status or 500)
+
+
+# Spans of this worker process; the exporter thread starts with the first traced request
+tracer = Tracer(
+    metrics_registry,
+    TraceExporter(
+        path=settings.TRACE_EXPORT_PATH,
+        max_bytes=settings.TRACE_EXPORT_MAX_BYTES,
+        otlp_endpoint=settings.TRACE_OTLP_ENDPOINT,
+        service_name=settings.TRACE_SERVICE_NAME
+    ),
+    buffer_size=settings.TRACE_BUFFER_SIZE
+)
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Step:
+    name: str
+    run: Callable[[], Awaitable[None]]
+    required: bool
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "required": self.required,
+            "done": self.seconds is not None and self.error is None,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+class Warmup:
+    """
+    Readiness gate for a worker: runs named warmup steps (load indexes, open
+    pools, replay representative queries) in the background after startup,
+    in the order they were added, and reports ready once every required step
+    has succeeded.
+
+    A failed required step is retried every `retry_interval` seconds and the
+    worker stays unready meanwhile; optional steps are attempted once and
+    only reported. Step and total durations go to the metrics registry.
+    """
+
+    def __init__(
+            self,
+            registry: MetricsRegistry,
+            step_timeout: float = 30.0,
+            retry_interval: float = 5.0,
+            enabled: bool = True
+    ):
+        self.registry = registry
+        self.step_timeout = step_timeout
+        self.retry_interval = retry_interval
+        self.enabled = enabled
+        self.ready = False
+        self.draining = False
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+        self._steps: List[_Step] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, name: str, run: Callable[[], Awaitable[None]], required: bool = True) -> None:
+        self._steps.append(_Step(name, run, required))
+
+    async def start(self) -> None:
+        self.ready = False
+        self.started_at = time.perf_counter()
+        if not self.enabled:
+            self._finish()
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Draining: the load balancer should stop sending traffic right away
+        self.ready = False
+        self.draining = True
+        self.registry.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _attempt(self, step: _Step) -> bool:
+        step.attempts += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(step.run(), self.step_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            step.error = f"{type(e).__name__}: {e}"[:300]
+            logger.warning("%s failed (attempt %d): %s", step.name, step.attempts, step.error)
+            ok = False
+        else:
+            step.error = None
+            ok = True
+        step.seconds = time.perf_counter() - started
+        self.registry.record_warmup(step.name, step.seconds, ok)
+        return ok
+
+    async def _run(self) -> None:
+        for step in self._steps:
+            ok = await self._attempt(step)
+            while not ok and step.required:
+                await asyncio.sleep(self.retry_interval)
+                ok = await self._attempt(step)
+        self._finish()
+        logger.info(
+            "ready after %.2fs (%s)", self.seconds, ", ".join(f"{s.name} {s.seconds:.2f}s" for s in self._steps)
+        )
+
+    def _finish(self) -> None:
+        self.seconds = time.perf_counter() - self.started_at
+        self.ready = True
+        self.registry.ready = True
+        self.registry.warmup_seconds = self.seconds
+
+    def status(self) -> dict:
+        if self.ready:
+            state = "ready"
+        elif self.draining:
+            state = "draining"
+        elif self.started_at is None:
+            state = "starting"
+        else:
+            state = "warming_up"
+        return {
+            "status": state,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "elapsed": round(time.perf_counter() - self.started_at, 3) if self.started_at is not None else None,
+            "steps": [step.as_dict() for step in self._steps],
+        }
+
+
+# This worker's readiness; steps are added in main.py
+warmup = Warmup(
+    metrics_registry,
+    step_timeout=settings.WARMUP_STEP_TIMEOUT_SECONDS,
+    retry_interval=settings.WARMUP_RETRY_SECONDS,
+    enabled=settings.WARMUP_ENABLED
+)
@@ -0,0 +1,65 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.repositories.call_session_repository import (
+    MAX_PAGE_SIZE, CallSessionRepository, get_call_session_repository
+)
+from app.repositories.transcript_repository import TranscriptRepository, get_transcript_repository
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["dashboard"]
+)
+
+
+async def _paged(query, *args):
+    try:
+        return await query(*args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/agents/{agent_id}/call-sessions")
+async def list_agent_call_sessions(
+        agent_id: int,
+        limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        repository: CallSessionRepository = Depends(get_call_session_repository)
+):
+    """An agent's most recent calls with customer names and call metrics"""
+    return await _paged(repository.agent_recent_sessions, agent_id, limit, cursor)
+
+
+@router.get("/companies/{company_id}/call-sessions")
+async def list_company_call_sessions(
+        company_id: int,
+        limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        repository: CallSessionRepository = Depends(get_call_session_repository)
+):
+    """A company's call list with agent and customer names"""
+    return await _paged(repository.company_call_list, company_id, limit, cursor)
+
+
+@router.get("/customers/{customer_id}/call-sessions")
+async def list_customer_call_sessions(
+        customer_id: int,
+        limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        repository: CallSessionRepository = Depends(get_call_session_repository)
+):
+    """A customer's call history with agent names, metrics and call summaries"""
+    return await _paged(repository.customer_history, customer_id, limit, cursor)
+
+
+@router.get("/call-sessions/{call_session_id}/transcript")
+async def get_call_transcript(
+        call_session_id: int,
+        repository: TranscriptRepository = Depends(get_transcript_repository)
+):
+    """A call's transcript segments, including months already moved to the archive"""
+    transcript = await repository.call_transcript(call_session_id)
+    if transcript is None:
+        raise HTTPException(status_code=404, detail="Call session not found")
+    return transcript
@@ -0,0 +1,249 @@
+"""
+Move cold months of CallTranscription out of the database into Parquet files.
+
+Usage:
+    python -m app.db.archival [YYYY-MM ...]
+
+Without arguments every month older than TRANSCRIPT_HOT_MONTHS is archived.
+Each month becomes one zstd-compressed Parquet file under TRANSCRIPT_ARCHIVE_DIR,
+sorted by call session so reads for one call only decode the row groups whose
+statistics match. The month is recorded in transcript_archives, then its rows
+are removed (on a partitioned Postgres table the whole partition is detached
+and dropped). Archiving a month again (rows that arrived late) writes a new
+file holding the earlier archive's rows as well and only removes the old file
+once transcript_archives points at the new one. Archived transcripts stay
+readable through TranscriptRepository.
+
+Needs pyarrow, which is optional: pip install pyarrow
+"""
+import heapq
+import itertools
+import os
+import sys
+import uuid
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.models.call_transcription import CallTranscription
+from app.db.models.transcript_archive import TranscriptArchive
+from app.db.partitioning import add_months, drop_partition, is_partitioned, list_partitions, partition_name
+
+transcriptions = CallTranscription.__table__
+archives = TranscriptArchive.__table__
+
+READ_BATCH_ROWS = 50000
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Transcript archival needs pyarrow: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def _schema():
+    pa, _ = _pyarrow()
+    return pa.schema([
+        ("call_transcription_id", pa.int64()),
+        ("call_session_id", pa.int64()),
+        ("timestamp", pa.duration("us")),
+        ("transcription", pa.string()),
+        ("role", pa.string()),
+        ("call_file", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+        ("deleted_at", pa.timestamp("us")),
+    ])
+
+
+class TranscriptArchiveStore:
+    """Monthly Parquet files of archived transcript segments on local disk."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path_for(self, month: date, run_id: str) -> str:
+        """A new file per archiving run, so a rerun never overwrites a file transcript_archives refers to"""
+        return os.path.join(self.directory, transcriptions.name, f"{month.strftime('%Y-%m')}-{run_id}.parquet")
+
+    def write(self, month: date, batches: Iterable[List[dict]]) -> dict:
+        """
+        Write rows (already sorted by call_session_id) to a new file for the
+        month. The file only appears under its final name once it is complete.
+        """
+        pa, pq = _pyarrow()
+        schema = _schema()
+        path = self.path_for(month, f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.partial"
+
+        rows, low, high = 0, None, None
+        try:
+            with pq.ParquetWriter(partial, schema, compression="zstd") as writer:
+                for batch in batches:
+                    if not batch:
+                        continue
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    rows += len(batch)
+                    low = batch[0]["call_session_id"] if low is None else low
+                    high = batch[-1]["call_session_id"]
+        except BaseException:
+            os.remove(partial)
+            raise
+        os.replace(partial, path)
+        return {"path": path, "row_count": rows, "min_call_session_id": low, "max_call_session_id": high}
+
+    def read_batches(self, path: str) -> Iterator[List[dict]]:
+        """All rows of an archive file, in file order"""
+        _, pq = _pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=READ_BATCH_ROWS):
+            yield batch.to_pylist()
+
+    def read_call(self, path: str, call_session_id: int) -> List[dict]:
+        _, pq = _pyarrow()
+        table = pq.read_table(path, filters=[("call_session_id", "=", call_session_id)])
+        return table.sort_by("call_transcription_id").to_pylist()
+
+
+def _archive_rows(connection: Connection, start: date, end: date):
+    result = connection.execution_options(yield_per=READ_BATCH_ROWS).execute(
+        select(*(transcriptions.c[field.name] for field in _schema()))
+        .where(transcriptions.c.created_at >= start, transcriptions.c.created_at < end)
+        .order_by(transcriptions.c.call_session_id, transcriptions.c.call_transcription_id)
+    )
+    for partition in result.mappings().partitions():
+        yield [
+            {**row, "role": row["role"].value if row["role"] is not None else None}
+            for row in partition
+        ]
+
+
+def _row_order(row: dict):
+    return row["call_session_id"], row["call_transcription_id"]
+
+
+def _merged(archived: Iterable[List[dict]], fresh: Iterable[List[dict]]) -> Iterator[List[dict]]:
+    """Two row streams sorted by (call_session_id, call_transcription_id) merged into one, in batches"""
+    rows = heapq.merge(
+        itertools.chain.from_iterable(archived), itertools.chain.from_iterable(fresh), key=_row_order
+    )
+    while batch := list(itertools.islice(rows, READ_BATCH_ROWS)):
+        yield batch
+
+
+def cold_months(connection: Connection, hot_months: int, today: Optional[date] = None) -> List[date]:
+    """
+    Months older than the hot window that are still in the database: every old
+    partition on a partitioned table (empty ones are dropped too), otherwise
+    every old month that has rows.
+    """
+    cutoff = add_months((today or date.today()).replace(day=1), -hot_months)
+    if is_partitioned(connection):
+        return [month for month in list_partitions(connection) if month < cutoff]
+
+    oldest = connection.execute(select(func.min(transcriptions.c.created_at))).scalar()
+    months = []
+    month = oldest.date().replace(day=1) if oldest else cutoff
+    while month < cutoff:
+        has_rows = connection.execute(
+            select(transcriptions.c.call_transcription_id)
+            .where(transcriptions.c.created_at >= month, transcriptions.c.created_at < add_months(month, 1))
+            .limit(1)
+        ).first()
+        if has_rows:
+            months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def archive_month(engine: Engine, month: date, store: TranscriptArchiveStore) -> dict:
+    """
+    Archive one month of transcript segments and remove them from the database.
+
+    If the month was archived before, its earlier rows are carried into the
+    new file. Aborts (leaving the database and the earlier archive untouched)
+    if the month gained rows while the file was being written.
+    """
+    start, end = month, add_months(month, 1)
+    fresh_rows = 0
+
+    def counted(batches: Iterable[List[dict]]) -> Iterator[List[dict]]:
+        nonlocal fresh_rows
+        for batch in batches:
+            fresh_rows += len(batch)
+            yield batch
+
+    with engine.connect() as connection:
+        earlier = connection.execute(
+            select(archives.c.path, archives.c.row_count, archives.c.min_call_session_id, archives.c.max_call_session_id)
+            .where(archives.c.month == month)
+        ).mappings().first()
+        previous = earlier["path"] if earlier else None
+        fresh = counted(_archive_rows(connection, start, end))
+        info = store.write(month, _merged(store.read_batches(previous), fresh) if previous else fresh)
+
+    try:
+        with engine.begin() as connection:
+            in_range = (transcriptions.c.created_at >= start, transcriptions.c.created_at < end)
+            has_partition = is_partitioned(connection) and month in list_partitions(connection)
+            if has_partition:
+                # Block writers to the partition until it is dropped
+                connection.execute(text(f"LOCK TABLE {partition_name(month)} IN ACCESS EXCLUSIVE MODE"))
+            stored = connection.execute(select(func.count()).select_from(transcriptions).where(*in_range)).scalar()
+            if stored != fresh_rows:
+                raise RuntimeError(
+                    f"{month.strftime('%Y-%m')} has {stored} rows but {fresh_rows} were archived; retry later"
+                )
+
+            if fresh_rows:
+                connection.execute(delete(archives).where(archives.c.month == month))
+                connection.execute(insert(archives).values(month=month, archived_at=datetime.utcnow(), **info))
+            if has_partition:
+                drop_partition(connection, month)
+            else:
+                connection.execute(delete(transcriptions).where(*in_range))
+    except Exception:
+        # Only the file written by this run; `previous` is still the committed archive
+        os.remove(info["path"])
+        raise
+
+    if fresh_rows:
+        if previous:
+            os.remove(previous)
+    else:
+        # Nothing new: the earlier archive (if any) stays as it is
+        os.remove(info["path"])
+        info = dict(earlier) if earlier else {
+            "path": None, "row_count": 0, "min_call_session_id": None, "max_call_session_id": None
+        }
+    return {"month": month.strftime("%Y-%m"), "archived_rows": fresh_rows, **info}
+
+
+def main():
+    from app.core.config import settings
+    from app.core.database import engine
+
+    store = TranscriptArchiveStore(settings.TRANSCRIPT_ARCHIVE_DIR)
+    if len(sys.argv) > 1:
+        months = [datetime.strptime(value, "%Y-%m").date() for value in sys.argv[1:]]
+    else:
+        with engine.connect() as connection:
+            months = cold_months(connection, settings.TRANSCRIPT_HOT_MONTHS)
+
+    for month in months:
+        result = archive_month(engine, month, store)
+        print(
+            f"Archived {result['archived_rows']} segments from {result['month']} to {result['path']}"
+            f" ({result['row_count']} in the file)"
+        )
+    if not months:
+        print("Nothing to archive")
+
+
+if __name__ == "__main__":
+    main()
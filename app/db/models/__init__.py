@@ -0,0 +1,16 @@
+# Import every table model so relationship targets given by name ("CallSession",
+# "Department", ...) are registered before the mappers are configured
+from app.db.models.agent import Agent
+from app.db.models.agent_kpi import AgentKpi
+from app.db.models.agent_monthly_kpi import AgentMonthlyKpiRollup, KpiRollupContribution
+from app.db.models.call_session import CallSession, CallSessionStatus
+from app.db.models.call_summary import CallSummary
+from app.db.models.call_transcription import CallTranscription, TranscriptionRole
+from app.db.models.company import Company
+from app.db.models.company_document import Document
+from app.db.models.customer import Customer
+from app.db.models.department import Department
+from app.db.models.interaction_metric import InteractionMetric
+from app.db.models.monthly_kpi import MonthlyKpi
+from app.db.models.resolution import Resolution
+from app.db.models.transcript_archive import TranscriptArchive
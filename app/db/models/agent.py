@@ -16,6 +16,10 @@ class Agent(SQLModel, table=True):
     updated: datetime = Field(default_factory=datetime.utcnow)
 
     company: Optional["Company"] = Relationship(back_populates="agents")
+    call_sessions: List["CallSession"] = Relationship(back_populates="agent")
+    kpis: List["AgentKpi"] = Relationship(back_populates="agent")
+    monthly_kpis: List["MonthlyKpi"] = Relationship(back_populates="agent")
+    resolutions: List["Resolution"] = Relationship(back_populates="agent")
 
 
 
@@ -7,7 +7,8 @@ from app.db.models.agent import Agent
 class AgentKpi(SQLModel, table=True):
 
     kpi_id: Optional[int] = Field(default=None, primary_key=True, index=True)
-
+    call_session_id: Optional[int] = Field(default=None, foreign_key="call_sessions.call_session_id", index=True)
+    agent_id: Optional[int] = Field(default=None, foreign_key="agent.agent_id", index=True)
 
     grade: Optional[float] = Field(default=None)
     summary: Optional[str] = Field(default=None)
@@ -17,5 +18,5 @@ class AgentKpi(SQLModel, table=True):
     updated: datetime = Field(default_factory=datetime.utcnow)
 
     # relationships
-    call_session: Optional["CallSession"] = Relationship(back_populates="kpi")
-    agent: Optional["Agent"] = Relationship(back_populates="kpi")
+    call_session: Optional["CallSession"] = Relationship(back_populates="kpis")
+    agent: Optional["Agent"] = Relationship(back_populates="kpis")
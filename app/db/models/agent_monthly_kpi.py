@@ -0,0 +1,52 @@
+from typing import Optional
+from datetime import date, datetime
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+
+class AgentMonthlyKpiRollup(SQLModel, table=True):
+    """Running aggregates of an agent's call scores for one calendar month."""
+    __tablename__ = "agent_monthly_kpi_rollups"
+    __table_args__ = (UniqueConstraint("agent_id", "month"),)
+
+    rollup_id: Optional[int] = Field(default=None, primary_key=True)
+    agent_id: int = Field(foreign_key="agent.agent_id", index=True)
+    month: date
+
+    call_count: int = Field(default=0)
+
+    grade_count: int = Field(default=0)
+    grade_sum: float = Field(default=0.0)
+    grade_min: Optional[float] = Field(default=None)
+    grade_max: Optional[float] = Field(default=None)
+    grade_sketch: Optional[str] = Field(default=None)
+
+    csat_count: int = Field(default=0)
+    csat_sum: float = Field(default=0.0)
+    csat_min: Optional[float] = Field(default=None)
+    csat_max: Optional[float] = Field(default=None)
+    csat_sketch: Optional[str] = Field(default=None)
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AgentMonthlyKpiRollup(agent_id={self.agent_id}, month={self.month})>"
+
+
+class KpiRollupContribution(SQLModel, table=True):
+    """
+    What each call session currently contributes to a rollup, so a re-scored
+    call replaces its old values instead of being counted twice.
+    """
+    __tablename__ = "kpi_rollup_contributions"
+    __table_args__ = (Index("ix_kpi_rollup_contributions_agent_month", "agent_id", "month"),)
+
+    call_session_id: int = Field(primary_key=True, foreign_key="call_sessions.call_session_id")
+    agent_id: int = Field(foreign_key="agent.agent_id")
+    month: date
+
+    grade: Optional[float] = Field(default=None)
+    csat: Optional[float] = Field(default=None)
+
+    def __repr__(self):
+        return f"<KpiRollupContribution(call_session_id={self.call_session_id}, agent_id={self.agent_id})>"
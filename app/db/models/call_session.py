@@ -1,6 +1,7 @@
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 
 from app.db.models.agent import Agent
@@ -18,6 +19,18 @@ class CallSessionStatus(str, Enum):
     FAILED = "failed"
 
 class CallSession(SQLModel, table=True):
+    __tablename__ = "call_sessions"
+    # Keyset pagination of dashboard lists: newest first within an agent, company or customer.
+    # Partial indexes: soft-deleted rows are never listed, so they are left out of the index
+    __table_args__ = (
+        Index("ix_call_sessions_agent_created", "agent_id", "created_at", "call_session_id",
+              postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL")),
+        Index("ix_call_sessions_company_created", "company_id", "created_at", "call_session_id",
+              postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL")),
+        Index("ix_call_sessions_customer_created", "customer_id", "created_at", "call_session_id",
+              postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL")),
+    )
+
     call_session_id: Optional[int] = Field(default=None, primary_key=True)
     company_id: Optional[int] = Field(default=None, foreign_key="company.company_id", index=True)
     customer_id: Optional[int] = Field(default=None, foreign_key="customer.customer_id", index=True)
@@ -38,6 +51,7 @@ class CallSession(SQLModel, table=True):
     kpis: List["AgentKpi"] = Relationship(back_populates="call_session", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
     transcriptions: List["CallTranscription"] = Relationship(back_populates="call_session", sa_relationship_kwargs={"cascade": "all, delete-orphan"})
     interaction_metrics :  List["InteractionMetric"] = Relationship(back_populates="call_session")
+    summaries: List["CallSummary"] = Relationship(back_populates="call_session")
 
     def __repr__(self):
         return (
@@ -9,6 +9,7 @@ class Role(str, Enum):
 
 class CallSummary(SQLModel, table=True):
     call_summary_id: Optional[int] = Field(default=None, primary_key=True)
+    call_session_id: Optional[int] = Field(default=None, foreign_key="call_sessions.call_session_id", index=True)
     summary: Optional[str] = Field(default=None)
     role: Optional[Role] = Field(default=None)
     points: Optional[float] = Field(default=None)
@@ -17,8 +18,8 @@ class CallSummary(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    # backref to CallSession; make sure CallSession.summary points back here
-    call_session: Optional["CallSession"] = Relationship(back_populates="summary")
+    # backref to CallSession; make sure CallSession.summaries points back here
+    call_session: Optional["CallSession"] = Relationship(back_populates="summaries")
 
 
 
@@ -1,6 +1,7 @@
 from typing import Optional
 from datetime import datetime, timedelta
 from enum import Enum
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field, Relationship
 
 
@@ -11,6 +12,13 @@ class TranscriptionRole(str, Enum):
     CUSTOMER = "customer"
 
 class CallTranscription(SQLModel, table=True):
+    # Live segments of a call in order; on Postgres the table is range-partitioned
+    # by created_at (see app.db.partitioning)
+    __table_args__ = (
+        Index("ix_calltranscription_session_live", "call_session_id", "call_transcription_id",
+              postgresql_where=text("deleted_at IS NULL"), sqlite_where=text("deleted_at IS NULL")),
+    )
+
     call_transcription_id: Optional[int] = Field(default=None, primary_key=True)
     call_session_id: int = Field(foreign_key="call_sessions.call_session_id", index=True)
 
@@ -13,4 +13,8 @@ class Company(SQLModel, table=True):
     password: str
 
     agents: List[Agent] = Relationship(back_populates="company")
-    documents: List["Document"] = Relationship(back_populates="company")
\ No newline at end of file
+    documents: List["Document"] = Relationship(back_populates="company")
+    customers: List["Customer"] = Relationship(back_populates="company")
+    departments: List["Department"] = Relationship(back_populates="company")
+    resolutions: List["Resolution"] = Relationship(back_populates="company")
+    call_sessions_company: List["CallSession"] = Relationship(back_populates="company")
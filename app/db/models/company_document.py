@@ -7,7 +7,7 @@ from sqlmodel import SQLModel, Field, Relationship
 
 class Document(SQLModel, table=True):
     document_id: Optional[int] = Field(default=None, primary_key=True)
-    company_id: Optional[int] = Field(default=None, foreign_key="company.id", index=True)
+    company_id: Optional[int] = Field(default=None, foreign_key="company.company_id", index=True)
     document_name: str = Field(..., max_length=255)
     document_type: str = Field(..., max_length=255)
     document_file: Optional[str] = Field(default=None, max_length=500)
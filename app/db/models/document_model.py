@@ -1,9 +1,12 @@
+import logging
 from typing import List, Optional
 import uuid
 from datetime import datetime
 
 from app.schemas.document import DocumentCreate, DocumentUpdate
 
+logger = logging.getLogger(__name__)
+
 # This is a placeholder. For a real DB, you'd use SQLAlchemy models:
 # from sqlalchemy import Column, String, Text, DateTime, ForeignKey
 # from sqlalchemy.dialects.postgresql import UUID
@@ -36,25 +39,25 @@ class PlaceholderDBDocument:
 
     @classmethod
     def create(cls, db_session_placeholder, doc_data: 'DocumentCreate') -> 'PlaceholderDBDocument':
-        print(f"PlaceholderDB: Creating document '{doc_data.title}'")
+        logger.debug("Creating document %r", doc_data.title)
         new_doc = cls(title=doc_data.title, content=doc_data.content, source=doc_data.source)
         cls._documents_store[new_doc.id] = new_doc
         return new_doc
 
     @classmethod
     def get_by_id(cls, db_session_placeholder, doc_id: uuid.UUID) -> Optional['PlaceholderDBDocument']:
-        print(f"PlaceholderDB: Getting document by ID {doc_id}")
+        logger.debug("Getting document by ID %s", doc_id)
         return cls._documents_store.get(doc_id)
 
     @classmethod
     def get_all(cls, db_session_placeholder, skip: int = 0, limit: int = 10) -> List['PlaceholderDBDocument']:
-        print(f"PlaceholderDB: Getting all documents (skip={skip}, limit={limit})")
+        logger.debug("Getting all documents (skip=%d, limit=%d)", skip, limit)
         all_docs = list(cls._documents_store.values())
         return sorted(all_docs, key=lambda d: d.created_at, reverse=True)[skip : skip + limit]
 
     @classmethod
     def update(cls, db_session_placeholder, doc_id: uuid.UUID, doc_update_data: 'DocumentUpdate') -> Optional['PlaceholderDBDocument']:
-        print(f"PlaceholderDB: Updating document ID {doc_id}")
+        logger.debug("Updating document ID %s", doc_id)
         doc = cls._documents_store.get(doc_id)
         if doc:
             update_data = doc_update_data.model_dump(exclude_unset=True)
@@ -66,7 +69,7 @@ class PlaceholderDBDocument:
 
     @classmethod
     def delete(cls, db_session_placeholder, doc_id: uuid.UUID) -> bool:
-        print(f"PlaceholderDB: Deleting document ID {doc_id}")
+        logger.debug("Deleting document ID %s", doc_id)
         if doc_id in cls._documents_store:
             del cls._documents_store[doc_id]
             return True
@@ -79,6 +82,6 @@ class PlaceholderDBDocument:
             cls.create(None, DocumentCreate(title="FastAPI Introduction", content="FastAPI is a modern, fast web framework.", source="FastAPI Docs"))
             cls.create(None, DocumentCreate(title="Next.js Basics", content="Next.js is a React framework for production.", source="Next.js Blog"))
             cls.create(None, DocumentCreate(title="REST API Design", content="Principles of designing good RESTful APIs.", source="Web Standards"))
-            print("PlaceholderDB: Initialized with 3 dummy documents.")
+            logger.debug("Initialized with 3 dummy documents.")
 
 PlaceholderDBDocument.initialize_dummy_data()
\ No newline at end of file
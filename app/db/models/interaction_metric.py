@@ -15,11 +15,24 @@ class InteractionMetric(SQLModel, table=True):
     customer_sentiment: Optional[str] = Field(default=None)
     ai_generated_summary: Optional[str] = Field(default=None)
 
+    # Conversation analytics computed from word-level timings
+    call_duration_seconds: Optional[float] = Field(default=None)
+    agent_talk_ratio: Optional[float] = Field(default=None)
+    silence_seconds: Optional[float] = Field(default=None)
+    overlap_seconds: Optional[float] = Field(default=None)
+    interruption_count: Optional[int] = Field(default=None)
+    longest_monologue_seconds: Optional[float] = Field(default=None)
+    longest_monologue_speaker: Optional[str] = Field(default=None, max_length=50)
+    agent_words_per_minute: Optional[float] = Field(default=None)
+    customer_words_per_minute: Optional[float] = Field(default=None)
+
     recorded_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     deleted_at: Optional[datetime] = Field(default=None, index=True)
 
     call_session_id: int = Field(foreign_key="call_sessions.call_session_id", index=True)
 
+    call_session: Optional["CallSession"] = Relationship(back_populates="interaction_metrics")
+
     def __repr__(self):
         return f"<InteractionMetric(interaction_metric_id={self.interaction_metric_id}, call_session_id={self.call_session_id})>"
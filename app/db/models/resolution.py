@@ -18,7 +18,8 @@ class Resolution(SQLModel, table=True):
     resolution: Optional[str] = Field(default=None)
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Indexed for the incremental refresh of the recommendation index
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     deleted_at: Optional[datetime] = Field(default=None, index=True)
 
     company: Optional["Company"] = Relationship(back_populates="resolutions")
@@ -0,0 +1,20 @@
+from typing import Optional
+from datetime import date, datetime
+from sqlmodel import SQLModel, Field
+
+
+class TranscriptArchive(SQLModel, table=True):
+    """One month of CallTranscription rows moved out of the database into a Parquet file."""
+    __tablename__ = "transcript_archives"
+
+    archive_id: Optional[int] = Field(default=None, primary_key=True)
+    month: date = Field(unique=True)
+    path: str = Field(max_length=500)
+    row_count: int
+    min_call_session_id: Optional[int] = Field(default=None)
+    max_call_session_id: Optional[int] = Field(default=None)
+
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TranscriptArchive(month={self.month}, rows={self.row_count})>"
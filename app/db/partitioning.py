@@ -0,0 +1,177 @@
+"""
+Monthly range partitioning of CallTranscription on Postgres.
+
+Usage:
+    python -m app.db.partitioning convert    # one-off: rebuild the table as partitioned (copies all rows)
+    python -m app.db.partitioning maintain   # create partitions for the coming months
+
+Partitions are named calltranscription_yYYYYmMM and cover one calendar month of
+created_at; a default partition catches anything outside them. Queries that
+bound created_at only scan the matching partitions, and cold months can be
+detached and dropped whole by the archival job (app.db.archival).
+
+CallSession is not partitioned: seven tables hold foreign keys to
+call_sessions.call_session_id, and Postgres requires the partition key in
+every unique constraint a foreign key points at.
+"""
+import re
+import sys
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.models.call_transcription import CallTranscription
+
+TABLE = CallTranscription.__table__.name
+PARTITION_KEY = "created_at"
+_PARTITION_NAME = re.compile(rf"^{TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_y{month.year}m{month.month:02d}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table AND c.relnamespace = 'public'::regnamespace"
+        ),
+        {"table": TABLE}
+    ).first() is not None
+
+
+def list_partitions(connection: Connection) -> List[date]:
+    """Months that currently have their own partition, oldest first"""
+    names = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table AND p.relnamespace = 'public'::regnamespace"
+        ),
+        {"table": TABLE}
+    ).scalars()
+    months = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def create_partition(connection: Connection, month: date) -> None:
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+
+
+def ensure_partitions(connection: Connection, months_ahead: int, today: Optional[date] = None) -> List[date]:
+    """Create the partitions for this month and the next `months_ahead` months, plus the default partition"""
+    current = (today or date.today()).replace(day=1)
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    for month in months:
+        create_partition(connection, month)
+    connection.execute(text(f"CREATE TABLE IF NOT EXISTS {TABLE}_default PARTITION OF {TABLE} DEFAULT"))
+    return months
+
+
+def drop_partition(connection: Connection, month: date) -> None:
+    name = partition_name(month)
+    connection.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+    connection.execute(text(f"DROP TABLE {name}"))
+
+
+def convert_to_partitioned(connection: Connection, months_ahead: int) -> List[date]:
+    """
+    Rebuild calltranscription as a table partitioned by month of created_at.
+
+    Runs in the caller's transaction and holds an exclusive lock on the table
+    while rows are copied, so run it in a maintenance window. Does nothing if
+    the table is already partitioned.
+
+    Returns:
+        The months that got a partition
+    """
+    if connection.dialect.name != "postgresql":
+        raise ValueError("Table partitioning is only available on Postgres")
+    if is_partitioned(connection):
+        return []
+
+    legacy = f"{TABLE}_unpartitioned"
+    sequence = connection.execute(
+        text("SELECT pg_get_serial_sequence(:table, 'call_transcription_id')"), {"table": TABLE}
+    ).scalar()
+    has_search_vector = connection.execute(
+        text("SELECT 1 FROM information_schema.columns WHERE table_name = :table AND column_name = 'search_vector'"),
+        {"table": TABLE}
+    ).first() is not None
+    months = [
+        row[0].date() for row in connection.execute(
+            text(f"SELECT DISTINCT date_trunc('month', {PARTITION_KEY}) FROM {TABLE}")
+        )
+    ]
+
+    connection.execute(text(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE"))
+    connection.execute(text(f"ALTER TABLE {TABLE} RENAME TO {legacy}"))
+    connection.execute(text(
+        f"CREATE TABLE {TABLE} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE ({PARTITION_KEY})"
+    ))
+
+    for month in months:
+        create_partition(connection, month)
+    created = ensure_partitions(connection, months_ahead)
+
+    columns = ", ".join(column.name for column in CallTranscription.__table__.columns)
+    connection.execute(text(f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {legacy}"))
+    if sequence:
+        # The id sequence belongs to the old column; move it before the old table is dropped
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.call_transcription_id"))
+    connection.execute(text(f"DROP TABLE {legacy}"))
+
+    # Constraints and indexes go on the parent (so every partition gets them) once the
+    # old table and its identically named constraints are gone.
+    # The partition key has to be part of the primary key
+    connection.execute(text(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (call_transcription_id, {PARTITION_KEY})"))
+    connection.execute(text(
+        f"ALTER TABLE {TABLE} ADD FOREIGN KEY (call_session_id) REFERENCES call_sessions (call_session_id)"
+    ))
+    for index in CallTranscription.__table__.indexes:
+        index.create(connection)
+    if has_search_vector:
+        connection.execute(text(f"CREATE INDEX ix_{TABLE}_search_vector ON {TABLE} USING GIN (search_vector)"))
+
+    return sorted(set(months) | set(created))
+
+
+def main():
+    from app.core.config import settings
+    from app.core.database import engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "maintain"
+    with engine.begin() as connection:
+        if command == "convert":
+            months = convert_to_partitioned(connection, settings.TRANSCRIPT_PARTITION_MONTHS_AHEAD)
+            print(f"{TABLE} partitioned ({len(months)} monthly partitions created)")
+        elif command == "maintain":
+            if not is_partitioned(connection):
+                print(f"{TABLE} is not partitioned; run 'convert' first")
+                return
+            months = ensure_partitions(connection, settings.TRANSCRIPT_PARTITION_MONTHS_AHEAD)
+            print(f"Partitions ready through {months[-1].strftime('%Y-%m')}")
+        else:
+            print("Usage: python -m app.db.partitioning [convert|maintain]")
+
+
+if __name__ == "__main__":
+    main()
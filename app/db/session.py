@@ -7,6 +7,9 @@
 # SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 # engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {})
 # SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+import logging
+
+logger = logging.getLogger(__name__)
 
 def get_db_placeholder():
     """
@@ -20,6 +23,6 @@ def get_db_placeholder():
     #     yield db
     # finally:
     #     db.close()
-    print("Placeholder: DB session would be provided here.")
+    logger.debug("Placeholder: DB session would be provided here.")
     yield None # Simulate providing a None session for now
-    print("Placeholder: DB session would be closed here.")
\ No newline at end of file
+    logger.debug("Placeholder: DB session would be closed here.")
\ No newline at end of file
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.jobs.queue import get_job_queue
+from app.jobs.tasks import tasks
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"]
+)
+
+
+async def queue_job(task: str, payload: dict, idempotency_key: Optional[str] = None) -> JSONResponse:
+    """Enqueue `task` for the job worker: 202 with the job id and where to poll it"""
+    if not settings.JOBS_ENABLED:
+        raise HTTPException(status_code=503, detail="The job queue is disabled (JOBS_ENABLED is false)")
+    job_id = await tasks.enqueue_async(task, payload, idempotency_key=idempotency_key)
+    return JSONResponse(
+        content={"job_id": job_id, "task": task, "status_url": f"/jobs/{job_id}"},
+        status_code=202
+    )
+
+
+@router.get("/stats")
+async def job_stats():
+    """Job counts by queue and status"""
+    return {"queues": await run_in_threadpool(get_job_queue().stats)}
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int):
+    """Status of a queued job; `result` is set once it is done, `last_error` after a failed attempt"""
+    job = await run_in_threadpool(get_job_queue().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found (finished jobs are purged after a while)")
+    return job.as_dict()
@@ -0,0 +1,393 @@
+import os
+import random
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import (
+    Column, Float, Index, Integer, MetaData, String, Table, Text, and_, bindparam, delete, func, insert, select, update
+)
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: int
+    task: str
+    payload: dict
+    queue: str
+    attempts: int
+    max_attempts: int
+    status: str = RUNNING
+    idempotency_key: Optional[str] = None
+    result: Any = None
+    last_error: Optional[str] = None
+    available_at: Optional[float] = None
+    created_at: Optional[float] = None
+    updated_at: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "task": self.task,
+            "queue": self.queue,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "idempotency_key": self.idempotency_key,
+            "result": self.result,
+            "last_error": self.last_error,
+            "available_at": self.available_at,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class JobQueue:
+    """
+    Durable job queue in one SQL table, shared by the API (which enqueues)
+    and any number of worker processes (which claim and run jobs); see
+    app.jobs.worker.
+
+    - Claiming a job leases it for `visibility_timeout` seconds. A worker
+      that dies or stops renewing the lease (extend) loses the job, and it
+      is handed out again once the lease has run out.
+    - Completing or failing a job is fenced by the attempt that claimed it,
+      so a worker whose lease expired cannot overwrite the new attempt.
+    - A failed attempt is retried after an exponential backoff with jitter
+      (`backoff_base` * 2^(attempt - 1), capped at `backoff_max`) until
+      the job has used `max_attempts`; then it stays failed.
+    - An idempotency key makes enqueueing the same work twice return the
+      first job while it is queued, running or done, for as long as
+      finished jobs are kept (purge). Enqueueing under the key of a job
+      that failed for good queues that job again with fresh attempts.
+
+    Jobs are claimed and finished in batches, so a worker needs a handful
+    of statements per batch rather than per job. On Postgres claims use
+    FOR UPDATE SKIP LOCKED; SQLite serialises writers itself.
+    """
+
+    def __init__(
+            self,
+            engine: Engine,
+            visibility_timeout: float = 60.0,
+            max_attempts: int = 5,
+            backoff_base: float = 2.0,
+            backoff_max: float = 300.0
+    ):
+        self.engine = engine
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        metadata = MetaData()
+        self.table = Table(
+            "job_queue",
+            metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("queue", String(64), nullable=False),
+            Column("task", String(128), nullable=False),
+            Column("payload", Text, nullable=False),
+            Column("status", String(16), nullable=False),
+            Column("attempts", Integer, nullable=False, default=0),
+            Column("max_attempts", Integer, nullable=False),
+            Column("idempotency_key", String(255), nullable=True, unique=True),
+            Column("result", Text, nullable=True),
+            Column("last_error", Text, nullable=True),
+            # Queued: when the job may run; running: when its lease runs out
+            Column("available_at", Float, nullable=False),
+            Column("created_at", Float, nullable=False),
+            Column("updated_at", Float, nullable=False),
+            Index("ix_job_queue_claim", "queue", "status", "available_at"),
+            Index("ix_job_queue_finished", "status", "updated_at"),
+        )
+        metadata.create_all(engine)
+
+    def enqueue(
+            self,
+            task: str,
+            payload: Optional[dict] = None,
+            queue: str = "default",
+            idempotency_key: Optional[str] = None,
+            max_attempts: Optional[int] = None,
+            delay: float = 0.0
+    ) -> int:
+        """
+        Add a job; returns its id, or the id of the job already enqueued under
+        `idempotency_key` (re-queued if it had failed)
+        """
+        return self.enqueue_many([{
+            "task": task,
+            "payload": payload,
+            "queue": queue,
+            "idempotency_key": idempotency_key,
+            "max_attempts": max_attempts,
+            "delay": delay,
+        }])[0]
+
+    def enqueue_many(self, jobs: Sequence[dict]) -> List[int]:
+        """
+        Add several jobs in one transaction; each dict takes the arguments of
+        enqueue. Returns the job ids in the same order.
+        """
+        now = time.time()
+        rows = [
+            {
+                "queue": job.get("queue") or "default",
+                "task": job["task"],
+                "payload": orjson.dumps(job.get("payload") or {}).decode(),
+                "status": QUEUED,
+                "attempts": 0,
+                "max_attempts": job.get("max_attempts") or self.max_attempts,
+                "idempotency_key": job.get("idempotency_key"),
+                "available_at": now + (job.get("delay") or 0.0),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for job in jobs
+        ]
+        keyed = [row for row in rows if row["idempotency_key"] is not None]
+        unkeyed = [row for row in rows if row["idempotency_key"] is None]
+        table = self.table
+        insert_returning_ids = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        with self.engine.begin() as connection:
+            new_ids = iter(connection.execute(insert_returning_ids, unkeyed).scalars().all() if unkeyed else [])
+            by_key = {}
+            if keyed:
+                connection.execute(self._insert_or_retry_failed(), keyed)
+                by_key = dict(connection.execute(
+                    select(table.c.idempotency_key, table.c.id)
+                    .where(table.c.idempotency_key.in_([row["idempotency_key"] for row in keyed]))
+                ).all())
+        return [by_key[row["idempotency_key"]] if row["idempotency_key"] is not None else next(new_ids) for row in rows]
+
+    def _insert_or_retry_failed(self):
+        """Insert keyed jobs; a key already taken by a failed job resets that job instead, any other is left alone"""
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise ValueError(f"Idempotency keys are not supported on {dialect}")
+        statement = dialect_insert(self.table)
+        new = statement.excluded
+        return statement.on_conflict_do_update(
+            index_elements=["idempotency_key"],
+            set_={
+                "queue": new.queue,
+                "task": new.task,
+                "payload": new.payload,
+                "status": QUEUED,
+                "attempts": 0,
+                "max_attempts": new.max_attempts,
+                "result": None,
+                "last_error": None,
+                "available_at": new.available_at,
+                "updated_at": new.updated_at,
+            },
+            where=self.table.c.status == FAILED
+        )
+
+    def claim(self, queues: Iterable[str], limit: int, visibility_timeout: Optional[float] = None) -> List[Job]:
+        """
+        Lease up to `limit` runnable jobs of `queues`, oldest first: queued
+        jobs that are due and running jobs whose lease ran out. Each claim
+        counts as an attempt.
+        """
+        now = time.time()
+        table = self.table
+        queues = list(queues)
+        due = and_(
+            table.c.queue.in_(queues),
+            table.c.status.in_((QUEUED, RUNNING)),
+            table.c.available_at <= now,
+        )
+        with self.engine.begin() as connection:
+            # Jobs whose last attempt's worker vanished and that have no attempts left
+            connection.execute(
+                update(table)
+                .where(due, table.c.status == RUNNING, table.c.attempts >= table.c.max_attempts)
+                .values(status=FAILED, last_error="Lease expired on the last attempt", updated_at=now)
+            )
+            candidates = (
+                select(table.c.id)
+                .where(due, table.c.attempts < table.c.max_attempts)
+                .order_by(table.c.available_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            rows = connection.execute(
+                update(table)
+                .where(table.c.id.in_(candidates.scalar_subquery()))
+                .values(
+                    status=RUNNING,
+                    attempts=table.c.attempts + 1,
+                    available_at=now + (visibility_timeout or self.visibility_timeout),
+                    updated_at=now
+                )
+                .returning(table.c.id, table.c.task, table.c.payload, table.c.queue, table.c.attempts,
+                           table.c.max_attempts, table.c.idempotency_key)
+            ).all()
+        jobs = [
+            Job(
+                id=row.id, task=row.task, payload=orjson.loads(row.payload), queue=row.queue,
+                attempts=row.attempts, max_attempts=row.max_attempts, idempotency_key=row.idempotency_key
+            )
+            for row in rows
+        ]
+        # RETURNING does not keep the subquery's order
+        jobs.sort(key=lambda job: job.id)
+        return jobs
+
+    def complete(self, results: Sequence[Tuple[Job, Any]]) -> int:
+        """Mark jobs done with their results; returns how many still held their lease"""
+        if not results:
+            return 0
+        now = time.time()
+        table = self.table
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.attempts == bindparam("b_attempts"),
+                   table.c.status == RUNNING)
+            .values(status=DONE, result=bindparam("b_result"), last_error=None, updated_at=now)
+        )
+        with self.engine.begin() as connection:
+            result = connection.execute(statement, [
+                {
+                    "b_id": job.id,
+                    "b_attempts": job.attempts,
+                    "b_result": orjson.dumps(value, default=str).decode() if value is not None else None,
+                }
+                for job, value in results
+            ])
+        return result.rowcount
+
+    def fail(self, job: Job, error: str, retry: bool = True, delay: Optional[float] = None) -> str:
+        """
+        Record a failed attempt. The job is queued again after `delay` (or
+        the backoff for its attempt) while it has attempts left and `retry`
+        is set, otherwise it is failed for good. Returns the new status.
+        """
+        status = QUEUED if retry and job.attempts < job.max_attempts else FAILED
+        if delay is None:
+            delay = self.backoff(job.attempts)
+        self._finish_attempt(job, status, error=error, delay=delay)
+        return status
+
+    def reschedule(self, job: Job, delay: float) -> None:
+        """Run the job again after `delay` seconds without using up an attempt (e.g. polling for a result)"""
+        self._finish_attempt(job, QUEUED, error=None, delay=delay, refund=True)
+
+    def _finish_attempt(self, job: Job, status: str, error: Optional[str], delay: float, refund: bool = False) -> None:
+        now = time.time()
+        table = self.table
+        values = {"status": status, "last_error": error, "available_at": now + delay, "updated_at": now}
+        if refund:
+            values["attempts"] = table.c.attempts - 1
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(table)
+                .where(table.c.id == job.id, table.c.attempts == job.attempts, table.c.status == RUNNING)
+                .values(**values)
+            )
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retrying after `attempt` failed: exponential, capped, with jitter"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** max(0, attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def extend(self, jobs: Sequence[Job], visibility_timeout: Optional[float] = None) -> None:
+        """Renew the leases of jobs that are still being worked on"""
+        if not jobs:
+            return
+        table = self.table
+        available_at = time.time() + (visibility_timeout or self.visibility_timeout)
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"), table.c.attempts == bindparam("b_attempts"),
+                       table.c.status == RUNNING)
+                .values(available_at=available_at),
+                [{"b_id": job.id, "b_attempts": job.attempts} for job in jobs]
+            )
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self.engine.connect() as connection:
+            row = connection.execute(select(self.table).where(self.table.c.id == job_id)).first()
+        if row is None:
+            return None
+        return Job(
+            id=row.id,
+            task=row.task,
+            payload=orjson.loads(row.payload),
+            queue=row.queue,
+            attempts=row.attempts,
+            max_attempts=row.max_attempts,
+            status=row.status,
+            idempotency_key=row.idempotency_key,
+            result=orjson.loads(row.result) if row.result is not None else None,
+            last_error=row.last_error,
+            available_at=row.available_at,
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Job counts by queue and status"""
+        table = self.table
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(table.c.queue, table.c.status, func.count()).group_by(table.c.queue, table.c.status)
+            ).all()
+        counts: Dict[str, Dict[str, int]] = {}
+        for queue, status, count in rows:
+            counts.setdefault(queue, {})[status] = count
+        return counts
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs (and so free their idempotency keys) last updated over `older_than` seconds ago"""
+        table = self.table
+        with self.engine.begin() as connection:
+            result = connection.execute(
+                delete(table).where(table.c.status.in_((DONE, FAILED)), table.c.updated_at < time.time() - older_than)
+            )
+        return result.rowcount
+
+
+def create_job_queue(settings) -> JobQueue:
+    """Build the job queue selected by JOBS_BACKEND."""
+    backend = settings.JOBS_BACKEND
+    if backend == "sqlite":
+        from app.core.database import sqlite_wal_engine
+
+        os.makedirs(os.path.dirname(os.path.abspath(settings.JOBS_SQLITE_PATH)), exist_ok=True)
+        engine = sqlite_wal_engine(settings.JOBS_SQLITE_PATH)
+    elif backend == "database":
+        from app.core.database import get_engine
+
+        engine = get_engine()
+    else:
+        raise ValueError(f"Unknown JOBS_BACKEND '{backend}'. Use sqlite or database")
+    return JobQueue(
+        engine,
+        visibility_timeout=settings.JOBS_VISIBILITY_TIMEOUT_SECONDS,
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        backoff_base=settings.JOBS_BACKOFF_SECONDS,
+        backoff_max=settings.JOBS_BACKOFF_MAX_SECONDS
+    )
+
+
+@lru_cache(maxsize=None)
+def get_job_queue() -> JobQueue:
+    """The process's job queue, created on first use (the table is created if missing)"""
+    return create_job_queue(settings)
@@ -0,0 +1,85 @@
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.jobs.queue import JobQueue, get_job_queue
+
+
+class RetryLater(Exception):
+    """Raised by a task to run again after `delay` seconds without using up an attempt (e.g. still waiting on AWS)"""
+
+    def __init__(self, delay: float, reason: str = ""):
+        super().__init__(reason or f"retry in {delay:g}s")
+        self.delay = delay
+
+
+@dataclass
+class Task:
+    name: str
+    run: Callable[..., Any]
+    queue: str = "default"
+    max_attempts: Optional[int] = None
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.run)
+
+
+class TaskRegistry:
+    """
+    Named job handlers and the queue each one runs on. Handlers take the
+    job's payload as keyword arguments and return a JSON-serialisable
+    result; coroutine functions run on the worker's event loop, plain
+    functions on its thread pool.
+    """
+
+    def __init__(self, job_queue: Callable[[], JobQueue] = get_job_queue):
+        self._job_queue = job_queue
+        self._tasks: Dict[str, Task] = {}
+
+    def task(self, name: str, queue: str = "default", max_attempts: Optional[int] = None):
+        """Decorator registering a handler as `name`"""
+        def register(run: Callable[..., Any]) -> Callable[..., Any]:
+            self._tasks[name] = Task(name, run, queue, max_attempts)
+            return run
+        return register
+
+    def get(self, name: str) -> Task:
+        return self._tasks[name]
+
+    @property
+    def queues(self) -> List[str]:
+        return sorted({task.queue for task in self._tasks.values()})
+
+    def enqueue(
+            self,
+            name: str,
+            payload: Optional[dict] = None,
+            idempotency_key: Optional[str] = None,
+            delay: float = 0.0
+    ) -> int:
+        """Queue a run of task `name` on its queue; returns the job id"""
+        task = self._tasks[name]
+        return self._job_queue().enqueue(
+            name,
+            payload,
+            queue=task.queue,
+            idempotency_key=idempotency_key,
+            max_attempts=task.max_attempts,
+            delay=delay
+        )
+
+    async def enqueue_async(
+            self,
+            name: str,
+            payload: Optional[dict] = None,
+            idempotency_key: Optional[str] = None,
+            delay: float = 0.0
+    ) -> int:
+        return await run_in_threadpool(self.enqueue, name, payload, idempotency_key, delay)
+
+
+# The app's tasks register here (app.jobs.tasks)
+tasks = TaskRegistry()
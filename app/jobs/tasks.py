@@ -0,0 +1,99 @@
+"""
+Work the API hands to the job worker (python -m app.jobs.worker) instead of
+doing it in the request. Handlers import the app modules they need when
+they run, so importing this module (to enqueue) stays cheap.
+"""
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.jobs.registry import RetryLater, tasks
+
+# Terminal Transcribe job statuses; anything else is still queued or in progress
+_TRANSCRIBE_DONE = ("COMPLETED", "FAILED")
+
+
+async def _grouped_segments(job_id: str) -> List[dict]:
+    """The grouped transcript of a finished job, from the local cache or downloaded, grouped and cached"""
+    from app.transcribe import transcribe_router as transcribe
+
+    segments = await run_in_threadpool(transcribe.dedup_index.get_transcript, job_id)
+    if segments is None:
+        transcript = await run_in_threadpool(transcribe._fetch_transcript, job_id)
+        segments, _ = transcribe.group_transcript_items(transcript, job_id)
+        await run_in_threadpool(transcribe.dedup_index.store_transcript, job_id, segments)
+    return segments
+
+
+@tasks.task("transcription.track", queue="transcripts")
+async def track_transcription(job_id: str, call_session_id: Optional[int] = None) -> dict:
+    """
+    Follow a Transcribe job until it finishes, then cache its grouped
+    transcript and, when the upload named a call session, queue persisting
+    the transcript and its conversation metrics. Unlike the API's
+    in-process tracker this survives restarts.
+    """
+    from app.transcribe import transcribe_router as transcribe
+
+    status = await run_in_threadpool(transcribe.transcribe_client.get_transcription_job, TranscriptionJobName=job_id)
+    job = status["TranscriptionJob"]
+    if job["TranscriptionJobStatus"] not in _TRANSCRIBE_DONE:
+        raise RetryLater(settings.JOBS_TRACK_POLL_SECONDS, "transcription in progress")
+    if job["TranscriptionJobStatus"] == "FAILED":
+        await run_in_threadpool(transcribe.dedup_index.update_status, job_id, "FAILED")
+        return {"status": "FAILED", "reason": job.get("FailureReason")}
+
+    segments = await _grouped_segments(job_id)
+    follow_ups = {}
+    if call_session_id is not None:
+        payload = {"job_id": job_id, "call_session_id": call_session_id}
+        for name in ("transcript.persist", "transcript.metrics"):
+            follow_ups[name] = await tasks.enqueue_async(
+                name, payload, idempotency_key=f"{name}:{job_id}:{call_session_id}"
+            )
+    return {"status": "COMPLETED", "segments": len(segments), "jobs": follow_ups}
+
+
+@tasks.task("transcript.persist", queue="transcripts")
+async def persist_transcript(job_id: str, call_session_id: int) -> dict:
+    """Store a finished job's grouped segments in CallTranscription (idempotent, replaces the job's rows)"""
+    from app.core.database import get_async_session_factory
+    from app.services.transcript_persistence_service import TranscriptPersistenceService
+    from app.transcribe.transcribe_router import parse_datetime
+
+    segments = await _grouped_segments(job_id)
+    starts = [parse_datetime(segment["timestamp"]).timestamp() for segment in segments]
+    async with get_async_session_factory()() as session:
+        written = await TranscriptPersistenceService(session).persist_job_segments(
+            call_session_id, job_id, segments, starts
+        )
+    return {"segments_written": written}
+
+
+@tasks.task("transcript.metrics", queue="transcripts")
+async def transcript_metrics(job_id: str, call_session_id: int) -> dict:
+    """Compute conversation analytics from the job's word timings and store them on the call session"""
+    from app.analytics.conversation_metrics import compute_conversation_metrics, word_timings_from_transcript
+    from app.core.database import get_async_session_factory
+    from app.services.interaction_metric_service import InteractionMetricService
+    from app.transcribe.transcribe_router import _fetch_transcript
+
+    transcript = await run_in_threadpool(_fetch_transcript, job_id)
+    metrics = await run_in_threadpool(
+        lambda: compute_conversation_metrics(*word_timings_from_transcript(transcript))
+    )
+    async with get_async_session_factory()() as session:
+        metric_id = await InteractionMetricService(session).store_conversation_metrics(call_session_id, metrics)
+    return {"interaction_metric_id": metric_id, "metrics": metrics.as_dict()}
+
+
+@tasks.task("assistant.reply", queue="llm", max_attempts=3)
+async def assistant_reply(job_id: str) -> dict:
+    """The assistant's response to a finished transcript (see GET /transcribe/helper/{job_id})"""
+    from app.transcribe.transcribe_router import assistant_reply as reply
+
+    result = await reply(job_id)
+    if result.get("status") == "in_progress":
+        raise RetryLater(settings.JOBS_TRACK_POLL_SECONDS, "transcription in progress")
+    return result
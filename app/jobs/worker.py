@@ -0,0 +1,281 @@
+"""
+Job worker: claims jobs from the durable queue and runs the app's tasks.
+
+Usage:
+    python -m app.jobs.worker [--queues default,transcripts,llm] [--concurrency 16]
+                              [--threads 4] [--processes 1] [--batch-size 100]
+
+Runs alongside the API (ROLE=worker in entrypoint.sh) against the same
+JOBS_BACKEND. With --processes N a supervisor starts N worker processes
+and forwards SIGTERM/SIGINT to them; each stops claiming, lets running
+jobs finish for up to JOBS_WORKER_SHUTDOWN_GRACE_SECONDS and exits.
+"""
+import argparse
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.jobs.queue import FAILED, Job, JobQueue
+from app.jobs.registry import RetryLater, TaskRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Runs up to `concurrency` jobs at a time from `queues` in one process:
+    coroutine tasks on the event loop, plain functions on a pool of
+    `threads` threads.
+
+    Jobs are claimed up to `batch_size` at a time and acknowledged in
+    batches every `flush_interval` seconds, so each job costs a fraction of
+    a database round trip. Queue calls run in order on one dedicated
+    thread. Leases of running jobs are renewed every third of the
+    visibility timeout, and finished jobs older than `retention` seconds
+    are purged now and then.
+    """
+
+    def __init__(
+            self,
+            job_queue: JobQueue,
+            registry: TaskRegistry,
+            queues: Sequence[str],
+            concurrency: int = 16,
+            threads: int = 4,
+            batch_size: int = 100,
+            poll_interval: float = 0.5,
+            flush_interval: float = 0.05,
+            shutdown_grace: float = 30.0,
+            retention: Optional[float] = None
+    ):
+        self.queue = job_queue
+        self.registry = registry
+        self.queues = list(queues)
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.flush_interval = flush_interval
+        self.shutdown_grace = shutdown_grace
+        self.retention = retention
+        self.completed = 0
+        self.failed = 0
+        self._threads = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="job")
+        self._queue_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-queue")
+        self._running: Dict[int, Tuple[Job, asyncio.Task]] = {}
+        self._finished: List[Tuple[Job, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    def stop(self) -> None:
+        """Stop claiming jobs; run() returns once running jobs are done or the grace period is over"""
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self) -> None:
+        self._wakeup = asyncio.Event()
+        helpers = [asyncio.create_task(self._flush_loop()), asyncio.create_task(self._lease_loop())]
+        logger.info("job worker started", extra={"queues": self.queues, "concurrency": self.concurrency})
+        try:
+            while not self._stopping:
+                capacity = min(self.concurrency - len(self._running), self.batch_size)
+                if capacity <= 0:
+                    await self._wait(None)
+                    continue
+                try:
+                    jobs = await self._call(self.queue.claim, self.queues, capacity)
+                except Exception as e:
+                    logger.warning("failed to claim jobs: %s", e)
+                    jobs = []
+                for job in jobs:
+                    self._running[job.id] = (job, asyncio.create_task(self._execute(job)))
+                if len(jobs) < capacity:
+                    # Queue drained: wait for new jobs, or for a slot to free up
+                    await self._wait(self.poll_interval)
+        finally:
+            await self._drain()
+            for helper in helpers:
+                helper.cancel()
+            await asyncio.gather(*helpers, return_exceptions=True)
+            await self._flush()
+            self._threads.shutdown(wait=False)
+            self._queue_thread.shutdown(wait=True)
+            logger.info("job worker stopped", extra={"completed": self.completed, "failed": self.failed})
+
+    async def _call(self, method, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._queue_thread, functools.partial(method, *args))
+
+    async def _wait(self, timeout: Optional[float]) -> None:
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _execute(self, job: Job) -> None:
+        try:
+            try:
+                task = self.registry.get(job.task)
+            except KeyError:
+                self.failed += 1
+                await self._call(self.queue.fail, job, f"Unknown task {job.task!r}", False)
+                return
+            if task.is_async:
+                result = await task.run(**job.payload)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._threads, functools.partial(task.run, **job.payload)
+                )
+        except RetryLater as e:
+            await self._call(self.queue.reschedule, job, e.delay)
+        except asyncio.CancelledError:
+            # Shutdown grace period is over; the job goes back on the queue as a failed attempt
+            await self._call(self.queue.fail, job, "Worker shut down while running the job", True, 0.0)
+        except Exception as e:
+            self.failed += 1
+            status = await self._call(self.queue.fail, job, f"{type(e).__name__}: {e}")
+            logger.warning(
+                "job %s (%s) attempt %s/%s failed: %s: %s%s",
+                job.id, job.task, job.attempts, job.max_attempts, type(e).__name__, e,
+                " (giving up)" if status == FAILED else ""
+            )
+        else:
+            self.completed += 1
+            self._finished.append((job, result))
+        finally:
+            self._running.pop(job.id, None)
+            self._wakeup.set()
+
+    async def _flush(self) -> None:
+        finished, self._finished = self._finished, []
+        if finished:
+            try:
+                await self._call(self.queue.complete, finished)
+            except Exception as e:
+                # Their leases run out and they are run again: at least once, never lost
+                logger.warning("failed to acknowledge %s jobs: %s", len(finished), e)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._flush()
+
+    async def _lease_loop(self) -> None:
+        last_purge = 0.0
+        while True:
+            await asyncio.sleep(self.queue.visibility_timeout / 3)
+            try:
+                await self._call(self.queue.extend, [job for job, _ in self._running.values()])
+                if self.retention and time.monotonic() - last_purge > 3600:
+                    last_purge = time.monotonic()
+                    purged = await self._call(self.queue.purge, self.retention)
+                    if purged:
+                        logger.info("purged %s finished jobs", purged)
+            except Exception as e:
+                logger.warning("failed to renew job leases: %s", e)
+
+    async def _drain(self) -> None:
+        running = [task for _, task in self._running.values()]
+        if not running:
+            return
+        _, pending = await asyncio.wait(running, timeout=self.shutdown_grace)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending, timeout=5.0)
+
+
+def run_worker(options: dict) -> None:
+    """One worker process until SIGTERM/SIGINT"""
+    from app.core.log import configure_logging
+    from app.jobs.queue import get_job_queue
+    from app.jobs.tasks import tasks
+
+    configure_logging()
+    worker = Worker(
+        get_job_queue(),
+        tasks,
+        queues=options["queues"],
+        concurrency=options["concurrency"],
+        threads=options["threads"],
+        batch_size=options["batch_size"],
+        poll_interval=settings.JOBS_POLL_SECONDS,
+        shutdown_grace=settings.JOBS_WORKER_SHUTDOWN_GRACE_SECONDS,
+        retention=settings.JOBS_RETENTION_SECONDS
+    )
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, worker.stop)
+        try:
+            await worker.run()
+        finally:
+            # Close pooled connections the tasks opened (only if any did)
+            from app.core.database import get_async_engine
+            if get_async_engine.cache_info().currsize:
+                await get_async_engine().dispose()
+
+    asyncio.run(main())
+
+
+def supervise(options: dict, processes: int) -> None:
+    """Run `processes` worker processes, forwarding shutdown signals to them"""
+    from app.jobs.queue import get_job_queue
+
+    # Create the table once here rather than racing to do it in every child
+    get_job_queue().engine.dispose()
+    context = multiprocessing.get_context("spawn")
+    children = [
+        context.Process(target=run_worker, args=(options,), name=f"job-worker-{number}")
+        for number in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def forward(signum, _frame):
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for child in children:
+        child.join()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--queues", default=",".join(settings.JOBS_WORKER_QUEUES), help="comma-separated queue names")
+    parser.add_argument("--concurrency", type=int, default=settings.JOBS_WORKER_CONCURRENCY,
+                        help="jobs run at once per process")
+    parser.add_argument("--threads", type=int, default=settings.JOBS_WORKER_THREADS,
+                        help="threads per process for tasks that are plain functions")
+    parser.add_argument("--processes", type=int, default=settings.JOBS_WORKER_PROCESSES)
+    parser.add_argument("--batch-size", type=int, default=settings.JOBS_BATCH_SIZE, help="jobs claimed per query")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    options = {
+        "queues": [name for name in args.queues.split(",") if name],
+        "concurrency": args.concurrency,
+        "threads": args.threads,
+        "batch_size": args.batch_size,
+    }
+    if args.processes > 1:
+        supervise(options, args.processes)
+    else:
+        run_worker(options)
+
+
+if __name__ == "__main__":
+    main()
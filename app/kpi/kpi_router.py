@@ -0,0 +1,75 @@
+from datetime import date, datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from app.services.interaction_metric_service import InteractionMetricService, get_interaction_metric_service
+from app.services.kpi_rollup_service import KpiRollupService, get_kpi_rollup_service
+
+router = APIRouter(
+    prefix="/kpi",
+    tags=["kpi"]
+)
+
+
+class CallScoresRequest(BaseModel):
+    internal_qa_score: Optional[float] = Field(default=None, ge=0)
+    csat_score: Optional[float] = Field(default=None, ge=0)
+
+
+def parse_month(value: str) -> date:
+    """Parse a YYYY-MM month into the first day of that month"""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid month '{value}', expected YYYY-MM")
+
+
+@router.put("/call-sessions/{call_session_id}/scores")
+async def record_call_scores(
+        call_session_id: int,
+        request: CallScoresRequest,
+        metric_service: InteractionMetricService = Depends(get_interaction_metric_service)
+):
+    """Store a call's QA grade and/or CSAT and update the agent's monthly KPI rollup"""
+    if request.internal_qa_score is None and request.csat_score is None:
+        raise HTTPException(status_code=422, detail="Provide internal_qa_score and/or csat_score")
+    try:
+        metric_id = await metric_service.record_scores(
+            call_session_id,
+            internal_qa_score=request.internal_qa_score,
+            csat_score=request.csat_score
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to record call scores: {str(e)}"
+        )
+
+    return {"call_session_id": call_session_id, "interaction_metric_id": metric_id}
+
+
+@router.get("/agents/{agent_id}/monthly")
+async def list_agent_monthly_kpis(
+        agent_id: int,
+        start: str = Query(..., alias="from", description="First month, YYYY-MM"),
+        end: str = Query(..., alias="to", description="Last month, YYYY-MM"),
+        rollup_service: KpiRollupService = Depends(get_kpi_rollup_service)
+):
+    """Monthly grade and CSAT summaries (count, mean, min, max, p50, p90) for a range of months"""
+    months = await rollup_service.list_agent_months(agent_id, parse_month(start), parse_month(end))
+    return {"agent_id": agent_id, "months": months}
+
+
+@router.get("/agents/{agent_id}/monthly/{month}")
+async def get_agent_monthly_kpi(
+        agent_id: int,
+        month: str,
+        rollup_service: KpiRollupService = Depends(get_kpi_rollup_service)
+):
+    """Grade and CSAT summary for one agent-month"""
+    summary = await rollup_service.get_agent_month(agent_id, parse_month(month))
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No scored calls for this agent and month")
+    return summary
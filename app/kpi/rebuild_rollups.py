@@ -0,0 +1,31 @@
+"""
+Rebuild all agent-month KPI rollups from call sessions and InteractionMetric.
+
+Usage:
+    python -m app.kpi.rebuild_rollups [batch_size]
+"""
+import asyncio
+import sys
+import time
+
+from app.core.database import async_engine, async_session_factory
+from app.services.kpi_rollup_service import KpiRollupService
+
+
+async def rebuild(batch_size: int) -> dict:
+    try:
+        async with async_session_factory() as session:
+            return await KpiRollupService(session).rebuild(batch_size=batch_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    started = time.perf_counter()
+    result = asyncio.run(rebuild(batch_size))
+    print(f"Rebuilt {result['rollups']} rollups from {result['calls']} calls in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import Depends
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import get_async_session
+from app.db.models import Agent, CallSession, CallSummary, Customer, InteractionMetric
+
+# selectinload batches IN lists per 500 parents; staying below keeps one query per relationship
+MAX_PAGE_SIZE = 200
+
+_SESSION_COLUMNS = (
+    CallSession.call_session_id,
+    CallSession.agent_id,
+    CallSession.customer_id,
+    CallSession.status,
+    CallSession.duration,
+    CallSession.created_at,
+)
+_METRIC_COLUMNS = (
+    InteractionMetric.interaction_metric_id,
+    InteractionMetric.call_session_id,
+    InteractionMetric.internal_qa_score,
+    InteractionMetric.csat_score,
+    InteractionMetric.is_first_contact_resolution,
+    InteractionMetric.customer_sentiment,
+    InteractionMetric.call_duration_seconds,
+    InteractionMetric.agent_talk_ratio,
+)
+
+
+def encode_cursor(created_at: datetime, call_session_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{call_session_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, call_session_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(call_session_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+def _metric_dict(metric: InteractionMetric) -> dict:
+    return {column.key: getattr(metric, column.key) for column in _METRIC_COLUMNS if column.key != "call_session_id"}
+
+
+def _session_dict(call_session: CallSession) -> dict:
+    return {column.key: getattr(call_session, column.key) for column in _SESSION_COLUMNS}
+
+
+class CallSessionRepository:
+    """
+    Read queries behind the agent, company and customer dashboards.
+
+    Each view loads its relationships eagerly (joined for many-to-one,
+    selectin for collections) and only the columns it renders, so a page
+    costs a fixed number of statements whatever its size. Lists are newest
+    first and paginated by keyset on (created_at, call_session_id); pass the
+    returned next_cursor to get the following page.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def _page(statement, cursor: Optional[str], limit: int):
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if cursor:
+            statement = statement.where(
+                tuple_(CallSession.created_at, CallSession.call_session_id) < tuple_(*decode_cursor(cursor))
+            )
+        statement = statement.where(CallSession.deleted_at.is_(None)).order_by(
+            CallSession.created_at.desc(), CallSession.call_session_id.desc()
+        ).limit(limit + 1)
+        return statement, limit
+
+    @staticmethod
+    def _result(items: List[dict], limit: int) -> dict:
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["call_session_id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+    async def agent_recent_sessions(self, agent_id: int, limit: int = 20, cursor: Optional[str] = None) -> dict:
+        """An agent's calls with the customer's name and the call metrics (2 statements)"""
+        statement, limit = self._page(
+            select(CallSession)
+            .where(CallSession.agent_id == agent_id)
+            .options(
+                load_only(*_SESSION_COLUMNS),
+                joinedload(CallSession.customer).load_only(Customer.customer_id, Customer.customer_name),
+                selectinload(
+                    CallSession.interaction_metrics.and_(InteractionMetric.deleted_at.is_(None))
+                ).load_only(*_METRIC_COLUMNS),
+            ),
+            cursor,
+            limit
+        )
+        call_sessions = (await self.session.exec(statement)).all()
+        return self._result([
+            {
+                **_session_dict(call_session),
+                "customer_name": call_session.customer.customer_name if call_session.customer else None,
+                "metrics": [_metric_dict(metric) for metric in call_session.interaction_metrics],
+            }
+            for call_session in call_sessions
+        ], limit)
+
+    async def company_call_list(self, company_id: int, limit: int = 50, cursor: Optional[str] = None) -> dict:
+        """A company's calls as flat rows with agent and customer names (1 statement)"""
+        statement, limit = self._page(
+            select(*_SESSION_COLUMNS, Agent.agent_name, Customer.customer_name)
+            .outerjoin(Agent, Agent.agent_id == CallSession.agent_id)
+            .outerjoin(Customer, Customer.customer_id == CallSession.customer_id)
+            .where(CallSession.company_id == company_id),
+            cursor,
+            limit
+        )
+        rows = (await self.session.exec(statement)).all()
+        return self._result([dict(row._mapping) for row in rows], limit)
+
+    async def customer_history(self, customer_id: int, limit: int = 20, cursor: Optional[str] = None) -> dict:
+        """A customer's calls with the agent's name, metrics and call summaries (3 statements)"""
+        statement, limit = self._page(
+            select(CallSession)
+            .where(CallSession.customer_id == customer_id)
+            .options(
+                load_only(*_SESSION_COLUMNS),
+                joinedload(CallSession.agent).load_only(Agent.agent_id, Agent.agent_name),
+                selectinload(
+                    CallSession.interaction_metrics.and_(InteractionMetric.deleted_at.is_(None))
+                ).load_only(*_METRIC_COLUMNS),
+                selectinload(CallSession.summaries).load_only(
+                    CallSummary.call_summary_id, CallSummary.call_session_id, CallSummary.role, CallSummary.summary
+                ),
+            ),
+            cursor,
+            limit
+        )
+        call_sessions = (await self.session.exec(statement)).all()
+        return self._result([
+            {
+                **_session_dict(call_session),
+                "agent_name": call_session.agent.agent_name if call_session.agent else None,
+                "metrics": [_metric_dict(metric) for metric in call_session.interaction_metrics],
+                "summaries": [
+                    {"role": summary.role, "summary": summary.summary} for summary in call_session.summaries
+                ],
+            }
+            for call_session in call_sessions
+        ], limit)
+
+
+# FastAPI Dependency provider for CallSessionRepository
+def get_call_session_repository(session: AsyncSession = Depends(get_async_session)):
+    return CallSessionRepository(session=session)
@@ -0,0 +1,93 @@
+from typing import List, Optional
+
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.kpi_rollup import month_start
+from app.core.config import settings
+from app.core.database import get_async_session
+from app.db.archival import TranscriptArchiveStore
+from app.db.models.call_session import CallSession
+from app.db.models.call_transcription import CallTranscription, TranscriptionRole
+from app.db.models.transcript_archive import TranscriptArchive
+
+transcriptions = CallTranscription.__table__
+sessions = CallSession.__table__
+archives = TranscriptArchive.__table__
+
+_SEGMENT_COLUMNS = ("call_transcription_id", "call_file", "timestamp", "role", "transcription")
+
+
+def _segment(row) -> dict:
+    segment = {column: row[column] for column in _SEGMENT_COLUMNS}
+    if isinstance(segment["role"], str):
+        segment["role"] = TranscriptionRole(segment["role"])
+    if segment["timestamp"] is not None:
+        segment["timestamp"] = segment["timestamp"].total_seconds()
+    return segment
+
+
+class TranscriptRepository:
+    """
+    A call's transcript, wherever its segments are stored.
+
+    Segments are never older than their call session, so live rows are read
+    with created_at bounded below by the session's, which lets Postgres skip
+    every partition before the call's month. Months moved out by
+    app.db.archival are read from their Parquet file, but only when the
+    manifest says the file can hold the call.
+    """
+
+    def __init__(self, session: AsyncSession, store: TranscriptArchiveStore):
+        self.session = session
+        self.store = store
+
+    async def call_transcript(self, call_session_id: int) -> Optional[dict]:
+        """Segments of one call in spoken order, or None if the call does not exist"""
+        connection = await self.session.connection()
+        created_at = (await connection.execute(
+            select(sessions.c.created_at)
+            .where(sessions.c.call_session_id == call_session_id, sessions.c.deleted_at.is_(None))
+        )).scalar()
+        if created_at is None:
+            return None
+
+        live = (await connection.execute(
+            select(*(transcriptions.c[column] for column in _SEGMENT_COLUMNS))
+            .where(
+                transcriptions.c.call_session_id == call_session_id,
+                transcriptions.c.created_at >= created_at,
+                transcriptions.c.deleted_at.is_(None)
+            )
+            .order_by(transcriptions.c.call_transcription_id)
+        )).mappings().all()
+
+        paths = (await connection.execute(
+            select(archives.c.path)
+            .where(
+                archives.c.month >= month_start(created_at),
+                archives.c.min_call_session_id <= call_session_id,
+                archives.c.max_call_session_id >= call_session_id
+            )
+            .order_by(archives.c.month)
+        )).scalars().all()
+        archived: List[dict] = []
+        for path in paths:
+            rows = await run_in_threadpool(self.store.read_call, path, call_session_id)
+            archived.extend(row for row in rows if row["deleted_at"] is None)
+
+        segments = {row["call_transcription_id"]: _segment(row) for row in archived}
+        segments.update((row["call_transcription_id"], _segment(row)) for row in live)
+        return {
+            "call_session_id": call_session_id,
+            "created_at": created_at,
+            "archived": bool(archived),
+            "segments": [segments[key] for key in sorted(segments)],
+        }
+
+
+# FastAPI Dependency provider for TranscriptRepository
+def get_transcript_repository(session: AsyncSession = Depends(get_async_session)):
+    return TranscriptRepository(session=session, store=TranscriptArchiveStore(settings.TRANSCRIPT_ARCHIVE_DIR))
@@ -0,0 +1,337 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from app.db.models.resolution import Resolution
+
+if TYPE_CHECKING:
+    # numpy is imported on first use, not when the API starts
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+resolutions = Resolution.__table__
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can could do does for from have how i if in is it its me my no not of on "
+    "or our please so that the their then there this to was we what when which will with would you your".split()
+)
+# A row committed slightly after a newer one can carry an older updated_at; re-read this far back
+_REFRESH_OVERLAP = timedelta(seconds=30)
+
+ShardKey = Tuple[int, Optional[int]]
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [token for token in _TOKEN.findall((text or "").lower()) if token not in _STOPWORDS]
+
+
+def embed(weights: Dict[str, float], dim: int) -> "np.ndarray":
+    """
+    Hashed bag-of-features embedding (unit length) of weighted tokens.
+
+    Each word contributes itself and its character trigrams, so inflections
+    and typos ("refund", "refunded", "refnud") still land close together.
+    """
+    import numpy as np
+
+    vector = np.zeros(dim, dtype=np.float32)
+    for token, weight in weights.items():
+        padded = f"#{token}#"
+        features = [token] + [padded[i:i + 3] for i in range(len(padded) - 2)]
+        share = weight / math.sqrt(len(features))
+        for feature in features:
+            bucket = zlib.crc32(feature.encode())
+            vector[bucket % dim] += share if bucket & 0x80000000 else -share
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class _Shard:
+    """Resolutions of one company and department: BM25 postings plus an embedding matrix"""
+
+    def __init__(self, dim: int):
+        import numpy as np
+
+        self.ids: List[int] = []
+        self.slots: Dict[int, int] = {}
+        self.vectors = np.zeros((16, dim), dtype=np.float32)
+        self.terms: Dict[int, Counter] = {}
+        self.lengths: Dict[int, int] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, resolution_id: int, terms: Counter, vector: "np.ndarray") -> None:
+        if len(self.ids) == len(self.vectors):
+            import numpy as np
+
+            self.vectors = np.concatenate([self.vectors, np.zeros_like(self.vectors)])
+        self.slots[resolution_id] = len(self.ids)
+        self.vectors[len(self.ids)] = vector
+        self.ids.append(resolution_id)
+        self.terms[resolution_id] = terms
+        self.lengths[resolution_id] = length = sum(terms.values())
+        self.total_length += length
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[resolution_id] = count
+
+    def remove(self, resolution_id: int) -> None:
+        # Move the last row into the freed slot so the matrix stays dense
+        slot = self.slots.pop(resolution_id)
+        last = self.ids.pop()
+        if last != resolution_id:
+            self.ids[slot] = last
+            self.slots[last] = slot
+            self.vectors[slot] = self.vectors[len(self.ids)]
+        self.total_length -= self.lengths.pop(resolution_id)
+        for term in self.terms.pop(resolution_id):
+            posting = self.postings[term]
+            del posting[resolution_id]
+            if not posting:
+                del self.postings[term]
+
+
+class ResolutionIndex:
+    """
+    In-memory retrieval index over live Resolution rows, sharded per company
+    and department.
+
+    A query is scored with BM25 over title and resolution text and with the
+    cosine of hashed embeddings, and the stored `rank` is blended in. Queries
+    for a department also see the company-wide resolutions (no department).
+    The index follows the table incrementally: every refresh only reads rows
+    whose updated_at moved, so writers must bump updated_at (including when
+    soft-deleting).
+    """
+
+    def __init__(
+            self,
+            dim: int = 256,
+            lexical_weight: float = 0.5,
+            semantic_weight: float = 0.3,
+            rank_weight: float = 0.2,
+            min_similarity: float = 0.2,
+            recency_decay: float = 0.6,
+            refresh_interval: float = 10.0,
+            k1: float = 1.2,
+            b: float = 0.75
+    ):
+        self.dim = dim
+        self.lexical_weight = lexical_weight
+        self.semantic_weight = semantic_weight
+        self.rank_weight = rank_weight
+        self.min_similarity = min_similarity
+        self.recency_decay = recency_decay
+        self.refresh_interval = refresh_interval
+        self.k1 = k1
+        self.b = b
+        self._shards: Dict[ShardKey, _Shard] = {}
+        self._rows: Dict[int, dict] = {}
+        self._watermark: Optional[datetime] = None
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def shard_keys(self) -> List[ShardKey]:
+        """(company_id, department_id) of every shard, largest first"""
+        return sorted(self._shards, key=lambda key: -len(self._shards[key]))
+
+    def upsert(self, row: dict) -> None:
+        """Index a Resolution row (a mapping of its columns); soft-deleted rows are removed"""
+        resolution_id = row["resolution_id"]
+        version = (row["updated_at"], row["deleted_at"])
+        current = self._rows.get(resolution_id)
+        if current is not None and current["version"] == version:
+            return
+        if current is not None:
+            self.remove(resolution_id)
+        if row["deleted_at"] is not None:
+            return
+
+        # The title is short and says what the fix is for; count it twice
+        terms = Counter(tokenize(row["title"]) * 2 + tokenize(row["resolution"]))
+        key = (row["company_id"], row["department_id"])
+        shard = self._shards.get(key)
+        if shard is None:
+            shard = self._shards[key] = _Shard(self.dim)
+        shard.add(resolution_id, terms, embed(terms, self.dim))
+        self._rows[resolution_id] = {
+            "resolution_id": resolution_id,
+            "company_id": row["company_id"],
+            "department_id": row["department_id"],
+            "title": row["title"],
+            "resolution": row["resolution"],
+            "rank": row["rank"],
+            "version": version,
+        }
+
+    def remove(self, resolution_id: int) -> None:
+        current = self._rows.pop(resolution_id, None)
+        if current is None:
+            return
+        key = (current["company_id"], current["department_id"])
+        shard = self._shards[key]
+        shard.remove(resolution_id)
+        if not len(shard):
+            del self._shards[key]
+
+    async def refresh(self, session_factory) -> int:
+        """
+        Apply Resolution rows changed since the last refresh (all live rows on
+        the first call). Returns the number of rows read.
+        """
+        statement = select(*(resolutions.c[column] for column in (
+            "resolution_id", "company_id", "department_id", "title", "resolution", "rank", "updated_at", "deleted_at"
+        )))
+        if self._watermark is None:
+            statement = statement.where(resolutions.c.deleted_at.is_(None))
+        else:
+            statement = statement.where(resolutions.c.updated_at >= self._watermark - _REFRESH_OVERLAP)
+        async with session_factory() as session:
+            connection = await session.connection()
+            rows = (await connection.execute(statement)).mappings().all()
+
+        for row in rows:
+            self.upsert(row)
+        stamps = [row["updated_at"] for row in rows] + [self._watermark or datetime.min + _REFRESH_OVERLAP]
+        self._watermark = max(stamps)
+        self._loaded = True
+        return len(rows)
+
+    async def ensure_loaded(self, session_factory) -> None:
+        """Load the index on first use if the background refresh has not done it yet"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if not self._loaded:
+                await self.refresh(session_factory)
+
+    async def start(self, session_factory) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, session_factory) -> None:
+        while True:
+            try:
+                if self._loaded:
+                    await self.refresh(session_factory)
+                else:
+                    # Shares the first full load with ensure_loaded() callers (requests, warmup)
+                    await self.ensure_loaded(session_factory)
+            except Exception as e:
+                logger.warning("refresh failed: %s", e)
+            await asyncio.sleep(self.refresh_interval)
+
+    def query_weights(self, segments: Sequence[str]) -> Dict[str, float]:
+        """Token weights for a query built from transcript segments, oldest first; later segments count more"""
+        weights: Dict[str, float] = {}
+        factor = 1.0
+        for text in reversed(segments):
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + factor
+            factor *= self.recency_decay
+        return weights
+
+    def _scope(self, company_id: int, department_id: Optional[int]) -> Iterable[_Shard]:
+        if department_id is None:
+            return [shard for (company, _), shard in self._shards.items() if company == company_id]
+        keys = ((company_id, department_id), (company_id, None))
+        return [self._shards[key] for key in keys if key in self._shards]
+
+    def search(
+            self,
+            company_id: int,
+            segments: Sequence[str],
+            department_id: Optional[int] = None,
+            k: int = 5
+    ) -> List[dict]:
+        """Top `k` resolutions for the latest transcript segments (oldest first)"""
+        import numpy as np
+
+        weights = self.query_weights(segments)
+        shards = self._scope(company_id, department_id)
+        if not weights or not shards:
+            return []
+
+        documents = sum(len(shard) for shard in shards)
+        average_length = sum(shard.total_length for shard in shards) / documents or 1.0
+        query_vector = embed(weights, self.dim)
+
+        lexical: Dict[int, float] = {}
+        semantic: Dict[int, float] = {}
+        for term, weight in weights.items():
+            postings = [shard for shard in shards if term in shard.postings]
+            if not postings:
+                continue
+            frequency = sum(len(shard.postings[term]) for shard in postings)
+            idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+            for shard in postings:
+                for resolution_id, count in shard.postings[term].items():
+                    norm = self.k1 * (1 - self.b + self.b * shard.lengths[resolution_id] / average_length)
+                    score = weight * idf * count * (self.k1 + 1) / (count + norm)
+                    lexical[resolution_id] = lexical.get(resolution_id, 0.0) + score
+        for shard in shards:
+            similarities = shard.vectors[:len(shard)] @ query_vector
+            for slot in np.flatnonzero(similarities >= self.min_similarity):
+                semantic[shard.ids[slot]] = float(similarities[slot])
+
+        candidates = lexical.keys() | semantic.keys()
+        if not candidates:
+            return []
+        top_lexical = max(lexical.values(), default=0.0) or 1.0
+        top_rank = max((self._rows[resolution_id]["rank"] or 0.0 for resolution_id in candidates), default=0.0) or 1.0
+
+        scored = []
+        for resolution_id in candidates:
+            row = self._rows[resolution_id]
+            lexical_score = lexical.get(resolution_id, 0.0) / top_lexical
+            semantic_score = semantic.get(resolution_id, 0.0)
+            rank_score = max(row["rank"] or 0.0, 0.0) / top_rank
+            score = (
+                self.lexical_weight * lexical_score
+                + self.semantic_weight * semantic_score
+                + self.rank_weight * rank_score
+            )
+            scored.append((score, resolution_id, lexical_score, semantic_score))
+
+        return [
+            {
+                "resolution_id": resolution_id,
+                "department_id": self._rows[resolution_id]["department_id"],
+                "title": self._rows[resolution_id]["title"],
+                "resolution": self._rows[resolution_id]["resolution"],
+                "rank": self._rows[resolution_id]["rank"],
+                "score": round(score, 4),
+                "lexical": round(lexical_score, 4),
+                "semantic": round(semantic_score, 4),
+            }
+            for score, resolution_id, lexical_score, semantic_score in heapq.nlargest(k, scored)
+        ]
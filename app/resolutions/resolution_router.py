@@ -0,0 +1,68 @@
+import time
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.core.database import get_async_session_factory
+from app.resolutions.resolution_index import ResolutionIndex
+from app.transcribe.transcribe_router import segment_store
+
+router = APIRouter(
+    prefix="/resolutions",
+    tags=["resolutions"]
+)
+
+# Process-local; every worker follows the Resolution table on its own
+resolution_index = ResolutionIndex(
+    dim=settings.RESOLUTION_EMBEDDING_DIM,
+    lexical_weight=settings.RESOLUTION_LEXICAL_WEIGHT,
+    semantic_weight=settings.RESOLUTION_SEMANTIC_WEIGHT,
+    rank_weight=settings.RESOLUTION_RANK_WEIGHT,
+    refresh_interval=settings.RESOLUTION_INDEX_REFRESH_SECONDS
+)
+
+
+class RecommendRequest(BaseModel):
+    company_id: int
+    department_id: Optional[int] = None
+    segments: List[str] = Field(..., min_length=1, max_length=20, description="Latest transcript segments, oldest first")
+    k: int = Field(default=5, ge=1, le=50)
+
+
+async def _recommend(company_id: int, department_id: Optional[int], segments: List[str], k: int) -> dict:
+    started = time.perf_counter()
+    try:
+        await resolution_index.ensure_loaded(get_async_session_factory())
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Resolution index is not available: {str(e)}")
+    results = resolution_index.search(company_id, segments, department_id=department_id, k=k)
+    return {
+        "company_id": company_id,
+        "department_id": department_id,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+@router.post("/recommend")
+async def recommend_resolutions(request: RecommendRequest):
+    """Top-k resolutions for the latest transcript segments of a call"""
+    return await _recommend(request.company_id, request.department_id, request.segments, request.k)
+
+
+@router.get("/recommend/live/{session_id}")
+async def recommend_for_live_call(
+        session_id: str,
+        company_id: int,
+        department_id: Optional[int] = None,
+        k: int = Query(5, ge=1, le=50),
+        segments: int = Query(settings.RESOLUTION_CONTEXT_SEGMENTS, ge=1, le=20)
+):
+    """Top-k resolutions for the latest phrases of the live transcription stream opened with this session_id"""
+    entry = segment_store.get(f"stream_{session_id}")
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No live transcript for this session")
+    latest = [segment["content"] for segment in entry.segments[-segments:]]
+    return await _recommend(company_id, department_id, latest, k)
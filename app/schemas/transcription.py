@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class CallTranscriptionType(BaseModel):
+    timestamp: str
+    agent_name: str
+    content: str
+    id: str
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "timestamp": "2023-01-01 12:00:00",
+                "agent_name": "spk_0",
+                "content": "Hello, how can I help you?",
+                "id": "550e8400-e29b-41d4-a716-446655440000"
+            }
+        }
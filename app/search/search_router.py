@@ -0,0 +1,56 @@
+import time
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.responses import FastJSONResponse
+from app.db.models.call_transcription import TranscriptionRole
+from app.services.transcript_search_service import (
+    TranscriptSearchFilters, TranscriptSearchService, get_transcript_search_service
+)
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"]
+)
+
+
+@router.get("/transcripts")
+async def search_transcripts(
+        q: str = Query(..., min_length=1, max_length=200, description='Words to find; use "quotes" for a phrase'),
+        company_id: Optional[int] = None,
+        agent_id: Optional[int] = None,
+        role: Optional[TranscriptionRole] = None,
+        start: Optional[datetime] = Query(None, description="Calls on or after this time"),
+        end: Optional[datetime] = Query(None, description="Calls before this time"),
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0, le=1000),
+        context: int = Query(2, ge=0, le=10, description="Segments to include before and after each hit"),
+        search_service: TranscriptSearchService = Depends(get_transcript_search_service)
+):
+    """
+    Search stored call transcriptions. Results are ranked by relevance and carry
+    a highlighted snippet plus the surrounding segments of the call.
+    """
+    started = time.perf_counter()
+    try:
+        results = await search_service.search(
+            q,
+            TranscriptSearchFilters(company_id=company_id, agent_id=agent_id, role=role, start=start, end=end),
+            limit=limit,
+            offset=offset,
+            context=context
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Transcript search failed: {str(e)}"
+        )
+
+    # Plain values from the search service: encode directly, skipping jsonable_encoder
+    return FastJSONResponse({
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 1)
+    })
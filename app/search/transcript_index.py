@@ -0,0 +1,92 @@
+"""
+Full-text index over CallTranscription.transcription.
+
+Postgres: a stored tsvector column generated from the text, with a GIN index.
+SQLite: an external-content FTS5 table kept in sync by triggers.
+
+Usage:
+    python -m app.search.transcript_index
+
+Safe to re-run. On Postgres the GIN index is built CONCURRENTLY (unless the
+table is partitioned), so writes are not blocked; adding the generated column
+still rewrites the table once.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.models.call_transcription import CallTranscription
+
+TABLE = CallTranscription.__table__.name
+FTS_TABLE = f"{TABLE}_fts"
+SEARCH_VECTOR = "search_vector"
+TEXT_SEARCH_CONFIG = "english"
+
+_POSTGRES_DDL = [
+    f"""
+    ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR} tsvector
+    GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(transcription, ''))) STORED
+    """,
+    f"CREATE INDEX {{concurrently}} IF NOT EXISTS ix_{TABLE}_{SEARCH_VECTOR} ON {TABLE} USING GIN ({SEARCH_VECTOR})",
+]
+
+_SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        transcription, content='{TABLE}', content_rowid='call_transcription_id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, transcription) VALUES (new.call_transcription_id, new.transcription);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, transcription) VALUES ('delete', old.call_transcription_id, old.transcription);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF transcription ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, transcription) VALUES ('delete', old.call_transcription_id, old.transcription);
+        INSERT INTO {FTS_TABLE}(rowid, transcription) VALUES (new.call_transcription_id, new.transcription);
+    END
+    """,
+]
+
+
+def create_transcript_search_index(connection: Connection, rebuild: bool = False) -> None:
+    """
+    Create the full-text index for the connection's database. Postgres needs an
+    AUTOCOMMIT connection (CREATE INDEX CONCURRENTLY cannot run in a transaction).
+
+    Args:
+        rebuild: SQLite only; re-index rows that were written before the triggers existed
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        # Partitioned tables (app.db.partitioning) cannot build indexes concurrently
+        from app.db.partitioning import is_partitioned
+        concurrently = "" if is_partitioned(connection) else "CONCURRENTLY"
+        for statement in _POSTGRES_DDL:
+            connection.execute(text(statement.format(concurrently=concurrently)))
+    elif dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+        ).first()
+        for statement in _SQLITE_DDL:
+            connection.execute(text(statement))
+        if rebuild or not exists:
+            connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    else:
+        raise ValueError(f"Transcript search is not supported on {dialect}")
+
+
+def main():
+    from app.core.database import engine
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        create_transcript_search_index(connection)
+    print(f"Transcript search index ready on {engine.dialect.name}")
+
+
+if __name__ == "__main__":
+    main()
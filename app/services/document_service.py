@@ -1,3 +1,4 @@
+import logging
 import uuid
 from typing import List, Optional
 from datetime import datetime
@@ -10,6 +11,8 @@ from app.db.models.document_model import PlaceholderDBDocument # Using placehold
 from app.services.llm_service import LLMService, get_llm_service # For potential future use & dependency
 from app.db.session import get_db_placeholder # For db dependency
 
+logger = logging.getLogger(__name__)
+
 class DocumentService:
     def __init__(self, db_session_placeholder, llm_service: Optional[LLMService] = None):
         # In a real app, db_session would be an actual DB session (e.g., SQLAlchemy session)
@@ -17,7 +20,7 @@ class DocumentService:
         self.llm_service = llm_service # Optional LLM service for advanced features
 
     async def create_document(self, doc_in: DocumentCreate) -> DocumentResponse:
-        print(f"DocumentService: Creating document titled '{doc_in.title}'")
+        logger.debug("Creating document titled %r", doc_in.title)
         # In a real app, you'd use self.db to interact with the database
         # Example: new_doc_orm = DocumentModel(**doc_in.model_dump(), created_at=datetime.utcnow(), updated_at=datetime.utcnow())
         # self.db.add(new_doc_orm)
@@ -28,19 +31,19 @@ class DocumentService:
         return DocumentResponse.model_validate(created_doc_model) # Pydantic v2
 
     async def get_document_by_id(self, doc_id: uuid.UUID) -> Optional[DocumentResponse]:
-        print(f"DocumentService: Retrieving document with ID: {doc_id}")
+        logger.debug("Retrieving document with ID: %s", doc_id)
         doc_model = PlaceholderDBDocument.get_by_id(self.db, doc_id)
         if doc_model:
             return DocumentResponse.model_validate(doc_model)
         return None
 
     async def get_all_documents(self, skip: int = 0, limit: int = 10) -> List[DocumentResponse]:
-        print(f"DocumentService: Retrieving all documents (skip={skip}, limit={limit})")
+        logger.debug("Retrieving all documents (skip=%d, limit=%d)", skip, limit)
         doc_models = PlaceholderDBDocument.get_all(self.db, skip=skip, limit=limit)
         return [DocumentResponse.model_validate(doc) for doc in doc_models]
 
     async def update_document(self, doc_id: uuid.UUID, doc_update: DocumentUpdate) -> Optional[DocumentResponse]:
-        print(f"DocumentService: Updating document with ID: {doc_id}")
+        logger.debug("Updating document with ID: %s", doc_id)
         # For a real DB:
         # doc_orm = self.db.query(DocumentModel).filter(DocumentModel.id == doc_id).first()
         # if not doc_orm: return None
@@ -57,7 +60,7 @@ class DocumentService:
         return None
 
     async def delete_document(self, doc_id: uuid.UUID) -> bool:
-        print(f"DocumentService: Deleting document with ID: {doc_id}")
+        logger.debug("Deleting document with ID: %s", doc_id)
         # For a real DB:
         # doc_orm = self.db.query(DocumentModel).filter(DocumentModel.id == doc_id).first()
         # if not doc_orm: return False
@@ -73,7 +76,7 @@ class DocumentService:
         1. Getting an embedding for search_query.query using self.llm_service.
         2. Querying a vector database or performing similarity search against embeddings of stored documents.
         """
-        print(f"DocumentService: Searching documents with query '{search_query.query}'")
+        logger.debug("Searching documents with query %r", search_query.query)
         # Basic keyword matching for placeholder
         all_docs = PlaceholderDBDocument.get_all(self.db, limit=1000) # Get all for local filtering
         
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from fastapi import Depends
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import get_async_session
+from app.db.models.interaction_metric import InteractionMetric
+from app.services.kpi_rollup_service import apply_call_scores
+
+if TYPE_CHECKING:
+    # Imports numpy; only the caller computing the metrics needs it
+    from app.analytics.conversation_metrics import ConversationMetrics
+
+
+class InteractionMetricService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def store_conversation_metrics(self, call_session_id: int, metrics: "ConversationMetrics") -> int:
+        """
+        Save conversation analytics on the call session's InteractionMetric row,
+        creating the row if the session has none yet.
+
+        Returns:
+            The interaction_metric_id that was updated or created
+        """
+        try:
+            connection = await self.session.connection()
+            metric_id = await self._upsert(connection, call_session_id, metrics.as_dict())
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return metric_id
+
+    async def record_scores(
+            self,
+            call_session_id: int,
+            internal_qa_score: Optional[float] = None,
+            csat_score: Optional[float] = None
+    ) -> int:
+        """
+        Save the QA grade and/or CSAT of a call and fold them into the agent's
+        monthly KPI rollup in the same transaction. Scores passed as None are
+        left unchanged.
+
+        Returns:
+            The interaction_metric_id that was updated or created
+        """
+        values = {
+            key: value for key, value in
+            {"internal_qa_score": internal_qa_score, "csat_score": csat_score}.items()
+            if value is not None
+        }
+        try:
+            connection = await self.session.connection()
+            metric_id = await self._upsert(connection, call_session_id, values)
+            await apply_call_scores(connection, call_session_id)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return metric_id
+
+    @staticmethod
+    async def _upsert(connection: AsyncConnection, call_session_id: int, values: dict) -> int:
+        table = InteractionMetric.__table__
+        values = {**values, "updated_at": datetime.utcnow()}
+        metric_id = (await connection.execute(
+            select(table.c.interaction_metric_id)
+            .where(table.c.call_session_id == call_session_id, table.c.deleted_at.is_(None))
+            .order_by(table.c.interaction_metric_id.desc())
+            .limit(1)
+        )).scalar()
+
+        if metric_id is None:
+            metric_id = (await connection.execute(
+                insert(table).values(
+                    call_session_id=call_session_id,
+                    recorded_at=values["updated_at"],
+                    **values
+                )
+            )).inserted_primary_key[0]
+        else:
+            await connection.execute(
+                update(table).where(table.c.interaction_metric_id == metric_id).values(**values)
+            )
+        return metric_id
+
+
+# FastAPI Dependency provider for InteractionMetricService
+def get_interaction_metric_service(session: AsyncSession = Depends(get_async_session)):
+    return InteractionMetricService(session=session)
@@ -0,0 +1,243 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Depends
+from sqlalchemy import and_, delete, exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.analytics.kpi_rollup import ROLLUP_METRICS, MetricAggregate, month_start
+from app.core.database import get_async_session
+from app.db.models.agent_monthly_kpi import AgentMonthlyKpiRollup, KpiRollupContribution
+from app.db.models.call_session import CallSession
+from app.db.models.interaction_metric import InteractionMetric
+
+rollups = AgentMonthlyKpiRollup.__table__
+contributions = KpiRollupContribution.__table__
+sessions = CallSession.__table__
+metrics = InteractionMetric.__table__
+
+
+def _is_latest_metric():
+    """The newest live InteractionMetric of its call session (the one the services read and write)"""
+    newer = metrics.alias("newer_metric")
+    return and_(
+        metrics.c.deleted_at.is_(None),
+        ~exists().where(
+            newer.c.call_session_id == metrics.c.call_session_id,
+            newer.c.interaction_metric_id > metrics.c.interaction_metric_id,
+            newer.c.deleted_at.is_(None)
+        )
+    )
+
+
+def _scored_calls():
+    """Live call sessions with an agent, joined to their current scores"""
+    return (
+        select(
+            sessions.c.call_session_id,
+            sessions.c.agent_id,
+            sessions.c.created_at,
+            *(metrics.c[column] for column in ROLLUP_METRICS.values())
+        )
+        .join(metrics, metrics.c.call_session_id == sessions.c.call_session_id)
+        .where(
+            sessions.c.agent_id.is_not(None),
+            sessions.c.deleted_at.is_(None),
+            _is_latest_metric()
+        )
+    )
+
+
+def _contribution(row) -> Optional[dict]:
+    """Contribution of one scored call, or None if it has no scores to aggregate"""
+    scores = {prefix: row[column] for prefix, column in ROLLUP_METRICS.items()}
+    if all(value is None for value in scores.values()):
+        return None
+    return {
+        "call_session_id": row["call_session_id"],
+        "agent_id": row["agent_id"],
+        "month": month_start(row["created_at"]),
+        **scores,
+    }
+
+
+async def _adjust_rollup(
+        connection: AsyncConnection,
+        agent_id: int,
+        month: date,
+        removed: Optional[dict],
+        added: Optional[dict]
+) -> None:
+    """Apply one call's old and/or new contribution to a single agent-month row"""
+    key = (rollups.c.agent_id == agent_id, rollups.c.month == month)
+    row = (await connection.execute(select(rollups).where(*key).with_for_update())).mappings().first()
+    if row is None:
+        if removed is not None:
+            raise RuntimeError(f"Missing KPI rollup for agent {agent_id}, month {month}")
+        try:
+            async with connection.begin_nested():
+                await connection.execute(insert(rollups).values(agent_id=agent_id, month=month))
+        except IntegrityError:
+            # Another request created the row first
+            pass
+        row = (await connection.execute(select(rollups).where(*key).with_for_update())).mappings().one()
+
+    call_count = row["call_count"]
+    aggregates = {prefix: MetricAggregate.from_columns(prefix, row) for prefix in ROLLUP_METRICS}
+    stale = []
+    if removed is not None:
+        call_count -= 1
+        for prefix, aggregate in aggregates.items():
+            if removed[prefix] is not None and aggregate.remove(removed[prefix]):
+                stale.append(prefix)
+    if added is not None:
+        call_count += 1
+        for prefix, aggregate in aggregates.items():
+            if added[prefix] is not None:
+                aggregate.add(added[prefix])
+
+    if call_count <= 0:
+        await connection.execute(delete(rollups).where(*key))
+        return
+
+    values = {"call_count": call_count, "updated_at": datetime.utcnow()}
+    for prefix, aggregate in aggregates.items():
+        values.update(aggregate.to_columns(prefix))
+    for prefix in stale:
+        # A removed value was the min or max: the ledger (already updated) knows the new extremes
+        low, high = (await connection.execute(
+            select(func.min(contributions.c[prefix]), func.max(contributions.c[prefix]))
+            .where(contributions.c.agent_id == agent_id, contributions.c.month == month)
+        )).one()
+        values[f"{prefix}_min"], values[f"{prefix}_max"] = low, high
+    await connection.execute(update(rollups).where(*key).values(**values))
+
+
+async def apply_call_scores(connection: AsyncConnection, call_session_id: int) -> None:
+    """
+    Bring a call's contribution to its agent-month rollup up to date with its
+    current InteractionMetric scores. Runs inside the caller's transaction and
+    only touches the one or two rollup rows involved.
+    """
+    row = (await connection.execute(
+        _scored_calls().where(sessions.c.call_session_id == call_session_id)
+    )).mappings().first()
+    new = _contribution(row) if row is not None else None
+    old = (await connection.execute(
+        select(contributions).where(contributions.c.call_session_id == call_session_id)
+    )).mappings().first()
+    old = dict(old) if old is not None else None
+    if old == new:
+        return
+
+    # Update the ledger first so min/max recomputation sees the new state
+    await connection.execute(delete(contributions).where(contributions.c.call_session_id == call_session_id))
+    if new is not None:
+        await connection.execute(insert(contributions).values(**new))
+
+    if old is not None and new is not None and (old["agent_id"], old["month"]) == (new["agent_id"], new["month"]):
+        await _adjust_rollup(connection, new["agent_id"], new["month"], old, new)
+        return
+    if old is not None:
+        await _adjust_rollup(connection, old["agent_id"], old["month"], old, None)
+    if new is not None:
+        await _adjust_rollup(connection, new["agent_id"], new["month"], None, new)
+
+
+def _summary(row) -> dict:
+    return {
+        "agent_id": row["agent_id"],
+        "month": row["month"].strftime("%Y-%m"),
+        "call_count": row["call_count"],
+        **{prefix: MetricAggregate.from_columns(prefix, row).summary() for prefix in ROLLUP_METRICS},
+        "updated_at": row["updated_at"],
+    }
+
+
+class KpiRollupService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_agent_month(self, agent_id: int, month: date) -> Optional[dict]:
+        """Monthly KPI summary for one agent, read from a single rollup row"""
+        connection = await self.session.connection()
+        row = (await connection.execute(
+            select(rollups).where(rollups.c.agent_id == agent_id, rollups.c.month == month)
+        )).mappings().first()
+        return _summary(row) if row is not None else None
+
+    async def list_agent_months(self, agent_id: int, start: date, end: date) -> List[dict]:
+        """Monthly KPI summaries for one agent between two months, inclusive"""
+        connection = await self.session.connection()
+        result = await connection.execute(
+            select(rollups)
+            .where(rollups.c.agent_id == agent_id, rollups.c.month >= start, rollups.c.month <= end)
+            .order_by(rollups.c.month)
+        )
+        return [_summary(row) for row in result.mappings()]
+
+    async def rebuild(self, batch_size: int = 1000) -> dict:
+        """
+        Recompute every rollup from call sessions and InteractionMetric.
+
+        Calls are read in keyset-paginated batches and merged into in-memory
+        aggregates (one per agent-month), so memory does not grow with the
+        number of calls. Everything is replaced in one transaction; readers
+        keep seeing the old rollups until it commits.
+
+        Returns:
+            Number of calls aggregated and rollup rows written
+        """
+        aggregates: Dict[Tuple[int, date], Tuple[int, Dict[str, MetricAggregate]]] = {}
+        calls = 0
+        try:
+            connection = await self.session.connection()
+            await connection.execute(delete(contributions))
+            await connection.execute(delete(rollups))
+
+            last_id = 0
+            while True:
+                batch = (await connection.execute(
+                    _scored_calls()
+                    .where(sessions.c.call_session_id > last_id)
+                    .order_by(sessions.c.call_session_id)
+                    .limit(batch_size)
+                )).mappings().all()
+                if not batch:
+                    break
+                last_id = batch[-1]["call_session_id"]
+
+                ledger = [entry for entry in map(_contribution, batch) if entry is not None]
+                for entry in ledger:
+                    key = (entry["agent_id"], entry["month"])
+                    count, by_metric = aggregates.get(key) or (0, {prefix: MetricAggregate() for prefix in ROLLUP_METRICS})
+                    for prefix, aggregate in by_metric.items():
+                        if entry[prefix] is not None:
+                            aggregate.add(entry[prefix])
+                    aggregates[key] = (count + 1, by_metric)
+                if ledger:
+                    await connection.execute(insert(contributions), ledger)
+                calls += len(ledger)
+
+            now = datetime.utcnow()
+            rows = []
+            for (agent_id, month), (count, by_metric) in aggregates.items():
+                row = {"agent_id": agent_id, "month": month, "call_count": count, "updated_at": now}
+                for prefix, aggregate in by_metric.items():
+                    row.update(aggregate.to_columns(prefix))
+                rows.append(row)
+            if rows:
+                await connection.execute(insert(rollups), rows)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return {"calls": calls, "rollups": len(aggregates)}
+
+
+# FastAPI Dependency provider for KpiRollupService
+def get_kpi_rollup_service(session: AsyncSession = Depends(get_async_session)):
+    return KpiRollupService(session=session)
@@ -1,8 +1,11 @@
+import logging
 from typing import List
 from app.core.config import settings
 # from openai import OpenAI # Uncomment if using OpenAI
 # import google.generativeai as genai # Uncomment if using Gemini
 
+logger = logging.getLogger(__name__)
+
 class LLMService:
     def __init__(self):
         # Placeholder: Initialize LLM clients here based on config
@@ -20,14 +23,14 @@ class LLMService:
 
         if not (hasattr(self, 'openai_client') and self.openai_client) and \
            not (hasattr(self, 'gemini_model') and self.gemini_model):
-            print("LLMService: No actual LLM client initialized (OpenAI/Gemini keys likely missing or placeholders). Using mock responses.")
+            logger.debug("No actual LLM client initialized (OpenAI/Gemini keys likely missing or placeholders). Using mock responses.")
 
     async def get_embedding(self, text: str) -> List[float]:
         """
         Placeholder for generating embeddings.
         Replace with actual LLM API call.
         """
-        print(f"LLMService (Placeholder): Generating embedding for: '{text[:50]}...'")
+        logger.debug("Generating embedding for: %r...", text[:50])
         # Example: Simulate OpenAI's ada-002 embedding dimension
         return [float(i * 0.001) for i in range(1536)] # Placeholder vector
 
@@ -36,7 +39,7 @@ class LLMService:
         Placeholder for summarizing text. (US2)
         Replace with actual LLM API call.
         """
-        print(f"LLMService (Placeholder): Summarizing text: '{text[:50]}...'")
+        logger.debug("Summarizing text: %r...", text[:50])
         return f"This is a placeholder summary of the text, keeping it under {max_length} characters. Original started with: {text[:30]}..."
 
     async def generate_response_suggestion(self, query: str, context_docs_content: List[str]) -> str:
@@ -45,7 +48,7 @@ class LLMService:
         Replace with actual LLM API call.
         """
         context_preview = " | ".join([doc[:30] + "..." for doc in context_docs_content])
-        print(f"LLMService (Placeholder): Generating response for query '{query}' with context: '{context_preview}'")
+        logger.debug("Generating response for query %r with context: %r", query, context_preview)
         return f"Placeholder suggestion for '{query}'. Based on context, consider mentioning key aspects from the provided documents."
 
 # Dependency for FastAPI
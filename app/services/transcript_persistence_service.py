@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import Depends
+from sqlalchemy import delete, func, insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import get_async_session
+from app.db.models.call_transcription import CallTranscription, TranscriptionRole
+
+# Transcribe labels speakers in order of appearance; agents usually open the call
+DEFAULT_SPEAKER_ROLES: Dict[str, TranscriptionRole] = {
+    "spk_0": TranscriptionRole.AGENT,
+    "spk_1": TranscriptionRole.CUSTOMER,
+}
+
+_COLUMNS = ("call_session_id", "timestamp", "transcription", "role", "call_file", "created_at", "updated_at")
+
+
+class TranscriptPersistenceService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def persist_job_segments(
+            self,
+            call_session_id: int,
+            job_id: str,
+            segments: List[dict],
+            starts: List[float],
+            speaker_roles: Optional[Dict[str, TranscriptionRole]] = None
+    ) -> int:
+        """
+        Store the grouped segments of a finished transcription job as CallTranscription rows.
+
+        All rows are written in one transaction with a single bulk statement (COPY
+        on Postgres/asyncpg, executemany elsewhere). Re-running for the same job
+        replaces its rows, so the operation is idempotent.
+
+        Returns:
+            Number of rows written
+        """
+        roles = speaker_roles or DEFAULT_SPEAKER_ROLES
+        call_file = f"transcriptions/{job_id}.json"
+        rows = [
+            {
+                "call_session_id": call_session_id,
+                "timestamp": timedelta(seconds=start),
+                "transcription": segment["content"],
+                "role": roles.get(segment["agent_name"]),
+                "call_file": call_file,
+            }
+            for segment, start in zip(segments, starts)
+        ]
+
+        table = CallTranscription.__table__
+        try:
+            connection = await self.session.connection()
+            await connection.execute(
+                delete(table).where(
+                    table.c.call_session_id == call_session_id,
+                    table.c.call_file == call_file
+                )
+            )
+            if rows:
+                if connection.dialect.driver == "asyncpg":
+                    await self._copy_rows(connection, rows)
+                else:
+                    # Timestamps are filled in by the database: binding two datetimes per
+                    # row costs more than the insert itself on SQLite
+                    now = func.current_timestamp()
+                    await connection.execute(insert(table).values(created_at=now, updated_at=now), rows)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        return len(rows)
+
+    @staticmethod
+    async def _copy_rows(connection, rows: List[dict]) -> None:
+        """Send rows with COPY (binary protocol) on the session's own connection and transaction."""
+        now = datetime.utcnow()
+        records = [
+            (
+                row["call_session_id"],
+                row["timestamp"],
+                row["transcription"],
+                row["role"].name if row["role"] else None,
+                row["call_file"],
+                now,
+                now,
+            )
+            for row in rows
+        ]
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            CallTranscription.__table__.name,
+            records=records,
+            columns=_COLUMNS
+        )
+
+
+# FastAPI Dependency provider for TranscriptPersistenceService
+def get_transcript_persistence_service(session: AsyncSession = Depends(get_async_session)):
+    return TranscriptPersistenceService(session=session)
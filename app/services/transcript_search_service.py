@@ -0,0 +1,245 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import Depends
+from sqlalchemy import column, func, literal_column, select, table
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import get_async_session
+from app.db.models.call_session import CallSession
+from app.db.models.call_transcription import CallTranscription, TranscriptionRole
+from app.search.transcript_index import FTS_TABLE, SEARCH_VECTOR, TEXT_SEARCH_CONFIG
+
+transcriptions = CallTranscription.__table__
+sessions = CallSession.__table__
+
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<<", ">>"
+
+
+@dataclass
+class TranscriptSearchFilters:
+    company_id: Optional[int] = None
+    agent_id: Optional[int] = None
+    role: Optional[TranscriptionRole] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def clauses(self) -> list:
+        clauses = [transcriptions.c.deleted_at.is_(None), sessions.c.deleted_at.is_(None)]
+        if self.company_id is not None:
+            clauses.append(sessions.c.company_id == self.company_id)
+        if self.agent_id is not None:
+            clauses.append(sessions.c.agent_id == self.agent_id)
+        if self.role is not None:
+            clauses.append(transcriptions.c.role == self.role)
+        if self.start is not None:
+            clauses.append(sessions.c.created_at >= self.start)
+            # Segments are never older than their call; lets Postgres skip older partitions
+            clauses.append(transcriptions.c.created_at >= self.start)
+        if self.end is not None:
+            clauses.append(sessions.c.created_at < self.end)
+        return clauses
+
+
+_HIT_COLUMNS = (
+    transcriptions.c.call_transcription_id,
+    transcriptions.c.call_session_id,
+    transcriptions.c.call_file,
+    transcriptions.c.timestamp,
+    transcriptions.c.role,
+    sessions.c.company_id,
+    sessions.c.agent_id,
+    sessions.c.created_at.label("call_date"),
+)
+
+
+def fts5_query(text: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 query: every word must match, "quoted text"
+    is matched as a phrase. Returns None if there is nothing to search for.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', text):
+        words = re.findall(r"\w+", phrase or word)
+        if words:
+            terms.append('"' + " ".join(words) + '"')
+    return " ".join(terms) or None
+
+
+def _postgres_hits(query: str, filters: TranscriptSearchFilters, limit: int, offset: int):
+    ts_query = func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'"), query)
+    vector = literal_column(f"{transcriptions.name}.{SEARCH_VECTOR}")
+    # Rank and filter on the index first; only the returned page is highlighted
+    ranked = (
+        select(*_HIT_COLUMNS, transcriptions.c.transcription, func.ts_rank_cd(vector, ts_query).label("rank"))
+        .join(sessions, sessions.c.call_session_id == transcriptions.c.call_session_id)
+        .where(vector.op("@@")(ts_query), *filters.clauses())
+        .order_by(literal_column("rank").desc(), transcriptions.c.call_transcription_id.desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    snippet = func.ts_headline(
+        literal_column(f"'{TEXT_SEARCH_CONFIG}'"),
+        ranked.c.transcription,
+        ts_query,
+        f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=30, MinWords=10, MaxFragments=2"
+    )
+    return (
+        select(*(c for c in ranked.c if c.key != "transcription"), snippet.label("snippet"))
+        .order_by(ranked.c.rank.desc(), ranked.c.call_transcription_id.desc())
+    )
+
+
+def _sqlite_hits(query: str, filters: TranscriptSearchFilters, limit: int, offset: int):
+    fts = table(FTS_TABLE, column("rowid"))
+    fts_column = literal_column(FTS_TABLE)
+    # bm25() is lower-is-better; negate it so both backends rank higher-is-better
+    rank = (-func.bm25(fts_column)).label("rank")
+    snippet = func.snippet(fts_column, 0, HIGHLIGHT_START, HIGHLIGHT_STOP, "…", 24).label("snippet")
+    return (
+        select(*_HIT_COLUMNS, rank, snippet)
+        .select_from(fts)
+        .join(transcriptions, transcriptions.c.call_transcription_id == fts.c.rowid)
+        .join(sessions, sessions.c.call_session_id == transcriptions.c.call_session_id)
+        .where(fts_column.op("MATCH")(fts5_query(query)), *filters.clauses())
+        .order_by(literal_column("rank").desc(), transcriptions.c.call_transcription_id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+def _seconds(value) -> Optional[float]:
+    return value.total_seconds() if value is not None else None
+
+
+class TranscriptSearchService:
+    """
+    Ranked full-text search over stored call transcription segments.
+
+    Needs the index from app.search.transcript_index. Each hit comes with the
+    segments spoken just before and after it in the same call.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search(
+            self,
+            query: str,
+            filters: Optional[TranscriptSearchFilters] = None,
+            limit: int = 20,
+            offset: int = 0,
+            context: int = 2
+    ) -> List[dict]:
+        filters = filters or TranscriptSearchFilters()
+        connection = await self.session.connection()
+        dialect = connection.dialect.name
+        if dialect == "postgresql":
+            statement = _postgres_hits(query, filters, limit, offset)
+        elif dialect == "sqlite":
+            if fts5_query(query) is None:
+                return []
+            statement = _sqlite_hits(query, filters, limit, offset)
+        else:
+            raise ValueError(f"Transcript search is not supported on {dialect}")
+
+        hits = (await connection.execute(statement)).mappings().all()
+        if not hits:
+            return []
+        surrounding = await self._context(connection, hits, context) if context > 0 else {}
+
+        return [
+            {
+                "call_transcription_id": hit["call_transcription_id"],
+                "call_session_id": hit["call_session_id"],
+                "company_id": hit["company_id"],
+                "agent_id": hit["agent_id"],
+                "call_date": hit["call_date"],
+                "role": hit["role"],
+                "timestamp": _seconds(hit["timestamp"]),
+                "rank": hit["rank"],
+                "snippet": hit["snippet"],
+                "context": surrounding.get(hit["call_transcription_id"], []),
+            }
+            for hit in hits
+        ]
+
+    @staticmethod
+    async def _context(connection, hits, context: int) -> dict:
+        """
+        Neighbouring segments of every hit, by position in its call: the
+        segment ids of the hits' calls are read in spoken order (session,
+        transcript file, timestamp, id), the `context` live ones either side
+        of each hit picked out, and those rows fetched by primary key. Ids
+        of one call need not be consecutive.
+        """
+        # No deleted_at condition here: without table statistics SQLite would pick the
+        # deleted_at index over call_session_id and scan every live segment
+        order = (await connection.execute(
+            select(
+                transcriptions.c.call_transcription_id,
+                transcriptions.c.call_session_id,
+                transcriptions.c.call_file,
+                transcriptions.c.deleted_at,
+            )
+            .where(transcriptions.c.call_session_id.in_(sorted({hit["call_session_id"] for hit in hits})))
+            .order_by(
+                transcriptions.c.call_session_id,
+                transcriptions.c.call_file,
+                transcriptions.c.timestamp,
+                transcriptions.c.call_transcription_id,
+            )
+        )).all()
+        calls = {}
+        for segment_id, call_session_id, call_file, deleted_at in order:
+            if deleted_at is None:
+                calls.setdefault((call_session_id, call_file), []).append(segment_id)
+        positions = {
+            segment_id: (segments, index)
+            for segments in calls.values()
+            for index, segment_id in enumerate(segments)
+        }
+
+        neighbours = {}
+        for hit in hits:
+            hit_id = hit["call_transcription_id"]
+            if hit_id in positions:
+                segments, index = positions[hit_id]
+                neighbours[hit_id] = segments[max(index - context, 0):index + context + 1]
+        rows = {
+            row["call_transcription_id"]: row
+            for row in (await connection.execute(
+                select(
+                    transcriptions.c.call_transcription_id,
+                    transcriptions.c.timestamp,
+                    transcriptions.c.role,
+                    transcriptions.c.transcription,
+                )
+                .where(transcriptions.c.call_transcription_id.in_(
+                    sorted({segment_id for ids in neighbours.values() for segment_id in ids})
+                ))
+            )).mappings()
+        } if neighbours else {}
+
+        return {
+            hit_id: [
+                {
+                    "call_transcription_id": segment_id,
+                    "role": rows[segment_id]["role"],
+                    "timestamp": _seconds(rows[segment_id]["timestamp"]),
+                    "transcription": rows[segment_id]["transcription"],
+                    "match": segment_id == hit_id,
+                }
+                for segment_id in ids
+                if segment_id in rows
+            ]
+            for hit_id, ids in neighbours.items()
+        }
+
+
+# FastAPI Dependency provider for TranscriptSearchService
+def get_transcript_search_service(session: AsyncSession = Depends(get_async_session)):
+    return TranscriptSearchService(session=session)
@@ -0,0 +1,29 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.tracing import tracer
+
+router = APIRouter(
+    prefix="/traces",
+    tags=["tracing"]
+)
+
+
+@router.get("/")
+async def list_traces(
+        route: Optional[str] = Query(None, description="Route template, e.g. /transcribe/helper/{job_id}"),
+        min_duration_ms: float = Query(0, ge=0),
+        limit: int = Query(50, ge=1, le=500)
+):
+    """Recent requests of this worker that made outbound calls, newest first"""
+    return {"traces": tracer.recent(limit=limit, route=route, min_duration_ms=min_duration_ms)}
+
+
+@router.get("/{trace_id}")
+async def get_trace_waterfall(trace_id: str):
+    """Outbound calls of one request (see its X-Trace-Id header) laid out on its timeline"""
+    trace = tracer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found (it may have been served by another worker)")
+    return trace.waterfall()
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, List, Optional
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+
+
+class HashingReader:
+    """
+    Wraps an async file-like object and hashes every chunk as it is read,
+    so the content hash is ready as soon as the upload finishes.
+    """
+
+    def __init__(self, fileobj: Any):
+        self.fileobj = fileobj
+        self._hash = hashlib.sha256()
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = await self.fileobj.read(size)
+        if chunk:
+            # hashlib releases the GIL on large buffers, keep it off the event loop
+            await run_in_threadpool(self._hash.update, chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class AudioDedupIndex:
+    """
+    Persistent content-hash -> transcription job index backed by SQLite.
+
+    Also caches the grouped transcript of completed jobs so duplicate uploads
+    (and repeated status checks) can be answered without calling AWS.
+    """
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS audio_jobs (
+                content_hash TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL UNIQUE,
+                s3_key TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'IN_PROGRESS',
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_transcripts (
+                job_id TEXT PRIMARY KEY,
+                transcript TEXT NOT NULL
+            );
+            """
+        )
+
+    def claim(self, content_hash: str, job_id: str, s3_key: str) -> Optional[dict]:
+        """
+        Register `job_id` for `content_hash` unless a usable job already exists.
+
+        Returns:
+            The existing job record for duplicates, or None if `job_id` was registered
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, s3_key, status FROM audio_jobs WHERE content_hash = ?",
+                (content_hash,)
+            ).fetchone()
+            if row and row[2] != "FAILED":
+                return {"job_id": row[0], "s3_key": row[1], "status": row[2]}
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO audio_jobs (content_hash, job_id, s3_key, status, created_at) "
+                "VALUES (?, ?, ?, 'IN_PROGRESS', ?)",
+                (content_hash, job_id, s3_key, time.time())
+            )
+            return None
+
+    def update_status(self, job_id: str, status: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE audio_jobs SET status = ? WHERE job_id = ?",
+                (status, job_id)
+            )
+
+    def store_transcript(self, job_id: str, transcript: List[dict]) -> None:
+        encoded = orjson.dumps(transcript).decode()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_transcripts (job_id, transcript) VALUES (?, ?)",
+                (job_id, encoded)
+            )
+            self._conn.execute(
+                "UPDATE audio_jobs SET status = 'COMPLETED' WHERE job_id = ?",
+                (job_id,)
+            )
+
+    def get_transcript(self, job_id: str) -> Optional[List[dict]]:
+        encoded = self.get_transcript_json(job_id)
+        return orjson.loads(encoded) if encoded is not None else None
+
+    def get_transcript_json(self, job_id: str) -> Optional[str]:
+        """The cached transcript as stored (a JSON array), for responses that pass it on as is"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT transcript FROM job_transcripts WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        return row[0] if row else None
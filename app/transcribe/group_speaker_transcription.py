@@ -1,7 +1,27 @@
-from typing import List
+from typing import Callable, List, Optional, Tuple
 from datetime import datetime
+import hashlib
 import uuid
 
+# uuid5 namespace of transcript segment ids (see segment_id)
+SEGMENT_ID_NAMESPACE = uuid.UUID("68b9d836-0306-4ff9-b2f8-b49b3c4b9e37")
+_NAMESPACE_SHA1 = hashlib.sha1(SEGMENT_ID_NAMESPACE.bytes)
+
+
+def segment_id(job_id: str, index: int) -> str:
+    """
+    Id of the `index`-th segment of a job: the same on every read, from any
+    worker. Equal to str(uuid.uuid5(SEGMENT_ID_NAMESPACE, f"{job_id}/{index}"))
+    but a few times faster, which matters at thousands of segments per call.
+    """
+    sha1 = _NAMESPACE_SHA1.copy()
+    sha1.update(f"{job_id}/{index}".encode())
+    digest = bytearray(sha1.digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+    digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = digest.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
 
 def group_speaker_transcriptions(transcriptions: List[dict]) -> List[dict]:
     """
@@ -59,4 +79,68 @@ def group_speaker_transcriptions(transcriptions: List[dict]) -> List[dict]:
     return grouped
 
 
-# Example usage with your data:
+class IncrementalPhraseGrouper:
+    """
+    Streaming counterpart of group_speaker_transcriptions.
+
+    Words are fed one at a time (in time order) and finished phrases are returned
+    as soon as they are known, using the same rule: a new phrase starts when the
+    speaker changes or a word starts more than `pause_threshold` seconds after the
+    start of the current phrase. Only the open phrase is kept in memory, capped at
+    `max_phrase_words` words.
+
+    Phrases are returned as (phrase, start_time) pairs, where start_time is the
+    phrase start in seconds. With a `job_id`, phrase ids are derived from it
+    and the phrase's position (segment_id), so regrouping the same transcript
+    gives the same ids; otherwise they are random.
+    """
+
+    def __init__(
+            self,
+            pause_threshold: float = 1.0,
+            max_phrase_words: int = 200,
+            format_time: Optional[Callable[[float], str]] = None,
+            job_id: Optional[str] = None
+    ):
+        self.pause_threshold = pause_threshold
+        self.max_phrase_words = max_phrase_words
+        self.job_id = job_id
+        self._count = 0
+        self.format_time = format_time or (
+            lambda seconds: datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M:%S.%f")
+        )
+        self._speaker: Optional[str] = None
+        self._start: float = 0.0
+        self._words: List[str] = []
+
+    def add_word(self, speaker: str, content: str, start_time: float) -> List[Tuple[dict, float]]:
+        """
+        Add one word and return the phrases it completed (usually none or one).
+        """
+        completed = []
+        if self._words and (
+                speaker != self._speaker or
+                start_time - self._start > self.pause_threshold or
+                len(self._words) >= self.max_phrase_words
+        ):
+            completed.append(self.flush())
+
+        if not self._words:
+            self._speaker = speaker
+            self._start = start_time
+        self._words.append(content)
+        return completed
+
+    def flush(self) -> Optional[Tuple[dict, float]]:
+        """Close the open phrase (e.g. after a silence or at end of stream)."""
+        if not self._words:
+            return None
+        phrase = {
+            "id": segment_id(self.job_id, self._count) if self.job_id is not None else str(uuid.uuid4()),
+            "timestamp": self.format_time(self._start),
+            "agent_name": self._speaker,
+            "content": ' '.join(self._words)
+        }
+        self._words = []
+        self._count += 1
+        return phrase, self._start
@@ -0,0 +1,149 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+TERMINAL_STATUSES = {"COMPLETED", "FAILED", "NOT_FOUND"}
+
+# Above this many stale jobs, one paginated listing is cheaper than per-job lookups
+LIST_THRESHOLD = 3
+MAX_LIST_PAGES = 10
+# Jobs left after the listing are looked up this many at a time, per refresh
+LOOKUP_CONCURRENCY = 8
+
+
+@dataclass
+class JobStatus:
+    job_id: str
+    status: str
+    failure_reason: Optional[str]
+    version: int
+    checked_at: float
+    created_at: Optional[datetime] = None
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status.lower(),
+            "failure_reason": self.failure_reason,
+            "version": self.version
+        }
+
+
+class JobStatusRegistry:
+    """
+    Process-local view of transcription job statuses.
+
+    Every change bumps a version counter, so clients can ask for
+    "everything that changed since version N". The counter lives in this
+    process: versions from one API worker mean nothing to another, or to
+    the same worker after a restart. Non-terminal jobs are only re-checked
+    against AWS once `refresh_interval` seconds have passed.
+    """
+
+    def __init__(self, refresh_interval: float = 5.0):
+        self.refresh_interval = refresh_interval
+        self._jobs: Dict[str, JobStatus] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, job_id: str) -> Optional[JobStatus]:
+        return self._jobs.get(job_id)
+
+    def update(
+            self,
+            job_id: str,
+            status: str,
+            failure_reason: Optional[str] = None,
+            created_at: Optional[datetime] = None
+    ) -> JobStatus:
+        now = time.monotonic()
+        with self._lock:
+            current = self._jobs.get(job_id)
+            if current:
+                created_at = created_at or current.created_at
+            if current and current.status == status and current.failure_reason == failure_reason:
+                current.checked_at = now
+                current.created_at = created_at
+                return current
+            self._version += 1
+            entry = JobStatus(job_id, status, failure_reason, self._version, now, created_at)
+            self._jobs[job_id] = entry
+            return entry
+
+    def stale(self, job_ids: Iterable[str]) -> List[str]:
+        """Job IDs that are unknown, or non-terminal and due for a refresh."""
+        deadline = time.monotonic() - self.refresh_interval
+        result = []
+        for job_id in job_ids:
+            entry = self._jobs.get(job_id)
+            if entry is None or (not entry.is_terminal and entry.checked_at <= deadline):
+                result.append(job_id)
+        return result
+
+    def changed_since(self, job_ids: Iterable[str], version: int) -> List[JobStatus]:
+        return [
+            entry for entry in (self._jobs.get(job_id) for job_id in job_ids)
+            if entry is not None and entry.version > version
+        ]
+
+
+def refresh_job_statuses(client: Any, registry: JobStatusRegistry, job_ids: List[str]) -> None:
+    """
+    Refresh the given jobs from AWS Transcribe with as few API calls as possible.
+
+    A handful of jobs are looked up individually; larger sets are resolved from
+    `list_transcription_jobs` pages (100 jobs per call, newest first), stopping
+    at the first page that reaches back past the oldest job's creation time.
+    Jobs the pages did not cover are looked up LOOKUP_CONCURRENCY at a time.
+    """
+    pending = set(job_ids)
+
+    if len(pending) > LIST_THRESHOLD:
+        # Known only if every job was seen with its CreationTime; otherwise scan all pages allowed
+        created = [getattr(registry.get(job_id), "created_at", None) for job_id in pending]
+        oldest = min(created) if None not in created else None
+        # boto3 has no paginator for this operation, follow NextToken by hand
+        kwargs = {"JobNameContains": "transcribe_", "MaxResults": 100}
+        for _ in range(MAX_LIST_PAGES):
+            page = client.list_transcription_jobs(**kwargs)
+            summaries = page.get("TranscriptionJobSummaries", [])
+            for summary in summaries:
+                name = summary["TranscriptionJobName"]
+                if name in pending:
+                    registry.update(
+                        name, summary["TranscriptionJobStatus"], summary.get("FailureReason"), summary.get("CreationTime")
+                    )
+                    pending.discard(name)
+            if not pending or "NextToken" not in page:
+                break
+            last_created = summaries[-1].get("CreationTime") if summaries else None
+            if oldest is not None and last_created is not None and last_created < oldest:
+                break
+            kwargs["NextToken"] = page["NextToken"]
+
+    if len(pending) > 1:
+        # boto3 clients are thread-safe
+        with ThreadPoolExecutor(min(len(pending), LOOKUP_CONCURRENCY), thread_name_prefix="transcribe-status") as pool:
+            list(pool.map(lambda job_id: _lookup_job(client, registry, job_id), pending))
+    elif pending:
+        _lookup_job(client, registry, pending.pop())
+
+
+def _lookup_job(client: Any, registry: JobStatusRegistry, job_id: str) -> None:
+    try:
+        job = client.get_transcription_job(TranscriptionJobName=job_id)["TranscriptionJob"]
+    except client.exceptions.BadRequestException:
+        registry.update(job_id, "NOT_FOUND", "Transcription job not found")
+        return
+    registry.update(job_id, job["TranscriptionJobStatus"], job.get("FailureReason"), job.get("CreationTime"))
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.transcribe.job_status_registry import JobStatus, JobStatusRegistry, refresh_job_statuses
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionJobTracker:
+    """
+    Watches transcription jobs server-side and wakes subscribers when a job
+    reaches a terminal state.
+
+    A single background task refreshes every watched job in one batched AWS
+    lookup per `poll_interval`, so AWS traffic depends on the number of active
+    jobs, not on the number of clients waiting on them. Each subscriber is just
+    a future, so thousands of open subscriptions cost little.
+    """
+
+    def __init__(self, client: Any, registry: JobStatusRegistry, poll_interval: float = 5.0):
+        self.client = client
+        self.registry = registry
+        self.poll_interval = poll_interval
+        self._watched: Set[str] = set()
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def watch(self, job_id: str) -> None:
+        """Track a job until it finishes, even without subscribers."""
+        self._watched.add(job_id)
+        self._ensure_running()
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[JobStatus]:
+        """
+        Wait up to `timeout` seconds for `job_id` to reach a terminal state.
+
+        Returns:
+            The terminal status, or the latest known (possibly None) status on timeout
+        """
+        current = self.registry.get(job_id)
+        if current and current.is_terminal:
+            return current
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job_id, set()).add(future)
+        self.watch(job_id)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return self.registry.get(job_id)
+        finally:
+            waiters = self._waiters.get(job_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[job_id]
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._watched:
+            stale = self.registry.stale(self._watched)
+            if stale:
+                try:
+                    await run_in_threadpool(refresh_job_statuses, self.client, self.registry, stale)
+                except Exception as e:
+                    # Transient AWS errors: keep subscribers waiting and retry next round
+                    logger.warning("refresh failed: %s", e)
+
+            for job_id in list(self._watched):
+                entry = self.registry.get(job_id)
+                if entry is None or not entry.is_terminal:
+                    continue
+                self._watched.discard(job_id)
+                for future in self._waiters.get(job_id, ()):
+                    if not future.done():
+                        future.set_result(entry)
+
+            if self._watched:
+                await asyncio.sleep(self.poll_interval)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+# S3 rejects multipart parts smaller than 5 MiB (except for the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+@dataclass
+class UploadResult:
+    bucket: str
+    key: str
+    bytes_uploaded: int
+    parts: int
+    elapsed_seconds: float
+
+    @property
+    def throughput_mib_s(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.bytes_uploaded / (1024 * 1024) / self.elapsed_seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "bytes": self.bytes_uploaded,
+            "parts": self.parts,
+            "seconds": round(self.elapsed_seconds, 3),
+            "throughput_mib_s": round(self.throughput_mib_s, 2),
+        }
+
+
+@dataclass
+class _UploadState:
+    upload_id: str
+    etags: Dict[int, str] = field(default_factory=dict)
+
+
+class S3MultipartUploader:
+    """
+    Streams an async file-like object (e.g. FastAPI's UploadFile) to S3.
+
+    Parts are read sequentially on the event loop and uploaded concurrently on a
+    thread pool, so the event loop never waits on S3. At most `concurrency` parts
+    are held in memory at once. Files smaller than one part go through a single
+    put_object call.
+    """
+
+    def __init__(
+            self,
+            client: Any,
+            part_size: int = 8 * 1024 * 1024,
+            concurrency: int = 4,
+            executor: Optional[ThreadPoolExecutor] = None
+    ):
+        self.client = client
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.concurrency = max(concurrency, 1)
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="s3-upload"
+        )
+
+    async def _call(self, fn, **kwargs):
+        loop = asyncio.get_running_loop()
+        # run_in_executor does not carry context variables over (the request's trace, for one)
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, partial(context.run, fn, **kwargs))
+
+    async def upload(self, fileobj: Any, bucket: str, key: str) -> UploadResult:
+        """
+        Upload `fileobj` to s3://bucket/key.
+
+        Args:
+            fileobj: Object exposing `async read(size) -> bytes`
+            bucket: Target bucket name
+            key: Target object key
+
+        Returns:
+            UploadResult with size, part count and timing of the upload
+        """
+        started = time.perf_counter()
+        first = await fileobj.read(self.part_size)
+
+        # Small files: one round trip, no multipart bookkeeping
+        if len(first) < self.part_size:
+            await self._call(self.client.put_object, Bucket=bucket, Key=key, Body=first)
+            return UploadResult(bucket, key, len(first), 1, time.perf_counter() - started)
+
+        created = await self._call(self.client.create_multipart_upload, Bucket=bucket, Key=key)
+        state = _UploadState(upload_id=created["UploadId"])
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks: List[asyncio.Task] = []
+        total = 0
+
+        async def upload_part(part_number: int, body: bytes):
+            try:
+                response = await self._call(
+                    self.client.upload_part,
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=state.upload_id,
+                    PartNumber=part_number,
+                    Body=body
+                )
+                state.etags[part_number] = response["ETag"]
+            finally:
+                slots.release()
+
+        try:
+            chunk = first
+            part_number = 1
+            while chunk:
+                # Wait for a free slot before reading more, bounding buffered memory
+                await slots.acquire()
+                total += len(chunk)
+                tasks.append(asyncio.create_task(upload_part(part_number, chunk)))
+                # Surface part failures early instead of reading the rest of the file
+                for task in tasks:
+                    if task.done() and task.exception():
+                        raise task.exception()
+                part_number += 1
+                chunk = await fileobj.read(self.part_size)
+
+            await asyncio.gather(*tasks)
+
+            await self._call(
+                self.client.complete_multipart_upload,
+                Bucket=bucket,
+                Key=key,
+                UploadId=state.upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"ETag": etag, "PartNumber": number}
+                        for number, etag in sorted(state.etags.items())
+                    ]
+                }
+            )
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await self._call(
+                    self.client.abort_multipart_upload,
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=state.upload_id
+                )
+            except Exception:
+                # Keep the original error; S3 lifecycle rules clean up leftovers
+                pass
+            raise
+
+        return UploadResult(bucket, key, total, len(state.etags), time.perf_counter() - started)
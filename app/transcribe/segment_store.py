@@ -0,0 +1,119 @@
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import List, Optional
+
+
+class JobSegments:
+    """
+    Grouped segments of one call, kept in start-time order.
+
+    `starts` is a sorted array of segment start times (seconds) parallel to
+    `segments`, so time windows are found with two binary searches. Segments
+    are append-only; a segment's sequence number is its position + 1, which
+    doubles as the `since` / cursor value for clients.
+    """
+
+    __slots__ = ("starts", "segments", "complete")
+
+    def __init__(self):
+        self.starts: List[float] = []
+        self.segments: List[dict] = []
+        self.complete = False
+
+    def append(self, segment: dict, start_time: float) -> None:
+        if self.starts and start_time < self.starts[-1]:
+            # Keep the index sorted even if a backend reports a late segment
+            start_time = self.starts[-1]
+        self.starts.append(start_time)
+        self.segments.append(segment)
+
+
+class TranscriptSegmentStore:
+    """
+    In-memory, LRU-bounded store of per-job transcript segments with
+    windowed reads, so response size follows the requested range rather than
+    the length of the call.
+    """
+
+    def __init__(self, max_jobs: int = 256):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, JobSegments]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, job_id: str) -> Optional[JobSegments]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is not None:
+                self._jobs.move_to_end(job_id)
+            return entry
+
+    def _entry(self, job_id: str) -> JobSegments:
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            entry = self._jobs[job_id] = JobSegments()
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        else:
+            self._jobs.move_to_end(job_id)
+        return entry
+
+    def put(self, job_id: str, segments: List[dict], starts: List[float], complete: bool = True) -> JobSegments:
+        """Store the full, time-ordered segment list of a job."""
+        entry = JobSegments()
+        for segment, start in zip(segments, starts):
+            entry.append(segment, start)
+        entry.complete = complete
+        with self._lock:
+            self._jobs[job_id] = entry
+            self._jobs.move_to_end(job_id)
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return entry
+
+    def append(self, job_id: str, segment: dict, start_time: float) -> None:
+        """Add one live segment to a job that is still being transcribed."""
+        with self._lock:
+            self._entry(job_id).append(segment, start_time)
+
+    def mark_complete(self, job_id: str) -> None:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is not None:
+                entry.complete = True
+
+    @staticmethod
+    def query(
+            entry: JobSegments,
+            start: Optional[float] = None,
+            end: Optional[float] = None,
+            cursor: int = 0,
+            limit: int = 200
+    ) -> dict:
+        """
+        Return segments starting in [start, end) with sequence number > cursor.
+
+        Args:
+            entry: Segments of the job
+            start: Window start in seconds from the start of the call (inclusive)
+            end: Window end in seconds (exclusive)
+            cursor: Last sequence number the client already has (`since`)
+            limit: Maximum number of segments to return
+        """
+        total = len(entry.segments)
+        lo = bisect_left(entry.starts, start) if start is not None else 0
+        hi = bisect_left(entry.starts, end) if end is not None else total
+        lo = max(lo, cursor)
+        stop = min(hi, lo + limit)
+
+        page = [
+            dict(entry.segments[index], seq=index + 1)
+            for index in range(lo, stop)
+        ]
+        return {
+            "total": total,
+            "last_seq": total,
+            "next_cursor": stop if stop < hi else None,
+            "complete": entry.complete,
+            "segments": page
+        }
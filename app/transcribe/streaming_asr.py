@@ -0,0 +1,102 @@
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Type
+
+
+@dataclass
+class TranscriptWord:
+    speaker: str
+    content: str
+    start_time: float
+    end_time: float
+
+
+class StreamingASRBackend(ABC):
+    """
+    One streaming speech-recognition session, created per WebSocket connection.
+
+    Audio goes in through `send_audio`; recognised words come out of `words()`
+    in time order until `end_stream` has been called and the backend drained.
+    """
+
+    @abstractmethod
+    async def send_audio(self, chunk: bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def end_stream(self) -> None:
+        ...
+
+    @abstractmethod
+    def words(self) -> AsyncIterator[TranscriptWord]:
+        ...
+
+
+class FakeStreamingBackend(StreamingASRBackend):
+    """
+    Local stand-in for a streaming ASR service, for tests and offline development.
+
+    Treats the audio as 16 kHz 16-bit mono PCM and emits one word per
+    `seconds_per_word` of audio received, switching speaker every
+    `words_per_turn` words. Words come from `script` when given, otherwise
+    they are named after their position ("word0", "word1", ...).
+    """
+
+    def __init__(
+            self,
+            bytes_per_second: int = 32000,
+            seconds_per_word: float = 0.4,
+            words_per_turn: int = 8,
+            script: Optional[List[str]] = None
+    ):
+        self.bytes_per_word = max(int(bytes_per_second * seconds_per_word), 1)
+        self.seconds_per_word = seconds_per_word
+        self.words_per_turn = words_per_turn
+        self.script = script
+        self._buffered = 0
+        self._emitted = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+
+    async def send_audio(self, chunk: bytes) -> None:
+        self._buffered += len(chunk)
+        while self._buffered >= self.bytes_per_word:
+            self._buffered -= self.bytes_per_word
+            await self._queue.put(self._next_word())
+
+    async def end_stream(self) -> None:
+        await self._queue.put(None)
+
+    async def words(self) -> AsyncIterator[TranscriptWord]:
+        while True:
+            word = await self._queue.get()
+            if word is None:
+                return
+            yield word
+
+    def _next_word(self) -> TranscriptWord:
+        index = self._emitted
+        self._emitted += 1
+        if self.script:
+            content = self.script[index % len(self.script)]
+        else:
+            content = f"word{index}"
+        start = index * self.seconds_per_word
+        return TranscriptWord(
+            speaker=f"spk_{(index // self.words_per_turn) % 2}",
+            content=content,
+            start_time=start,
+            end_time=start + self.seconds_per_word
+        )
+
+
+STREAMING_BACKENDS: Dict[str, Type[StreamingASRBackend]] = {
+    "fake": FakeStreamingBackend,
+}
+
+
+def create_streaming_backend(name: str) -> StreamingASRBackend:
+    try:
+        return STREAMING_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown streaming ASR backend '{name}'. Available: {', '.join(STREAMING_BACKENDS)}")
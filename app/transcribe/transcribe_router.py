@@ -1,40 +1,51 @@
 import asyncio
+import json
+import logging
+import sys
 import time
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, APIRouter
-from fastapi.responses import JSONResponse
-import boto3
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, APIRouter, Depends, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
 from datetime import datetime
 import uuid
-from typing import List
+from typing import List, Optional, Tuple
 import os
 import requests
 from dotenv import load_dotenv
-from openai import OpenAI
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
 
+from app.core.clients import clients
 from app.core.config import settings
+from app.core.responses import FastJSONResponse, RawJSONResponse, dumps
+from app.core.tracing import tracer
+from app.jobs.job_router import queue_job
+from app.jobs.tasks import tasks
+from app.schemas.transcription import CallTranscriptionType
+from app.services.interaction_metric_service import InteractionMetricService, get_interaction_metric_service
+from app.services.transcript_persistence_service import (
+    TranscriptPersistenceService, get_transcript_persistence_service
+)
+from app.transcribe.group_speaker_transcription import IncrementalPhraseGrouper
+from app.transcribe.audio_dedup_index import AudioDedupIndex, HashingReader
+from app.transcribe.job_status_registry import JobStatusRegistry, refresh_job_statuses
+from app.transcribe.job_tracker import TranscriptionJobTracker
+from app.transcribe.s3_multipart import S3MultipartUploader
+from app.transcribe.segment_store import TranscriptSegmentStore
+from app.transcribe.streaming_asr import TranscriptWord, create_streaming_backend
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-# Define your Pydantic model
-class CallTranscriptionType(BaseModel):
-    timestamp: str
-    agent_name: str
-    content: str
-    id: str
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "timestamp": "2023-01-01 12:00:00",
-                "agent_name": "spk_0",
-                "content": "Hello, how can I help you?",
-                "id": "550e8400-e29b-41d4-a716-446655440000"
-            }
-        }
+
+class TranscriptionStatusBatchRequest(BaseModel):
+    job_ids: List[str] = Field(..., min_length=1, max_length=500)
+    since_version: int = Field(
+        default=0, ge=0,
+        description="Only return jobs changed after this version (versions are per API worker process)"
+    )
 
 
 # Initialize FastAPI
@@ -43,26 +54,39 @@ router = APIRouter(
     tags=["call"]
 )
 
-# Configure AWS client
-transcribe_client = boto3.client(
-    'transcribe',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name="ap-southeast-1"
+# AWS clients are created on first use, once per worker (see app.core.clients)
+transcribe_client = clients.lazy("transcribe")
+s3_client = clients.lazy("s3")
+
+s3_uploader = S3MultipartUploader(
+    s3_client,
+    part_size=settings.S3_UPLOAD_PART_SIZE,
+    concurrency=settings.S3_UPLOAD_CONCURRENCY
 )
 
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name="ap-southeast-1"
+# Content hash -> job index, persisted so re-uploads are recognised across restarts
+dedup_index = AudioDedupIndex(settings.AUDIO_DEDUP_DB_PATH)
+
+# Last known status per job, shared by the single and batch status endpoints
+status_registry = JobStatusRegistry(refresh_interval=settings.TRANSCRIPTION_STATUS_REFRESH_SECONDS)
+
+# Time-indexed segments per job for windowed reads of long calls
+segment_store = TranscriptSegmentStore(max_jobs=settings.TRANSCRIPT_SEGMENT_CACHE_JOBS)
+
+# Pushes terminal statuses to long-poll and SSE subscribers
+job_tracker = TranscriptionJobTracker(
+    transcribe_client,
+    status_registry,
+    poll_interval=settings.TRANSCRIPTION_STATUS_REFRESH_SECONDS
 )
 
 
 @router.post("/", response_model=List[CallTranscriptionType])
 async def transcribe_audio(
-        background_tasks: BackgroundTasks,
-        file: UploadFile = File(..., description="Audio file to transcribe (MP3, WAV, FLAC)")
+        file: UploadFile = File(..., description="Audio file to transcribe (MP3, WAV, FLAC)"),
+        call_session_id: Optional[int] = Form(
+            None, description="Call session to persist the transcript and its metrics to once it is ready (needs the job worker, JOBS_ENABLED)"
+        )
 ):
     """
     Transcribe an audio file using AWS Transcribe service.
@@ -83,46 +107,78 @@ async def transcribe_audio(
     file_extension = os.path.splitext(file.filename)[1]
     s3_key = f"audio-uploads/{job_name}{file_extension}"
 
+    if not settings.AWS_BUCKET_NAME:
+        raise HTTPException(status_code=503, detail="Uploads are not configured (AWS_BUCKET_NAME is not set)")
+
     try:
         # Upload to S3
         bucket_name = settings.AWS_BUCKET_NAME
 
-        # For production, you might want to create the bucket if it doesn't exist
-        s3_client.upload_fileobj(file.file, bucket_name, s3_key)
+        # Stream to S3 in concurrent multipart chunks without blocking the event loop,
+        # hashing the content on the way through
+        reader = HashingReader(file)
+        upload = await s3_uploader.upload(reader, bucket_name, s3_key)
 
-        # Start transcription job
-        transcribe_client.start_transcription_job(
-            TranscriptionJobName=job_name,
-            Media={'MediaFileUri': f"s3://{bucket_name}/{s3_key}"},
-            MediaFormat=file_extension[1:],  # Remove the dot
-            LanguageCode='en-US',
-            Settings={
-                'ShowSpeakerLabels': True,
-                'MaxSpeakerLabels': 2,
-                'ChannelIdentification': False
-            },
-            OutputBucketName=bucket_name,  # Store output in same bucket
-            OutputKey=f"transcriptions/{job_name}.json"
-        )
+        # Same recording uploaded before: reuse its job instead of paying for a new one
+        existing = dedup_index.claim(reader.hexdigest(), job_name, s3_key)
+        if existing:
+            await run_in_threadpool(s3_client.delete_object, Bucket=bucket_name, Key=s3_key)
+            existing_job = existing["job_id"]
+            return JSONResponse(
+                content={
+                    "message": "Duplicate upload, reusing existing transcription",
+                    "job_id": existing_job,
+                    "status_check": f"/transcription-status/{existing_job}",
+                    "duplicate": True,
+                    "transcript": dedup_index.get_transcript(existing_job)
+                },
+                status_code=200
+            )
 
-        # In production, use SNS notifications instead of polling
-        def check_transcription_status(job_name: str):
-            while True:
-                status = transcribe_client.get_transcription_job(
-                    TranscriptionJobName=job_name
+        # Start transcription job
+        try:
+            started = transcribe_client.start_transcription_job(
+                TranscriptionJobName=job_name,
+                Media={'MediaFileUri': f"s3://{bucket_name}/{s3_key}"},
+                MediaFormat=file_extension[1:],  # Remove the dot
+                LanguageCode='en-US',
+                Settings={
+                    'ShowSpeakerLabels': True,
+                    'MaxSpeakerLabels': 2,
+                    'ChannelIdentification': False
+                },
+                OutputBucketName=bucket_name,  # Store output in same bucket
+                OutputKey=f"transcriptions/{job_name}.json"
+            )
+        except Exception:
+            dedup_index.update_status(job_name, "FAILED")
+            raise
+
+        status_registry.update(job_name, 'IN_PROGRESS', created_at=started['TranscriptionJob'].get('CreationTime'))
+        if settings.JOBS_ENABLED:
+            # Followed by the job worker (one AWS poller per job): caches the transcript, and
+            # persists it when a call session was given, even across API restarts
+            try:
+                await tasks.enqueue_async(
+                    "transcription.track",
+                    {"job_id": job_name, "call_session_id": call_session_id},
+                    idempotency_key=f"transcription.track:{job_name}",
+                    delay=settings.JOBS_TRACK_POLL_SECONDS
                 )
-                job_status = status['TranscriptionJob']['TranscriptionJobStatus']
-                if job_status in ['COMPLETED', 'FAILED']:
-                    break
-
-        background_tasks.add_task(check_transcription_status, job_name)
+            except Exception as e:
+                logger.warning("failed to queue tracking of %s, tracking it in-process: %s", job_name, e)
+                job_tracker.watch(job_name)
+        else:
+            # Track the job server-side; status subscribers are woken when it finishes
+            job_tracker.watch(job_name)
 
         # Return immediate response with job ID
         return JSONResponse(
             content={
                 "message": "Transcription started",
                 "job_id": job_name,
-                "status_check": f"/transcription-status/{job_name}"
+                "status_check": f"/transcription-status/{job_name}",
+                "upload": upload.as_dict()
             },
             status_code=202
         )
@@ -134,16 +190,105 @@ async def transcribe_audio(
         )
 
 
+@router.post("/transcription-status/batch")
+async def get_transcription_status_batch(request: TranscriptionStatusBatchRequest):
+    """
+    Check the status of many transcription jobs in one request.
+
+    Statuses come from the local registry; only jobs that are unknown or due for a
+    refresh are looked up in AWS, in bulk. Returns only jobs whose status changed
+    after `since_version`, plus the current version to send on the next call.
+
+    Versions count changes seen by this worker process only. A `since_version`
+    ahead of this worker's counter came from another worker (or before a
+    restart), so every requested job is returned.
+    """
+    job_ids = list(dict.fromkeys(request.job_ids))
+    try:
+        stale = status_registry.stale(job_ids)
+        if stale:
+            await run_in_threadpool(refresh_job_statuses, transcribe_client, status_registry, stale)
+    except Exception as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to refresh transcription statuses: {str(e)}"
+        )
+
+    since_version = request.since_version if request.since_version <= status_registry.version else 0
+    changed = status_registry.changed_since(job_ids, since_version)
+    for entry in changed:
+        if entry.status == 'FAILED':
+            dedup_index.update_status(entry.job_id, 'FAILED')
+
+    return {
+        "version": status_registry.version,
+        "jobs": [entry.as_dict() for entry in changed]
+    }
+
+
+def _status_payload(job_id: str, entry) -> dict:
+    if entry is None:
+        return {"job_id": job_id, "status": "in_progress", "failure_reason": None, "version": 0}
+    return entry.as_dict()
+
+
+@router.get("/transcription-status/{job_id}/wait")
+async def wait_transcription_status(
+        job_id: str,
+        timeout: float = Query(25.0, ge=0, le=60, description="Seconds to hold the request open")
+):
+    """
+    Long-poll variant of the status check: returns as soon as the job completes or
+    fails, or with the current status once `timeout` elapses.
+    """
+    entry = await job_tracker.wait(job_id, timeout)
+    return _status_payload(job_id, entry)
+
+
+@router.get("/transcription-status/{job_id}/events")
+async def stream_transcription_status(job_id: str, request: Request):
+    """
+    Server-Sent Events variant of the status check: emits the current status, then
+    keepalive comments until the job reaches a terminal state and a final event.
+    """
+
+    async def event_stream():
+        entry = status_registry.get(job_id)
+        yield f"event: status\ndata: {json.dumps(_status_payload(job_id, entry))}\n\n"
+        while not (entry and entry.is_terminal):
+            if await request.is_disconnected():
+                return
+            entry = await job_tracker.wait(job_id, settings.TRANSCRIPTION_SSE_KEEPALIVE_SECONDS)
+            if entry and entry.is_terminal:
+                yield f"event: status\ndata: {json.dumps(_status_payload(job_id, entry))}\n\n"
+            else:
+                yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/transcription-status/{job_id}", response_model=List[CallTranscriptionType])
 async def get_transcription_status(job_id: str):
     """Check status of a transcription job using CloudFront distribution"""
     try:
+        # Completed jobs are served from the local transcript cache, as stored
+        cached = dedup_index.get_transcript_json(job_id)
+        if cached is not None:
+            return RawJSONResponse(cached)
+
         # First check the job status
         status = transcribe_client.get_transcription_job(
             TranscriptionJobName=job_id
         )
 
         job_status = status['TranscriptionJob']['TranscriptionJobStatus']
+        status_registry.update(
+            job_id, job_status, status['TranscriptionJob'].get('FailureReason'), status['TranscriptionJob'].get('CreationTime')
+        )
 
         if job_status == 'IN_PROGRESS':
             return JSONResponse(
@@ -152,98 +297,217 @@ async def get_transcription_status(job_id: str):
             )
 
         if job_status == 'FAILED':
+            dedup_index.update_status(job_id, 'FAILED')
             raise HTTPException(
                 status_code=500,
                 detail=status['TranscriptionJob'].get('FailureReason', 'Unknown error')
             )
 
-        # Use CloudFront URL instead of direct S3 URL
-        transcript_key = f"transcriptions/{job_id}.json"
-        cloudfront_url = f"https://d2wvh13x6zr3i2.cloudfront.net/{transcript_key}"
+        transcript_response = _fetch_transcript(job_id)
+        grouped_transcriptions, starts = group_transcript_items(transcript_response, job_id)
 
-        try:
+        dedup_index.store_transcript(job_id, grouped_transcriptions)
+        segment_store.put(job_id, grouped_transcriptions, starts)
+        # Built here in the shape of CallTranscriptionType; no need to validate it again
+        return FastJSONResponse(grouped_transcriptions)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get transcription status: {str(e)}"
+        )
+
+
+@router.get("/transcription-segments/{job_id}")
+async def get_transcription_segments(
+        job_id: str,
+        start: Optional[float] = Query(None, ge=0, description="Window start, seconds from call start"),
+        end: Optional[float] = Query(None, ge=0, description="Window end (exclusive), seconds from call start"),
+        since: int = Query(0, ge=0, description="Only segments after this sequence number (cursor)"),
+        limit: int = Query(200, ge=1, le=1000)
+):
+    """
+    Fetch a time window of a transcript's segments instead of the whole call.
+
+    Pass the returned `next_cursor` (or `last_seq` to poll for new segments of a
+    live call) as `since` on the next request.
+    """
+    entry = await _load_segments(job_id)
+    if isinstance(entry, JSONResponse):
+        return entry
+
+    return FastJSONResponse({"job_id": job_id, **segment_store.query(entry, start, end, since, limit)})
+
+
+@router.post("/transcription-segments/{job_id}/persist")
+async def persist_transcription_segments(
+        job_id: str,
+        call_session_id: int = Query(..., description="Call session the transcript belongs to"),
+        background: bool = Query(False, description="Queue it for the job worker and return 202 with the job (runs inline when JOBS_ENABLED is off)"),
+        persistence: TranscriptPersistenceService = Depends(get_transcript_persistence_service)
+):
+    """
+    Store a finished job's grouped segments in CallTranscription.
+
+    Idempotent: persisting the same job again replaces its rows.
+    """
+    if background and settings.JOBS_ENABLED:
+        return await queue_job(
+            "transcript.persist",
+            {"job_id": job_id, "call_session_id": call_session_id},
+            idempotency_key=f"transcript.persist:{job_id}:{call_session_id}"
+        )
+    entry = await _load_segments(job_id)
+    if isinstance(entry, JSONResponse):
+        return entry
+    if not entry.complete:
+        raise HTTPException(status_code=409, detail="Transcript is still in progress")
+
+    try:
+        written = await persistence.persist_job_segments(
+            call_session_id,
+            job_id,
+            list(entry.segments),
+            list(entry.starts)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to persist transcript: {str(e)}"
+        )
+
+    return {"job_id": job_id, "call_session_id": call_session_id, "segments_written": written}
+
+
+@router.post("/transcription-metrics/{job_id}")
+async def compute_transcription_metrics(
+        job_id: str,
+        call_session_id: int = Query(..., description="Call session to store the metrics on"),
+        background: bool = Query(False, description="Queue it for the job worker and return 202 with the job (runs inline when JOBS_ENABLED is off)"),
+        metric_service: InteractionMetricService = Depends(get_interaction_metric_service)
+):
+    """
+    Compute conversation analytics (talk ratio, silence, overlap, interruptions,
+    longest monologue, speaking rate) from the job's word timings and store them
+    on the call session's InteractionMetric.
+    """
+    if background and settings.JOBS_ENABLED:
+        return await queue_job(
+            "transcript.metrics",
+            {"job_id": job_id, "call_session_id": call_session_id},
+            idempotency_key=f"transcript.metrics:{job_id}:{call_session_id}"
+        )
+    # Imported here so numpy stays out of the API's start-up
+    from app.analytics.conversation_metrics import compute_conversation_metrics, word_timings_from_transcript
+
+    transcript_response = await run_in_threadpool(_fetch_transcript, job_id)
+
+    def analyse():
+        return compute_conversation_metrics(*word_timings_from_transcript(transcript_response))
+
+    try:
+        metrics = await run_in_threadpool(analyse)
+        metric_id = await metric_service.store_conversation_metrics(call_session_id, metrics)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to compute conversation metrics: {str(e)}"
+        )
+
+    return {
+        "job_id": job_id,
+        "call_session_id": call_session_id,
+        "interaction_metric_id": metric_id,
+        "metrics": metrics.as_dict()
+    }
+
+
+async def _load_segments(job_id: str):
+    """Segments of a job from memory, the local cache or AWS (JSONResponse while in progress)"""
+    entry = segment_store.get(job_id)
+    if entry is None and job_id.startswith("stream_"):
+        raise HTTPException(status_code=404, detail="Live transcript not found")
+    if entry is None:
+        cached = dedup_index.get_transcript(job_id)
+        if cached is None:
+            result = await get_transcription_status(job_id)
+            entry = segment_store.get(job_id)
+            if entry is None:
+                # Still in progress: pass the status response on
+                return result
+        else:
+            starts = [parse_datetime(segment['timestamp']).timestamp() for segment in cached]
+            entry = segment_store.put(job_id, cached, starts)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+    return entry
+
+
+def _fetch_transcript(job_id: str) -> dict:
+    """Download the raw Transcribe output of a finished job through CloudFront"""
+    # Use CloudFront URL instead of direct S3 URL
+    transcript_key = f"transcriptions/{job_id}.json"
+    cloudfront_url = f"https://d2wvh13x6zr3i2.cloudfront.net/{transcript_key}"
+
+    try:
+        with tracer.span("cloudfront", "GET transcript") as span:
             response = requests.get(
                 cloudfront_url,
                 timeout=10
             )
-            response.raise_for_status()
-
-            if not response.content:
-                raise HTTPException(
-                    status_code=502,
-                    detail="Empty response from transcription service"
-                )
-
-            transcript_response = response.json()
+            span.bytes_received = len(response.content)
+        response.raise_for_status()
 
-        except requests.exceptions.RequestException as e:
+        if not response.content:
             raise HTTPException(
                 status_code=502,
-                detail=f"Failed to fetch transcript from CloudFront: {str(e)}"
+                detail="Empty response from transcription service"
             )
 
-        # Process individual word items
-        word_items = []
-        for item in transcript_response.get('results', {}).get('items', []):
-            if item.get('type') == 'pronunciation' and 'start_time' in item:
-                word_items.append({
-                    "id": str(uuid.uuid4()),
-                    "timestamp": format_timestamp(item['start_time']),
-                    "agent_name": item.get('speaker_label', 'spk_0'),
-                    "content": item['alternatives'][0]['content']
-                })
-
-        # Group words into complete phrases by speaker
-        grouped_transcriptions = []
-        if word_items:
-            current_speaker = word_items[0]['agent_name']
-            current_phrase = []
-            start_time = word_items[0]['timestamp']
-
-            for item in word_items:
-                # Calculate time difference
-                current_time = parse_datetime(item['timestamp'])
-                last_time = parse_datetime(start_time if current_phrase else item['timestamp'])
-                time_diff = (current_time - last_time).total_seconds()
-
-                # If speaker changes or significant pause (>1 second)
-                if (item['agent_name'] != current_speaker or
-                        (current_phrase and time_diff > 1.0)):
-                    # Add completed phrase
-                    if current_phrase:
-                        grouped_transcriptions.append({
-                            "id": str(uuid.uuid4()),
-                            "timestamp": start_time,
-                            "agent_name": current_speaker,
-                            "content": ' '.join(current_phrase)
-                        })
-
-                    # Start new phrase
-                    current_speaker = item['agent_name']
-                    current_phrase = [item['content']]
-                    start_time = item['timestamp']
-                else:
-                    # Continue current phrase
-                    current_phrase.append(item['content'])
-
-            # Add the last phrase
-            if current_phrase:
-                grouped_transcriptions.append({
-                    "id": str(uuid.uuid4()),
-                    "timestamp": start_time,
-                    "agent_name": current_speaker,
-                    "content": ' '.join(current_phrase)
-                })
-
-        return grouped_transcriptions
+        return response.json()
 
-    except Exception as e:
+    except requests.exceptions.RequestException as e:
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to get transcription status: {str(e)}"
+            status_code=502,
+            detail=f"Failed to fetch transcript from CloudFront: {str(e)}"
         )
 
 
+def group_transcript_items(
+        transcript_response: dict,
+        job_id: Optional[str] = None
+) -> Tuple[List[dict], List[float]]:
+    """
+    Group Transcribe word items into phrases by speaker and pause.
+
+    Args:
+        transcript_response: Raw Transcribe output
+        job_id: Derive phrase ids from this job id, so they are stable across reads
+
+    Returns:
+        The grouped phrases and, in parallel, each phrase's start time in seconds
+    """
+    grouper = IncrementalPhraseGrouper(
+        pause_threshold=1.0,
+        max_phrase_words=sys.maxsize,
+        format_time=format_timestamp,
+        job_id=job_id
+    )
+    grouped = []
+    for item in transcript_response.get('results', {}).get('items', []):
+        if item.get('type') == 'pronunciation' and 'start_time' in item:
+            grouped.extend(grouper.add_word(
+                item.get('speaker_label', 'spk_0'),
+                item['alternatives'][0]['content'],
+                float(item['start_time'])
+            ))
+    last = grouper.flush()
+    if last:
+        grouped.append(last)
+
+    return [phrase for phrase, _ in grouped], [start for _, start in grouped]
+
+
 def format_timestamp(seconds: float) -> str:
     """Convert seconds to formatted timestamp string"""
     dt = datetime.fromtimestamp(float(seconds))
@@ -257,6 +521,139 @@ def parse_datetime(timestamp_str: str) -> datetime:
     except ValueError:
         return datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
 
+class InvalidStreamFrame(ValueError):
+    """A text frame on /stream that is not a word, a list of words or an end message"""
+
+
+def parse_word_frame(text: str) -> Optional[List[TranscriptWord]]:
+    """The words in a /stream text frame, or None for {"type": "end"}"""
+    try:
+        event = json.loads(text or "{}")
+        if isinstance(event, dict) and event.get("type") == "end":
+            return None
+        words = []
+        for item in event if isinstance(event, list) else [event]:
+            if not isinstance(item, dict):
+                raise TypeError(f"expected a word object, got {type(item).__name__}")
+            words.append(TranscriptWord(
+                speaker=str(item.get("speaker", "spk_0")),
+                content=str(item["content"]),
+                start_time=float(item["start_time"]),
+                end_time=float(item.get("end_time", item["start_time"]))
+            ))
+        return words
+    except (ValueError, KeyError, TypeError) as e:
+        detail = f"missing field {e}" if isinstance(e, KeyError) else str(e)
+        raise InvalidStreamFrame(f"Invalid word frame: {detail}") from e
+
+
+@router.websocket("/stream")
+async def stream_transcription(websocket: WebSocket, session_id: Optional[str] = None):
+    """
+    Live transcription over a WebSocket.
+
+    Clients send binary audio frames (recognised by the configured streaming ASR
+    backend) and/or text frames with already-recognised words as JSON
+    ({"speaker", "content", "start_time"}, or a list of them). Finished phrases are
+    pushed back as CallTranscriptionType messages. Send {"type": "end"} to flush
+    and close the stream. A malformed text frame closes the stream with 1007.
+
+    With a `session_id` query parameter, segments are also readable through
+    /transcription-segments/stream_{session_id} while the call is in progress.
+    """
+    await websocket.accept()
+    try:
+        backend = create_streaming_backend(settings.STREAMING_ASR_BACKEND)
+    except ValueError as e:
+        await websocket.close(code=1011, reason=str(e))
+        return
+
+    grouper = IncrementalPhraseGrouper(
+        pause_threshold=1.0,
+        max_phrase_words=settings.STREAMING_MAX_PHRASE_WORDS,
+        format_time=format_timestamp
+    )
+    # Bounded so a slow consumer applies backpressure instead of growing memory
+    words: asyncio.Queue = asyncio.Queue(maxsize=settings.STREAMING_WORD_QUEUE_SIZE)
+
+    async def receive_frames():
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if message.get("bytes") is not None:
+                    await backend.send_audio(message["bytes"])
+                    continue
+                frame_words = parse_word_frame(message.get("text"))
+                if frame_words is None:
+                    break
+                for word in frame_words:
+                    await words.put(word)
+        finally:
+            await backend.end_stream()
+
+    async def pump_backend():
+        async for word in backend.words():
+            await words.put(word)
+
+    async def producers():
+        try:
+            await asyncio.gather(receive_frames(), pump_backend())
+        finally:
+            await words.put(None)
+
+    # Live segments are also indexed so the UI can page through them by time
+    stream_key = f"stream_{session_id}"
+
+    async def send_phrase(phrase: dict, start_time: float):
+        if session_id:
+            segment_store.append(stream_key, phrase, start_time)
+        # Built by the grouper in the shape of CallTranscriptionType
+        await websocket.send_text(dumps(phrase).decode())
+
+    producer_task = asyncio.create_task(producers())
+    try:
+        while True:
+            try:
+                word = await asyncio.wait_for(words.get(), settings.STREAMING_IDLE_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                # Nobody is speaking: close the open phrase now rather than at the next word
+                phrases = [grouper.flush()]
+            else:
+                if word is None:
+                    # Producers are done; raises if they stopped on an error
+                    await producer_task
+                    break
+                phrases = grouper.add_word(word.speaker, word.content, word.start_time)
+
+            for phrase in phrases:
+                if phrase:
+                    await send_phrase(*phrase)
+
+        last = grouper.flush()
+        if last:
+            await send_phrase(*last)
+        if session_id:
+            segment_store.mark_complete(stream_key)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    except InvalidStreamFrame as e:
+        await websocket.close(code=1007, reason=str(e)[:120])
+    except Exception as e:
+        await websocket.close(code=1011, reason=f"Streaming transcription failed: {str(e)}"[:120])
+    finally:
+        producer_task.cancel()
+        try:
+            await producer_task
+        except (asyncio.CancelledError, WebSocketDisconnect):
+            pass
+        except Exception:
+            # Already answered with a close code above, or the client is gone
+            pass
+
+
 @router.get("/")
 async def health_check():
     return {"status": "healthy", "service": "audio-transcription-api"}
@@ -266,130 +663,174 @@ async def health_check():
 async def helper(job_id: str):
     """Check status of a transcription job and get assistant response in one call"""
     try:
-        # 1. First get the transcription status
-        status = transcribe_client.get_transcription_job(TranscriptionJobName=job_id)
-        job_status = status['TranscriptionJob']['TranscriptionJobStatus']
+        return await assistant_reply(job_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to process request: {str(e)}"
+        )
 
-        if job_status == 'IN_PROGRESS':
-            return JSONResponse(content={"status": "in_progress"}, status_code=200)
 
-        if job_status == 'FAILED':
-            raise HTTPException(
-                status_code=500,
-                detail=status['TranscriptionJob'].get('FailureReason', 'Unknown error')
-            )
+@router.post("/helper/{job_id}", status_code=202)
+async def queue_helper(job_id: str):
+    """
+    Run the assistant on the job worker instead; poll the returned status_url
+    for the response. Without a worker (JOBS_ENABLED off) it answers inline
+    like GET /helper/{job_id}.
+    """
+    if not settings.JOBS_ENABLED:
+        return FastJSONResponse(await helper(job_id))
+    return await queue_job("assistant.reply", {"job_id": job_id}, idempotency_key=f"assistant.reply:{job_id}")
 
-        # 2. Get the transcript
-        transcript_key = f"transcriptions/{job_id}.json"
-        cloudfront_url = f"https://d2wvh13x6zr3i2.cloudfront.net/{transcript_key}"
 
-        response = requests.get(cloudfront_url, timeout=10)
-        response.raise_for_status()
-        transcript_response = response.json()
-
-        # 3. Process transcript into compact format
-        word_items = []
-        for item in transcript_response.get('results', {}).get('items', []):
-            if item.get('type') == 'pronunciation' and 'start_time' in item:
-                word_items.append({
-                    "agent_name": item.get('speaker_label', 'spk_0'),
-                    "content": item['alternatives'][0]['content']
-                })
-
-        # Group into phrases
-        grouped_transcriptions = []
-        if word_items:
-            current_speaker = word_items[0]['agent_name']
-            current_phrase = []
-
-            for item in word_items:
-                if item['agent_name'] != current_speaker:
-                    if current_phrase:
-                        grouped_transcriptions.append({
-                            "agent_name": current_speaker,
-                            "content": ' '.join(current_phrase)
-                        })
-                    current_speaker = item['agent_name']
-                    current_phrase = [item['content']]
-                else:
-                    current_phrase.append(item['content'])
-
-            if current_phrase:
-                grouped_transcriptions.append({
-                    "agent_name": current_speaker,
-                    "content": ' '.join(current_phrase)
-                })
-
-        compact_transcript = "\n".join(
-            [f"{item['agent_name']} - {item['content']}"
-             for item in grouped_transcriptions]
+# Assistant run statuses that are not final yet
+_ASSISTANT_RUN_PENDING = ("queued", "in_progress", "cancelling")
+
+
+async def assistant_reply(job_id: str) -> dict:
+    """
+    The compact transcript of a finished job and the assistant's response to
+    it, or {"status": "in_progress"} while AWS is still transcribing. Failures
+    raise. Used by the helper endpoints and the assistant.reply job.
+    """
+    # The AWS, CloudFront and OpenAI clients block; they run on the threadpool so
+    # other requests keep being served while this one waits on them
+
+    # 1. First get the transcription status
+    status = await run_in_threadpool(transcribe_client.get_transcription_job, TranscriptionJobName=job_id)
+    job_status = status['TranscriptionJob']['TranscriptionJobStatus']
+
+    if job_status == 'IN_PROGRESS':
+        return {"status": "in_progress"}
+
+    if job_status == 'FAILED':
+        raise HTTPException(
+            status_code=500,
+            detail=status['TranscriptionJob'].get('FailureReason', 'Unknown error')
         )
 
-        # 4. Create thread and message
-        thread = client.beta.threads.create()
-        message = client.beta.threads.messages.create(
-            thread_id=thread.id,
-            role="user",
-            content=compact_transcript
+    # 2. Get the transcript
+    transcript_key = f"transcriptions/{job_id}.json"
+    cloudfront_url = f"https://d2wvh13x6zr3i2.cloudfront.net/{transcript_key}"
+
+    with tracer.span("cloudfront", "GET transcript") as span:
+        response = await run_in_threadpool(requests.get, cloudfront_url, timeout=10)
+        span.bytes_received = len(response.content)
+    response.raise_for_status()
+    transcript_response = response.json()
+
+    # 3. Process transcript into compact format
+    word_items = []
+    for item in transcript_response.get('results', {}).get('items', []):
+        if item.get('type') == 'pronunciation' and 'start_time' in item:
+            word_items.append({
+                "agent_name": item.get('speaker_label', 'spk_0'),
+                "content": item['alternatives'][0]['content']
+            })
+
+    # Group into phrases
+    grouped_transcriptions = []
+    if word_items:
+        current_speaker = word_items[0]['agent_name']
+        current_phrase = []
+
+        for item in word_items:
+            if item['agent_name'] != current_speaker:
+                if current_phrase:
+                    grouped_transcriptions.append({
+                        "agent_name": current_speaker,
+                        "content": ' '.join(current_phrase)
+                    })
+                current_speaker = item['agent_name']
+                current_phrase = [item['content']]
+            else:
+                current_phrase.append(item['content'])
+
+        if current_phrase:
+            grouped_transcriptions.append({
+                "agent_name": current_speaker,
+                "content": ' '.join(current_phrase)
+            })
+
+    compact_transcript = "\n".join(
+        [f"{item['agent_name']} - {item['content']}"
+         for item in grouped_transcriptions]
+    )
+
+    # 4. Create thread and message
+    thread = await run_in_threadpool(client.beta.threads.create)
+    message = await run_in_threadpool(
+        client.beta.threads.messages.create,
+        thread_id=thread.id,
+        role="user",
+        content=compact_transcript
+    )
+
+    # 5. Run assistant
+    run = await run_in_threadpool(
+        client.beta.threads.runs.create,
+        thread_id=thread.id,
+        assistant_id=assistant_id,
+        instructions=(
+            "You are a smart assistant for a customer support agent. "
+            "Customer support will accept calls that will be transcribed real-time. "
+            "During the conversation, find meaningful insights that can help the agent with their responses. "
+            "Always look for relevant information in the document files that are uploaded and follow these rules:\n"
+            "1. Create engaging responses in Markdown format\n"
+            "2. Always add references to information you have extracted\n"
+            "3. Filter, assess, and rank the best response you can suggest to the agent"
         )
+    )
 
-        # 5. Run assistant
-        run = client.beta.threads.runs.create(
+    # Wait for completion
+    deadline = time.monotonic() + settings.ASSISTANT_RUN_TIMEOUT_SECONDS
+    while True:
+        run_status = await run_in_threadpool(
+            client.beta.threads.runs.retrieve,
             thread_id=thread.id,
-            assistant_id=assistant_id,
-            instructions=(
-                "You are a smart assistant for a customer support agent. "
-                "Customer support will accept calls that will be transcribed real-time. "
-                "During the conversation, find meaningful insights that can help the agent with their responses. "
-                "Always look for relevant information in the document files that are uploaded and follow these rules:\n"
-                "1. Create engaging responses in Markdown format\n"
-                "2. Always add references to information you have extracted\n"
-                "3. Filter, assess, and rank the best response you can suggest to the agent"
-            )
+            run_id=run.id
         )
-
-        # Wait for completion
-        while True:
-            run_status = client.beta.threads.runs.retrieve(
-                thread_id=thread.id,
-                run_id=run.id
-            )
-            if run_status.status == "completed":
-                break
-            elif run_status.status == "failed":
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Assistant run failed: {run_status.last_error}"
-                )
-            await asyncio.sleep(1)
-
-        # 6. Get assistant response
-        messages = client.beta.threads.messages.list(thread_id=thread.id)
-        assistant_messages = [
-            msg for msg in messages.data
-            if msg.role == "assistant"
-        ]
-
-        if not assistant_messages:
+        if run_status.status == "completed":
+            break
+        if run_status.status not in _ASSISTANT_RUN_PENDING:
+            # failed, expired, cancelled, incomplete, or requires_action (no tools are handled here)
             raise HTTPException(
                 status_code=500,
-                detail="No response from assistant"
+                detail=f"Assistant run {run_status.status}: {run_status.last_error}"
+            )
+        if time.monotonic() >= deadline:
+            try:
+                await run_in_threadpool(client.beta.threads.runs.cancel, thread_id=thread.id, run_id=run.id)
+            except Exception as e:
+                logger.warning("failed to cancel assistant run %s: %s", run.id, e)
+            raise HTTPException(
+                status_code=504,
+                detail=f"Assistant run still {run_status.status} after {settings.ASSISTANT_RUN_TIMEOUT_SECONDS:g}s"
             )
+        await asyncio.sleep(1)
 
-        return {
-            "transcript": compact_transcript,
-            "assistant_response": assistant_messages[0].content[0].text.value,
-            "thread_id": thread.id
-        }
+    # 6. Get assistant response
+    messages = await run_in_threadpool(client.beta.threads.messages.list, thread_id=thread.id)
+    assistant_messages = [
+        msg for msg in messages.data
+        if msg.role == "assistant"
+    ]
 
-    except Exception as e:
+    if not assistant_messages:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to process request: {str(e)}"
+            detail="No response from assistant"
         )
-# Initialize OpenAI client
-api_key = settings.OPENAI_API_KEY
-client = OpenAI(api_key=api_key)
+
+    return {
+        "transcript": compact_transcript,
+        "assistant_response": assistant_messages[0].content[0].text.value,
+        "thread_id": thread.id
+    }
+
+
+# OpenAI client, created on first use
+client = clients.lazy("openai")
 
 # Assistant and Thread IDs
 assistant_id = "asst_BLo4eW6f3AOQgfiwO0dCcP8e"
@@ -0,0 +1,207 @@
+"""
+Burst test of admission control: a wave of LLM assistant calls
+(/transcribe/helper/{job_id}) and audio uploads (POST /transcribe/) arrives
+at once while cheap endpoints are probed at a steady rate.
+
+Usage:
+    python -m benchmarks.bench_admission [llm_requests] [uploads] [llm_latency] [upload_mb]
+
+Runs main.app in-process against the fakes from bench_load, once with
+admission control disabled and once with the default limits, and reports
+per mode: how the burst was answered (served, shed with 429/503, seconds
+until the last answer), the latency of the probe requests while the burst
+was in progress, and the peak number of threads, requests being served
+and upload bytes in flight. Shed responses are checked for Retry-After.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from benchmarks.fakes import use_fake_settings
+
+_scratch = tempfile.mkdtemp(prefix="nexus-admission-")
+use_fake_settings()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}/bench.db")
+os.environ.setdefault("AUDIO_DEDUP_DB_PATH", f"{_scratch}/audio_dedup.sqlite3")
+os.environ.setdefault("TRACE_EXPORT_PATH", f"{_scratch}/traces.jsonl")
+
+import httpx  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+
+from app.core.admission import admission  # noqa: E402
+from app.transcribe import transcribe_router  # noqa: E402
+from benchmarks import load, synthetic  # noqa: E402
+from benchmarks.bench_load import KNOWN_JOBS, install_fakes  # noqa: E402
+
+# Cheap requests: answered on the event loop, and one that makes a 20 ms AWS call on the threadpool
+PROBES = {
+    "GET /api/v1/status": ("GET", "/api/v1/status", None),
+    "GET /transcribe/transcription-segments/{job_id}": (
+        "GET", f"/transcribe/transcription-segments/{KNOWN_JOBS[0]}?start=0&end=60", None
+    ),
+    "POST /call/create-meeting": ("POST", "/call/create-meeting", {"agent_id": "7"}),
+}
+PROBE_INTERVAL = 0.02
+
+
+class Usage:
+    """Requests being served by class and upload bytes in flight, as the endpoints see them"""
+
+    def __init__(self):
+        self.active = Counter()
+        self.peak = Counter()
+        self.upload_bytes = 0
+        self.peak_upload_bytes = 0
+
+    def enter(self, kind: str, size: int) -> None:
+        self.active[kind] += 1
+        self.peak[kind] = max(self.peak[kind], self.active[kind])
+        self.upload_bytes += size
+        self.peak_upload_bytes = max(self.peak_upload_bytes, self.upload_bytes)
+
+    def leave(self, kind: str, size: int) -> None:
+        self.active[kind] -= 1
+        self.upload_bytes -= size
+
+
+class UsageMiddleware:
+    """Innermost middleware, so only requests that got past admission are counted"""
+
+    def __init__(self, app, usage: Usage):
+        self.app = app
+        self.usage = usage
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        kind = "upload" if path == "/transcribe/" and scope.get("method") == "POST" else (
+            "llm" if path.startswith("/transcribe/helper/") else None)
+        if kind is None:
+            await self.app(scope, receive, send)
+            return
+        size = int(dict(scope["headers"]).get(b"content-length", b"0")) if kind == "upload" else 0
+        self.usage.enter(kind, size)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.usage.leave(kind, size)
+
+
+async def run_mode(app, enabled: bool, llm_requests: int, uploads: int, upload_bytes: int) -> dict:
+    admission.enabled = enabled
+    statuses = {"llm": Counter(), "upload": Counter()}
+    missing_retry_after = 0
+    probe_latencies = {name: [] for name in PROBES}
+    peak_threads = threading.active_count()
+    burst_done = asyncio.Event()
+
+    usage = Usage()
+    app.user_middleware.append(Middleware(UsageMiddleware, usage=usage))
+    app.middleware_stack = None
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+
+        async def record(kind: str, response: httpx.Response) -> None:
+            nonlocal missing_retry_after
+            statuses[kind][response.status_code] += 1
+            if response.status_code in (429, 503) and "retry-after" not in response.headers:
+                missing_retry_after += 1
+
+        async def llm(n: int):
+            await record("llm", await client.get(f"/transcribe/helper/{KNOWN_JOBS[n % len(KNOWN_JOBS)]}"))
+
+        async def upload(n: int):
+            audio = synthetic.wav_bytes(upload_bytes, seed=(2 if enabled else 1) * 1_000_003 + n)
+            await record("upload", await client.post("/transcribe/", files={"file": (f"call_{n}.wav", audio, "audio/wav")}))
+
+        async def probe():
+            nonlocal peak_threads
+            while not burst_done.is_set():
+                for name, (method, url, body) in PROBES.items():
+                    started = time.perf_counter()
+                    response = await client.request(method, url, json=body)
+                    probe_latencies[name].append(time.perf_counter() - started)
+                    assert response.status_code == 200, (name, response.status_code)
+                peak_threads = max(peak_threads, threading.active_count())
+                await asyncio.sleep(PROBE_INTERVAL)
+
+        async def burst():
+            started = time.perf_counter()
+            await asyncio.gather(*(llm(n) for n in range(llm_requests)), *(upload(n) for n in range(uploads)))
+            burst_done.set()
+            return time.perf_counter() - started
+
+        seconds, _ = await asyncio.gather(burst(), probe())
+
+    app.user_middleware.pop()
+    app.middleware_stack = None
+    probes = {}
+    for name, latencies in probe_latencies.items():
+        ordered = sorted(latencies)
+        probes[name] = {
+            "p50_ms": load.percentile(ordered, 50) * 1000,
+            "p99_ms": load.percentile(ordered, 99) * 1000,
+            "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+            "count": len(ordered),
+        }
+    return {
+        "seconds": seconds,
+        "statuses": statuses,
+        "missing_retry_after": missing_retry_after,
+        "probes": probes,
+        "peak_threads": peak_threads,
+        "peak_active": dict(usage.peak),
+        "peak_upload_mb": usage.peak_upload_bytes / 1024 / 1024,
+    }
+
+
+def describe(counts: Counter) -> str:
+    return ", ".join(f"{count}x{status}" for status, count in sorted(counts.items())) or "-"
+
+
+async def run(llm_requests: int, uploads: int, llm_latency: float, upload_mb: float):
+    from main import app
+
+    install_fakes(SimpleNamespace(aws_latency=0.02, cdn_latency=0.03, llm_latency=llm_latency, words=2000))
+    upload_bytes = int(upload_mb * 1024 * 1024)
+    try:
+        # Cache the known jobs so the segment probe reads from memory
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for job_id in KNOWN_JOBS:
+                (await client.get(f"/transcribe/transcription-status/{job_id}")).raise_for_status()
+        results = {
+            "no admission": await run_mode(app, False, llm_requests, uploads, upload_bytes),
+            "admission": await run_mode(app, True, llm_requests, uploads, upload_bytes),
+        }
+    finally:
+        await transcribe_router.job_tracker.stop()
+
+    print(f"burst of {llm_requests} LLM calls ({llm_latency * 1000:.0f} ms per OpenAI call) and {uploads} uploads "
+          f"of {upload_mb:g} MB, probes every {PROBE_INTERVAL * 1000:.0f} ms, {os.cpu_count()} CPUs\n")
+    for mode, result in results.items():
+        print(f"[{mode}] burst answered in {result['seconds']:.1f} s; "
+              f"llm {describe(result['statuses']['llm'])}; upload {describe(result['statuses']['upload'])}")
+        print(f"    peak served at once: llm {result['peak_active'].get('llm', 0)}, "
+              f"upload {result['peak_active'].get('upload', 0)} ({result['peak_upload_mb']:.0f} MB); "
+              f"peak threads {result['peak_threads']}; shed without Retry-After: {result['missing_retry_after']}")
+        for name, stats in result["probes"].items():
+            print(f"    {name:<50} p50 {stats['p50_ms']:>8.1f} ms  p99 {stats['p99_ms']:>8.1f} ms  "
+                  f"max {stats['max_ms']:>8.1f} ms  ({stats['count']} probes)")
+
+
+def main():
+    llm_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    uploads = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    llm_latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+    upload_mb = float(sys.argv[4]) if len(sys.argv) > 4 else 8.0
+    asyncio.run(run(llm_requests, uploads, llm_latency, upload_mb))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Count SQL statements and time the dashboard repository queries against naive lazy loading.
+
+Usage:
+    python -m benchmarks.bench_call_session_queries [sessions] [database_url]
+
+Defaults to 5,000 call sessions in a temporary SQLite file. Exits non-zero if a
+view's statement count changes with the page size, or if walking an agent's
+sessions page by page skips or repeats a session.
+"""
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_database_url
+from app.db.models import Agent, CallSession, CallSummary, Company, Customer, InteractionMetric
+from app.repositories.call_session_repository import CallSessionRepository
+
+AGENTS, CUSTOMERS = 10, 200
+PAGE_SIZES = (5, 50, 200)
+
+
+async def seed(engine, count: int):
+    rng = random.Random(5)
+    start = datetime(2025, 1, 1)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(insert(Company.__table__).values(
+            company_id=1, company_name="Bench", email="bench@example.com", field="support", password="x"
+        ))
+        await connection.execute(insert(Agent.__table__), [
+            {"agent_id": i, "company_id": 1, "agent_name": f"Agent {i}", "email": f"a{i}@example.com", "password": "x"}
+            for i in range(1, AGENTS + 1)
+        ])
+        await connection.execute(insert(Customer.__table__), [
+            {"customer_id": i, "company_id": 1, "customer_name": f"Customer {i}"} for i in range(1, CUSTOMERS + 1)
+        ])
+        # Duplicate timestamps on purpose: the keyset must break ties on call_session_id
+        await connection.execute(insert(CallSession.__table__), [
+            {
+                "call_session_id": i,
+                "company_id": 1,
+                "agent_id": rng.randint(1, AGENTS),
+                "customer_id": rng.randint(1, CUSTOMERS),
+                "duration": rng.randint(30, 1800),
+                "created_at": start + timedelta(minutes=i // 3),
+                "updated_at": start,
+            }
+            for i in range(1, count + 1)
+        ])
+        await connection.execute(insert(InteractionMetric.__table__), [
+            {"call_session_id": i, "csat_score": float(rng.randint(1, 5)), "internal_qa_score": rng.uniform(40, 100)}
+            for i in range(1, count + 1)
+        ])
+        await connection.execute(insert(CallSummary.__table__), [
+            {"call_session_id": i, "role": role, "summary": f"{role} summary of call {i}"}
+            for i in range(1, count + 1) for role in ("AGENT", "CUSTOMER")
+        ])
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def naive_agent_sessions(connection, agent_id: int, limit: int) -> int:
+    """The same view with default lazy loading, as a straightforward ORM page would do it"""
+    with Session(bind=connection) as session:
+        call_sessions = session.exec(
+            select(CallSession).where(CallSession.agent_id == agent_id)
+            .order_by(CallSession.created_at.desc()).limit(limit)
+        ).all()
+        return sum(
+            len(call_session.interaction_metrics) + (call_session.customer is not None)
+            for call_session in call_sessions
+        )
+
+
+async def run(count: int, url: str):
+    engine = create_async_engine(async_database_url(url))
+    await seed(engine, count)
+    counter = StatementCounter(engine)
+    failed = False
+
+    async with AsyncSession(engine) as session:
+        repository = CallSessionRepository(session)
+        views = {
+            "agent_recent_sessions": lambda limit: repository.agent_recent_sessions(1, limit),
+            "company_call_list": lambda limit: repository.company_call_list(1, limit),
+            "customer_history": lambda limit: repository.customer_history(1, limit),
+        }
+        for name, view in views.items():
+            counts = []
+            for limit in PAGE_SIZES:
+                await view(limit)
+                counter.count = 0
+                started = time.perf_counter()
+                page = await view(limit)
+                elapsed = (time.perf_counter() - started) * 1000
+                counts.append(counter.count)
+                print(f"{name:>22} limit={limit:<4} items={len(page['items']):<4} statements={counter.count} {elapsed:.1f} ms")
+            if len(set(counts)) != 1:
+                print(f"FAIL: {name} statement count depends on page size: {counts}")
+                failed = True
+
+        # Walk every page of one agent and check the keyset neither skips nor repeats
+        seen, cursor = [], None
+        while True:
+            page = await repository.agent_recent_sessions(1, 37, cursor)
+            seen.extend(item["call_session_id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        connection = await session.connection()
+        expected = (await connection.execute(
+            select(CallSession.call_session_id).where(CallSession.agent_id == 1)
+        )).scalars().all()
+        ok = len(seen) == len(set(seen)) and set(seen) == set(expected)
+        print(f"keyset walk: {len(seen)} sessions over {-(-len(seen) // 37)} pages, complete and unique: {ok}")
+        failed = failed or not ok
+
+    for limit in PAGE_SIZES:
+        counter.count = 0
+        started = time.perf_counter()
+        async with engine.connect() as connection:
+            await connection.run_sync(naive_agent_sessions, 1, limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{'naive lazy loading':>22} limit={limit:<4} statements={counter.count} {elapsed:.1f} ms")
+
+    await engine.dispose()
+    if failed:
+        sys.exit(1)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    asyncio.run(run(count, url))
+
+
+if __name__ == "__main__":
+    main()
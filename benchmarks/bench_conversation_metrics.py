@@ -0,0 +1,48 @@
+"""
+Benchmark vectorized conversation analytics on a synthetic call.
+
+Usage:
+    python -m benchmarks.bench_conversation_metrics [call_minutes]
+
+Defaults to a 2-hour call (about 2.5 words per second).
+"""
+import sys
+import time
+
+import numpy as np
+
+from app.analytics.conversation_metrics import compute_conversation_metrics
+
+
+def synthetic_call(minutes: float, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    words = int(minutes * 60 * 2.5)
+    gaps = rng.exponential(0.25, words)
+    starts = np.cumsum(gaps + 0.15)
+    ends = starts + rng.uniform(0.15, 0.45, words)
+    # Speaker turns of 5-40 words
+    turn_lengths = rng.integers(5, 40, words // 5 + 1)
+    turn_speaker = np.arange(len(turn_lengths)) % 2
+    speakers = np.repeat(turn_speaker, turn_lengths)[:words]
+    labels = np.array(["spk_0", "spk_1"])[speakers]
+    return starts, ends, labels
+
+
+def main():
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 120
+    starts, ends, speakers = synthetic_call(minutes)
+
+    compute_conversation_metrics(starts, ends, speakers)
+    runs = 20
+    started = time.perf_counter()
+    for _ in range(runs):
+        metrics = compute_conversation_metrics(starts, ends, speakers)
+    elapsed = (time.perf_counter() - started) / runs
+
+    print(f"{len(starts)} words ({minutes:.0f} min call): {elapsed * 1000:.2f} ms per call")
+    for key, value in metrics.as_dict().items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
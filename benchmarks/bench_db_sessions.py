@@ -0,0 +1,99 @@
+"""
+Throughput of a simple read endpoint using the sync Session (run in the thread pool)
+versus the AsyncSession dependency.
+
+Usage:
+    python -m benchmarks.bench_db_sessions [requests] [concurrency] [database_url]
+
+Defaults to a temporary SQLite file; pass a postgresql:// URL to compare psycopg2 and asyncpg.
+"""
+import asyncio
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import _pool_options, async_database_url
+from app.db.models import CallSession, CallTranscription
+
+table = CallTranscription.__table__
+
+
+def build_app(url: str):
+    sync_engine = create_engine(url, **_pool_options(url))
+    async_engine = create_async_engine(async_database_url(url), **_pool_options(url))
+    async_factory = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    SQLModel.metadata.create_all(sync_engine)
+    with sync_engine.begin() as connection:
+        connection.execute(insert(CallSession.__table__).values(call_session_id=1))
+        connection.execute(insert(table), [
+            {"call_session_id": 1, "transcription": f"segment {i}", "call_file": "bench"}
+            for i in range(1000)
+        ])
+
+    def sync_session():
+        with Session(sync_engine) as session:
+            yield session
+
+    async def async_session():
+        async with async_factory() as session:
+            yield session
+
+    query = select(table.c.call_transcription_id, table.c.transcription).where(table.c.call_session_id == 1).limit(20)
+    app = FastAPI()
+
+    @app.get("/sync")
+    def read_sync(session: Session = Depends(sync_session)):
+        return [dict(row._mapping) for row in session.connection().execute(query)]
+
+    @app.get("/async")
+    async def read_async(session: AsyncSession = Depends(async_session)):
+        result = await (await session.connection()).execute(query)
+        return [dict(row._mapping) for row in result]
+
+    return app, sync_engine, async_engine
+
+
+async def drive(app: FastAPI, path: str, count: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(count))
+
+        async def worker():
+            for _ in remaining:
+                (await client.get(path)).raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return count / (time.perf_counter() - started)
+
+
+async def run(count: int, concurrency: int, url: str):
+    app, sync_engine, async_engine = build_app(url)
+    try:
+        for path in ("/sync", "/async"):
+            await drive(app, path, 50, concurrency)
+            rate = await drive(app, path, count, concurrency)
+            print(f"{path:>7}: {rate:,.0f} requests/s ({count} requests, concurrency {concurrency})")
+    finally:
+        # aiosqlite connections run on non-daemon threads; close them so the process can exit
+        await async_engine.dispose()
+        sync_engine.dispose()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    url = sys.argv[3] if len(sys.argv) > 3 else f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    asyncio.run(run(count, concurrency, url))
+
+
+if __name__ == "__main__":
+    main()
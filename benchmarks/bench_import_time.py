@@ -0,0 +1,102 @@
+"""
+Measure the cold start of a worker (a fresh interpreter importing main) and
+fail when it goes over a budget.
+
+Usage:
+    python -m benchmarks.bench_import_time [budget_ms] [runs]
+
+Every run is a new `python -X importtime` process with the AWS and OpenAI
+credentials removed from its environment, so this also checks that the app
+imports without them and creates no client or database engine while doing
+so. Prints the median import time, the heaviest modules main pulls in and
+the slowest modules by their own time; exits 1 when the median import of
+main is over the budget (default 1500 ms).
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CREDENTIALS = ("OPENAI_API_KEY", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_BUCKET_NAME")
+PROBE = """
+import json, time
+started = time.perf_counter()
+import main
+seconds = time.perf_counter() - started
+from app.core import database
+from app.core.clients import clients
+print(json.dumps({
+    "seconds": seconds,
+    "clients": clients.created,
+    "engines": [f.__name__ for f in database._LAZY.values() if f.cache_info().currsize],
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> list:
+    """(self_us, cumulative_us, depth, module) for every line of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((int(own), int(cumulative), depth, name.strip()))
+    return rows
+
+
+def measure(env: dict) -> tuple:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        print(result.stderr[-3000:])
+        raise SystemExit(f"importing main failed (exit {result.returncode})")
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    return probe, wall, parse_importtime(result.stderr)
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 1500.0
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 9
+    env = {key: value for key, value in os.environ.items() if key not in CREDENTIALS}
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    # One unmeasured run so every measured run finds the bytecode cache warm
+    measure(env)
+    imports, walls = [], []
+    for _ in range(runs):
+        probe, wall, rows = measure(env)
+        imports.append(probe["seconds"] * 1000)
+        walls.append(wall * 1000)
+
+    assert not probe["clients"], f"clients created at import: {probe['clients']}"
+    assert not probe["engines"], f"database engines created at import: {probe['engines']}"
+
+    median = statistics.median(imports)
+    print(f"import main: median {median:.0f} ms, min {min(imports):.0f} ms over {runs} runs "
+          f"(process wall time median {statistics.median(walls):.0f} ms)")
+    print("no credentials needed, no clients or engines created at import")
+
+    print("\nheaviest imports under main (cumulative ms):")
+    main_depth = next(depth for _, _, depth, name in rows if name == "main")
+    children = [row for row in rows if row[2] == main_depth + 1]
+    for own, cumulative, _, name in sorted(children, reverse=True, key=lambda row: row[1])[:12]:
+        print(f"  {cumulative / 1000:>8.1f}  {name}")
+    print("\nslowest modules by own time (ms):")
+    for own, cumulative, _, name in sorted(rows, reverse=True)[:8]:
+        print(f"  {own / 1000:>8.1f}  {name}")
+
+    if median > budget_ms:
+        print(f"\nFAIL: {median:.0f} ms is over the {budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"\nOK: within the {budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Throughput of the durable job queue (app/jobs) on its default SQLite backend.
+
+Usage:
+    python -m benchmarks.bench_job_queue [jobs] [processes]
+
+Enqueues `jobs` small jobs one call at a time and in batches of
+JOBS_BATCH_SIZE, then drains them with workers running no-op tasks:
+once acknowledging every job as it finishes (batch size 1), once with the
+default batched claims and acknowledgements, once with a plain-function
+task on the worker's thread pool, and finally with `processes` worker
+processes sharing the queue file (timed from process start, so including
+their imports). Reports jobs per second for each and checks that every
+job ran exactly once.
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+_scratch = tempfile.mkdtemp(prefix="nexus-jobs-")
+os.environ.setdefault("JOBS_SQLITE_PATH", f"{_scratch}/jobs.sqlite3")
+
+from app.core.config import settings  # noqa: E402
+from app.jobs.queue import DONE, JobQueue, create_job_queue  # noqa: E402
+from app.jobs.registry import TaskRegistry  # noqa: E402
+from app.jobs.worker import Worker  # noqa: E402
+
+bench_tasks = TaskRegistry()
+
+
+@bench_tasks.task("bench.noop")
+async def noop(n: int) -> int:
+    return n
+
+
+@bench_tasks.task("bench.noop_sync")
+def noop_sync(n: int) -> int:
+    return n
+
+
+def fresh_queue(name: str) -> JobQueue:
+    settings.JOBS_SQLITE_PATH = os.path.join(_scratch, f"{name}.sqlite3")
+    return create_job_queue(settings)
+
+
+def fill(job_queue: JobQueue, task: str, count: int) -> None:
+    for start in range(0, count, settings.JOBS_BATCH_SIZE):
+        job_queue.enqueue_many(
+            [{"task": task, "payload": {"n": n}} for n in range(start, min(count, start + settings.JOBS_BATCH_SIZE))]
+        )
+
+
+def done_count(job_queue: JobQueue) -> int:
+    return sum(counts.get(DONE, 0) for counts in job_queue.stats().values())
+
+
+async def drain(worker: Worker, job_queue: JobQueue, count: int) -> None:
+    """Run `worker` until `count` jobs are done"""
+    running = asyncio.create_task(worker.run())
+    while done_count(job_queue) < count:
+        await asyncio.sleep(0.02)
+    worker.stop()
+    await running
+
+
+def run_worker(path: str, count: int, batch_size: int, flush_interval: float) -> float:
+    settings.JOBS_SQLITE_PATH = path
+    job_queue = create_job_queue(settings)
+    worker = Worker(
+        job_queue, bench_tasks, ["default"],
+        concurrency=max(batch_size, 1) * 2, batch_size=batch_size,
+        poll_interval=0.01, flush_interval=flush_interval
+    )
+    started = time.perf_counter()
+    asyncio.run(drain(worker, job_queue, count))
+    return time.perf_counter() - started
+
+
+def process_main(path: str, count: int) -> None:
+    """One of several worker processes: run until all `count` jobs on the shared queue are done"""
+    run_worker(path, count, settings.JOBS_BATCH_SIZE, 0.05)
+
+
+def run_processes(path: str, count: int, processes: int) -> float:
+    context = multiprocessing.get_context("spawn")
+    children = [context.Process(target=process_main, args=(path, count)) for _ in range(processes)]
+    started = time.perf_counter()
+    for child in children:
+        child.start()
+    for child in children:
+        child.join()
+    return time.perf_counter() - started
+
+
+def report(label: str, count: int, seconds: float) -> None:
+    print(f"  {label:<44} {count / seconds:>10,.0f} jobs/s  ({seconds:.2f}s)")
+
+
+def check(job_queue: JobQueue, count: int) -> None:
+    with job_queue.engine.connect() as connection:
+        most_attempts, done = connection.exec_driver_sql(
+            "SELECT max(attempts), count(*) FROM job_queue WHERE status = 'done'"
+        ).one()
+    if done != count or most_attempts != 1:
+        raise SystemExit(f"expected {count} jobs done once each, got {job_queue.stats()} (max attempts {most_attempts})")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    batch_size = settings.JOBS_BATCH_SIZE
+    print(f"{count} jobs, SQLite at {_scratch}")
+
+    print("enqueue")
+    job_queue = fresh_queue("single")
+    single = min(count, 2000)
+    started = time.perf_counter()
+    for n in range(single):
+        job_queue.enqueue("bench.noop", {"n": n})
+    report("enqueue(), one transaction per job", single, time.perf_counter() - started)
+
+    job_queue = fresh_queue("batched")
+    started = time.perf_counter()
+    fill(job_queue, "bench.noop", count)
+    report(f"enqueue_many(), {batch_size} per transaction", count, time.perf_counter() - started)
+
+    print("worker, one process")
+    unbatched = min(count, 2000)
+    job_queue = fresh_queue("unbatched")
+    fill(job_queue, "bench.noop", unbatched)
+    seconds = run_worker(settings.JOBS_SQLITE_PATH, unbatched, 1, 0.0)
+    check(job_queue, unbatched)
+    report("claim and acknowledge one job at a time", unbatched, seconds)
+
+    job_queue = fresh_queue("async")
+    fill(job_queue, "bench.noop", count)
+    seconds = run_worker(settings.JOBS_SQLITE_PATH, count, batch_size, 0.05)
+    check(job_queue, count)
+    report(f"batches of {batch_size}, coroutine task", count, seconds)
+
+    job_queue = fresh_queue("sync")
+    fill(job_queue, "bench.noop_sync", count)
+    seconds = run_worker(settings.JOBS_SQLITE_PATH, count, batch_size, 0.05)
+    check(job_queue, count)
+    report(f"batches of {batch_size}, function on the thread pool", count, seconds)
+
+    if processes > 1:
+        print(f"worker, {processes} processes")
+        job_queue = fresh_queue("processes")
+        fill(job_queue, "bench.noop", count)
+        seconds = run_processes(settings.JOBS_SQLITE_PATH, count, processes)
+        check(job_queue, count)
+        report(f"batches of {batch_size}, coroutine task", count, seconds)
+
+
+if __name__ == "__main__":
+    main()
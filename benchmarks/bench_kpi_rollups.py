@@ -0,0 +1,147 @@
+"""
+Benchmark agent-month KPI rollups against scanning the raw call rows.
+
+Usage:
+    python -m benchmarks.bench_kpi_rollups [calls] [database_url]
+
+Defaults to 20,000 scored calls (50 agents over 12 months) in a temporary SQLite file.
+Scores are then recorded incrementally for a sample of calls (including re-scores),
+and the resulting rollups are checked against a full rebuild.
+"""
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_database_url
+from app.db.models import (
+    Agent, AgentMonthlyKpiRollup, CallSession, Company, InteractionMetric, KpiRollupContribution
+)
+from app.services.interaction_metric_service import InteractionMetricService
+from app.services.kpi_rollup_service import KpiRollupService
+
+AGENTS = 50
+
+
+async def seed(engine, count: int, rng: random.Random):
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(insert(Company.__table__).values(
+            company_id=1, company_name="Bench", email="bench@example.com", field="support", password="x"
+        ))
+        await connection.execute(insert(Agent.__table__), [
+            {"agent_id": i, "company_id": 1, "agent_name": f"Agent {i}", "email": f"a{i}@example.com", "password": "x"}
+            for i in range(1, AGENTS + 1)
+        ])
+        await connection.execute(insert(CallSession.__table__), [
+            {
+                "call_session_id": i + 1,
+                "agent_id": rng.randint(1, AGENTS),
+                "created_at": datetime(2025, rng.randint(1, 12), rng.randint(1, 28), 12),
+                "updated_at": datetime(2025, 1, 1),
+            }
+            for i in range(count)
+        ])
+        await connection.execute(insert(InteractionMetric.__table__), [
+            {
+                "call_session_id": i + 1,
+                "internal_qa_score": round(rng.uniform(40, 100), 1),
+                "csat_score": float(rng.randint(1, 5)) if rng.random() < 0.6 else None,
+                "recorded_at": datetime(2025, 1, 1),
+                "updated_at": datetime(2025, 1, 1),
+            }
+            for i in range(count)
+        ])
+
+
+async def scan_agent_month(session: AsyncSession, agent_id: int, month: date) -> dict:
+    """What a report has to do without rollups: aggregate the month's raw rows"""
+    sessions, metrics = CallSession.__table__, InteractionMetric.__table__
+    end = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    connection = await session.connection()
+    grades = sorted((await connection.execute(
+        select(metrics.c.internal_qa_score)
+        .join(sessions, sessions.c.call_session_id == metrics.c.call_session_id)
+        .where(sessions.c.agent_id == agent_id, sessions.c.created_at >= month, sessions.c.created_at < end)
+    )).scalars())
+    return {"count": len(grades), "p50": grades[(len(grades) - 1) // 2] if grades else None}
+
+
+async def run(count: int, url: str):
+    rng = random.Random(11)
+    engine = create_async_engine(async_database_url(url))
+    await seed(engine, count, rng)
+
+    async with AsyncSession(engine) as session:
+        started = time.perf_counter()
+        result = await KpiRollupService(session).rebuild(batch_size=2000)
+        print(f"rebuild: {result['calls']} calls -> {result['rollups']} rollups in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    # Incremental path: new scores and corrections for a sample of calls
+    samples = rng.sample(range(1, count + 1), min(500, count))
+    async with AsyncSession(engine) as session:
+        service = InteractionMetricService(session)
+        started = time.perf_counter()
+        for call_session_id in samples:
+            await service.record_scores(
+                call_session_id,
+                internal_qa_score=round(rng.uniform(0, 100), 1),
+                csat_score=float(rng.randint(1, 5))
+            )
+        elapsed = time.perf_counter() - started
+    print(f"record_scores: {elapsed / len(samples) * 1000:.2f} ms per call ({len(samples)} calls)")
+
+    async with AsyncSession(engine) as session:
+        connection = await session.connection()
+        incremental = [dict(row) for row in (await connection.execute(
+            select(AgentMonthlyKpiRollup.__table__).order_by("agent_id", "month")
+        )).mappings()]
+        await KpiRollupService(session).rebuild(batch_size=2000)
+        connection = await session.connection()
+        rebuilt = [dict(row) for row in (await connection.execute(
+            select(AgentMonthlyKpiRollup.__table__).order_by("agent_id", "month")
+        )).mappings()]
+
+    def comparable(rows):
+        return [
+            (r["agent_id"], r["month"], r["call_count"], r["grade_count"], round(r["grade_sum"], 6),
+             r["grade_min"], r["grade_max"], r["grade_sketch"], r["csat_count"], round(r["csat_sum"], 6),
+             r["csat_min"], r["csat_max"], r["csat_sketch"])
+            for r in rows
+        ]
+    print(f"incremental rollups match rebuild: {comparable(incremental) == comparable(rebuilt)}")
+
+    month = date(2025, 6, 1)
+    async with AsyncSession(engine) as session:
+        service = KpiRollupService(session)
+        for label, read in (
+                ("rollup read", lambda agent: service.get_agent_month(agent, month)),
+                ("raw scan", lambda agent: scan_agent_month(session, agent, month)),
+        ):
+            started = time.perf_counter()
+            for agent_id in range(1, AGENTS + 1):
+                await read(agent_id)
+            print(f"{label}: {(time.perf_counter() - started) / AGENTS * 1000:.2f} ms per agent-month")
+        print(await service.get_agent_month(1, month))
+
+    async with engine.connect() as connection:
+        total = (await connection.execute(select(func.count()).select_from(KpiRollupContribution.__table__))).scalar()
+    print(f"ledger rows: {total}")
+    await engine.dispose()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    asyncio.run(run(count, url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Offline load test of the API against in-process fakes for AWS (Transcribe,
+S3, Chime), the CloudFront transcript download and the OpenAI Assistants
+API, each with configurable injected latency.
+
+Usage:
+    python -m benchmarks.bench_load [--scenarios a,b] [--concurrency 16] [--requests 300]
+                                    [--aws-latency 0.02] [--llm-latency 0.08] [--words 2000]
+                                    [--admission] [--output results.json]
+    python -m benchmarks.load baseline.json candidate.json   # compare two runs
+
+Every scenario runs the real main.app at a fixed concurrency and reports
+p50/p95/p99 and requests/sec per endpoint. Results are written as JSON
+(by default benchmarks/results/load-<commit>.json) for comparison between
+commits. Synthetic data is seeded, so repeated runs see the same inputs.
+Admission control is off unless --admission is given, so the upload and
+assistant scenarios measure the endpoints rather than the load shedding
+(see bench_admission.py for that).
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+from types import SimpleNamespace
+
+from benchmarks.fakes import use_fake_settings
+
+_scratch = tempfile.mkdtemp(prefix="nexus-load-")
+use_fake_settings()
+# Keep the run's side effects out of data/
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}/bench.db")
+os.environ.setdefault("AUDIO_DEDUP_DB_PATH", f"{_scratch}/audio_dedup.sqlite3")
+os.environ.setdefault("TRACE_EXPORT_PATH", f"{_scratch}/traces.jsonl")
+
+import httpx  # noqa: E402
+import requests  # noqa: E402
+
+from app.call import call_router  # noqa: E402
+from app.core.admission import admission  # noqa: E402
+from app.core.clients import clients  # noqa: E402
+from app.transcribe import transcribe_router  # noqa: E402
+from benchmarks import load, synthetic  # noqa: E402
+from benchmarks.fakes import (  # noqa: E402
+    FakeChimeClient, FakeCloudFront, FakeOpenAI, FakeS3Client, FakeTranscribeClient
+)
+
+# Jobs re-read by the cached, segment and batch scenarios
+KNOWN_JOBS = [f"transcribe_known_{i:03d}" for i in range(32)]
+
+
+def install_fakes(args) -> SimpleNamespace:
+    """Serve the fakes from the client registry in place of AWS, CloudFront and OpenAI"""
+    fakes = SimpleNamespace(
+        transcribe=FakeTranscribeClient(latency=args.aws_latency),
+        s3=FakeS3Client(latency=args.aws_latency),
+        chime=FakeChimeClient(latency=args.aws_latency),
+        cloudfront=FakeCloudFront(latency=args.cdn_latency, words=args.words),
+        openai=FakeOpenAI(latency=args.llm_latency, run_polls=0),
+    )
+    for name in ("transcribe", "s3", "chime", "openai"):
+        clients.override(name, getattr(fakes, name))
+    # The transcript download goes through requests, not a registry client
+    transcribe_router.requests = SimpleNamespace(get=fakes.cloudfront.get, exceptions=requests.exceptions)
+    call_router.meeting_pool = None
+    return fakes
+
+
+def build_scenarios(args) -> dict:
+    documents = synthetic.documents(200, seed=args.seed)
+
+    async def transcript_cold(session: load.LoadSession, n: int):
+        # A job nobody has read yet: Transcribe status, CloudFront download, grouping, caching
+        await session.get("/transcribe/transcription-status/{job_id}", path={"job_id": f"transcribe_cold_{n:06d}"})
+
+    async def transcript_cached(session: load.LoadSession, n: int):
+        await session.get("/transcribe/transcription-status/{job_id}", path={"job_id": KNOWN_JOBS[n % len(KNOWN_JOBS)]})
+
+    async def segments_window(session: load.LoadSession, n: int):
+        start = (n * 37) % max(1, args.words // 3)
+        await session.get(
+            "/transcribe/transcription-segments/{job_id}",
+            path={"job_id": KNOWN_JOBS[n % len(KNOWN_JOBS)]},
+            params={"start": start, "end": start + 120, "limit": 100}
+        )
+
+    async def status_batch(session: load.LoadSession, n: int):
+        job_ids = KNOWN_JOBS + [f"transcribe_batch_{n:06d}_{i}" for i in range(18)]
+        await session.post("/transcribe/transcription-status/batch", json={"job_ids": job_ids})
+
+    async def upload(session: load.LoadSession, n: int):
+        audio = synthetic.wav_bytes(args.upload_bytes, seed=args.seed * 1_000_003 + n)
+        await session.post(
+            "/transcribe/",
+            files={"file": (f"call_{n}.wav", audio, "audio/wav")},
+            expect=(202,)
+        )
+
+    async def assistant_helper(session: load.LoadSession, n: int):
+        await session.get("/transcribe/helper/{job_id}", path={"job_id": KNOWN_JOBS[n % len(KNOWN_JOBS)]})
+
+    async def create_meeting(session: load.LoadSession, n: int):
+        await session.post("/call/create-meeting", json={"agent_id": str(n % 50)})
+
+    async def documents_search(session: load.LoadSession, n: int):
+        await session.post("/api/v1/documents/", json=documents[n % len(documents)], expect=(201,))
+        await session.post("/api/v1/documents/search", json={"query": "refund duplicate charge", "top_k": 5})
+
+    return {
+        "transcript-cold": transcript_cold,
+        "transcript-cached": transcript_cached,
+        "segments-window": segments_window,
+        "status-batch": status_batch,
+        "upload": upload,
+        "assistant-helper": assistant_helper,
+        "create-meeting": create_meeting,
+        "documents": documents_search,
+    }
+
+
+async def run(args):
+    from main import app
+
+    install_fakes(args)
+    admission.enabled = args.admission
+    scenarios = build_scenarios(args)
+    selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+    unknown = set(selected) - set(scenarios)
+    if unknown:
+        raise SystemExit(f"unknown scenarios: {', '.join(sorted(unknown))} (choose from {', '.join(scenarios)})")
+
+    results = {}
+    try:
+        # Read the known jobs once so the cached scenarios only measure cache hits
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for job_id in KNOWN_JOBS:
+                (await client.get(f"/transcribe/transcription-status/{job_id}")).raise_for_status()
+
+        for name in selected:
+            results[name] = await load.run_scenario(
+                app, scenarios[name], args.concurrency, args.requests, warmup=args.warmup
+            )
+            print(f"{name}: {results[name]['iterations_per_second']} iterations/s")
+    finally:
+        await transcribe_router.job_tracker.stop()
+
+    parameters = {
+        key: getattr(args, key)
+        for key in ("concurrency", "requests", "warmup", "aws_latency", "cdn_latency", "llm_latency", "words",
+                    "upload_bytes", "seed", "admission")
+    }
+    output = args.output or load.default_results_path()
+    load.write_results(output, parameters, results)
+    print()
+    load.print_report(results)
+    print(f"\nresults written to {output}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default="", help="comma-separated scenario names (default: all)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=300, help="recorded iterations per scenario")
+    parser.add_argument("--warmup", type=int, default=32, help="unrecorded iterations per scenario")
+    parser.add_argument("--aws-latency", type=float, default=0.02, help="seconds per Transcribe/S3/Chime call")
+    parser.add_argument("--cdn-latency", type=float, default=0.03, help="seconds per CloudFront download")
+    parser.add_argument("--llm-latency", type=float, default=0.08, help="seconds per OpenAI call")
+    parser.add_argument("--words", type=int, default=2000, help="words per synthetic transcript")
+    parser.add_argument("--upload-bytes", type=int, default=1024 * 1024, help="size of each uploaded audio file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--admission", action="store_true", help="keep admission control on (shed requests count as errors)")
+    parser.add_argument("--output", default="", help="results file (default: benchmarks/results/load-<commit>.json)")
+    return parser.parse_args()
+
+
+def main():
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Measure what logging costs each request on the document endpoints, the
+way they used to log (every line written synchronously from the request)
+against the queue handler.
+
+Usage:
+    python -m benchmarks.bench_logging [requests] [concurrency] [rounds] [collector_kb_per_s]
+
+Each mode runs the same scenario (get a document, search, list) through
+main.app, with log output going down a pipe to a separate process, as it
+does to a container's log collector; give collector_kb_per_s to make that
+process drain slowly:
+
+    sync-debug       StreamHandler, every DEBUG line written and flushed on
+                     the request's thread (what the old print() calls did)
+    queue-debug      QueueLogHandler with JSON lines, every DEBUG line
+    queue-sampled    QueueLogHandler, DEBUG sampled at 10% and capped per call site
+    queue-info       QueueLogHandler at INFO (the default configuration)
+    off              logging disabled; the baseline
+
+Per-request overhead is a mode's mean latency minus the baseline's. Modes
+are interleaved over several rounds and the median round is reported.
+"""
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_scratch = tempfile.mkdtemp(prefix="nexus-logging-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}/bench.db")
+os.environ.setdefault("TRACE_EXPORT_PATH", f"{_scratch}/traces.jsonl")
+
+from app.core.log import TEXT_FORMAT, DebugSampler, JsonFormatter, QueueLogHandler  # noqa: E402
+from app.db.models.document_model import PlaceholderDBDocument  # noqa: E402
+from app.schemas.document import DocumentCreate  # noqa: E402
+from benchmarks import load, synthetic  # noqa: E402
+
+MODES = ("sync-debug", "queue-debug", "queue-sampled", "queue-info", "off")
+DEBUG_LOGGERS = ("app.services", "app.db")
+
+
+class LineCounter:
+    """A text stream that counts the lines written through it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        self.lines += text.count("\n")
+        try:
+            return self.stream.write(text)
+        except (BrokenPipeError, ValueError):
+            # The collector of a finished mode was stopped while a write was pending
+            return 0
+
+    def flush(self) -> None:
+        try:
+            self.stream.flush()
+        except (BrokenPipeError, ValueError):
+            pass
+
+
+def install(mode: str, stream: LineCounter) -> logging.Handler:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    logging.disable(logging.CRITICAL if mode == "off" else logging.NOTSET)
+
+    if mode == "sync-debug":
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    else:
+        handler = QueueLogHandler(stream, max_queue=100_000)
+        handler.setFormatter(JsonFormatter())
+        if mode == "queue-sampled":
+            handler.addFilter(DebugSampler(sample_rate=0.1, per_second=20))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    for name in DEBUG_LOGGERS:
+        logging.getLogger(name).setLevel(logging.INFO if mode == "queue-info" else logging.DEBUG)
+    return handler
+
+
+def start_collector(kb_per_s: float) -> subprocess.Popen:
+    """A separate process draining the log pipe, at most `kb_per_s` when given"""
+    drain = (
+        "import sys, time\n"
+        f"rate = {kb_per_s} * 1024\n"
+        "for chunk in iter(lambda: sys.stdin.buffer.read1(4096), b''):\n"
+        "    if rate: time.sleep(len(chunk) / rate)\n"
+    )
+    return subprocess.Popen([sys.executable, "-c", drain], stdin=subprocess.PIPE, text=True, bufsize=1)
+
+
+async def run_mode(app, mode: str, requests: int, concurrency: int, kb_per_s: float) -> dict:
+    # The same 100 documents for every mode, so searches cost the same
+    PlaceholderDBDocument._documents_store.clear()
+    for document in synthetic.documents(100, seed=1):
+        PlaceholderDBDocument.create(None, DocumentCreate(**document))
+    document_ids = [str(doc_id) for doc_id in PlaceholderDBDocument._documents_store]
+
+    async def scenario(session: load.LoadSession, n: int):
+        await session.get("/api/v1/documents/{doc_id}", path={"doc_id": document_ids[n % len(document_ids)]})
+        await session.post("/api/v1/documents/search", json={"query": "refund", "top_k": 5})
+        await session.get("/api/v1/documents/", params={"limit": 10})
+
+    # A fresh collector per mode, so a backlog left by one mode cannot slow the next
+    collector = start_collector(kb_per_s)
+    stream = LineCounter(collector.stdin)
+    handler = install(mode, stream)
+    try:
+        result = await load.run_scenario(app, scenario, concurrency, requests, warmup=0)
+    finally:
+        logging.getLogger().removeHandler(handler)
+        if isinstance(handler, QueueLogHandler):
+            handler.close(timeout=0.5)
+        collector.kill()
+        collector.wait()
+    calls = sum(stats["requests"] for stats in result["endpoints"].values())
+    latencies = [stats["mean_ms"] * stats["requests"] for stats in result["endpoints"].values()]
+    return {
+        "mean_ms": sum(latencies) / calls,
+        "requests_per_second": calls / result["duration_seconds"],
+        "lines_per_request": stream.lines / calls,
+        "dropped": getattr(handler, "dropped", 0),
+    }
+
+
+async def run(requests: int, concurrency: int, rounds: int, kb_per_s: float):
+    from main import app
+
+    try:
+        await run_mode(app, "queue-info", requests // 4, concurrency, kb_per_s)  # warm up imports and caches
+        results = {mode: [] for mode in MODES}
+        for _ in range(rounds):
+            for mode in MODES:
+                results[mode].append(await run_mode(app, mode, requests, concurrency, kb_per_s))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    def median(mode: str, key: str) -> float:
+        return statistics.median(result[key] for result in results[mode])
+
+    baseline = median("off", "mean_ms")
+    collector_rate = f"{kb_per_s:g} KB/s" if kb_per_s else "unlimited"
+    print(f"{requests} iterations x 3 requests per mode, concurrency {concurrency}, median of {rounds} rounds, "
+          f"collector {collector_rate}, {os.cpu_count()} CPUs\n")
+    print(f"{'mode':<16} {'mean ms':>9} {'overhead us/req':>16} {'req/s':>9} {'lines/req':>10} {'dropped':>8}")
+    for mode in MODES:
+        mean = median(mode, "mean_ms")
+        print(f"{mode:<16} {mean:>9.3f} {(mean - baseline) * 1000:>16.1f} {median(mode, 'requests_per_second'):>9.1f} "
+              f"{median(mode, 'lines_per_request'):>10.2f} {max(r['dropped'] for r in results[mode]):>8}")
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 7
+    kb_per_s = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0
+    asyncio.run(run(requests, concurrency, rounds, kb_per_s))
+
+
+if __name__ == "__main__":
+    main()
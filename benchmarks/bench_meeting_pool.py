@@ -0,0 +1,63 @@
+"""
+Compare POST /call/create-meeting latency with and without the pre-warmed meeting pool,
+against FakeChimeClient with a simulated AWS round trip.
+
+Usage:
+    python -m benchmarks.bench_meeting_pool [requests] [latency_seconds]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+from app.call import call_router
+from app.call.meeting_pool import MeetingPool
+from app.core.clients import clients
+from benchmarks.fakes import FakeChimeClient
+
+
+async def measure(app, count: int) -> list:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(count):
+            started = time.perf_counter()
+            response = await client.post("/call/create-meeting", json={"agent_id": str(i)})
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+            # Leave the pool time to replenish between calls, as real traffic would
+            await asyncio.sleep(0.2)
+    return latencies
+
+
+async def run(count: int, latency: float):
+    from main import app
+
+    fake = FakeChimeClient(latency=latency)
+    clients.override("chime", fake)
+
+    call_router.meeting_pool = None
+    direct = await measure(app, count)
+
+    call_router.meeting_pool = MeetingPool(fake, size=4)
+    await call_router.meeting_pool.start()
+    while call_router.meeting_pool.available < 4:
+        await asyncio.sleep(0.01)
+    pooled = await measure(app, count)
+    await call_router.meeting_pool.stop()
+
+    for name, latencies in (("direct", direct), ("pooled", pooled)):
+        print(f"{name:>7}: median {statistics.median(latencies) * 1000:.2f} ms, "
+              f"max {max(latencies) * 1000:.2f} ms over {count} requests")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    asyncio.run(run(count, latency))
+
+
+if __name__ == "__main__":
+    main()
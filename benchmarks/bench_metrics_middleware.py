@@ -0,0 +1,136 @@
+"""
+Benchmark the per-request cost of MetricsMiddleware and check the
+multi-worker /metrics aggregation.
+
+Usage:
+    python -m benchmarks.bench_metrics_middleware [requests]
+
+Times a bare ASGI app with and without the middleware (the difference is
+the middleware's own cost), repeats that through a FastAPI app, then has
+three worker processes record requests into snapshot files and checks that
+one render adds them all up.
+"""
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry
+
+
+class _Route:
+    path = "/items/{item_id}"
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def noop_send(message):
+    pass
+
+
+async def noop_receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def time_asgi(app, requests: int) -> float:
+    """Microseconds per request, best of five rounds"""
+    rounds = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(requests):
+            await app({"type": "http", "method": "GET", "path": "/items/1"}, noop_receive, noop_send)
+        rounds.append((time.perf_counter() - started) / requests * 1e6)
+    return min(rounds)
+
+
+def build_app(registry=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    if registry is not None:
+        app.add_middleware(MetricsMiddleware, registry=registry)
+    return app
+
+
+async def time_fastapi(apps: dict, requests: int) -> dict:
+    """Median microseconds per request of each app, measured in alternating rounds"""
+    clients = {
+        name: httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        for name, app in apps.items()
+    }
+    rounds = {name: [] for name in apps}
+    for round_number in range(10):
+        for name, client in clients.items():
+            started = time.perf_counter()
+            for i in range(requests):
+                await client.get(f"/items/{i}")
+            if round_number:
+                rounds[name].append((time.perf_counter() - started) / requests * 1e6)
+    for client in clients.values():
+        await client.aclose()
+    return {name: statistics.median(timings) for name, timings in rounds.items()}
+
+
+def worker(directory: str, requests: int, in_flight: int):
+    registry = MetricsRegistry(multiproc_dir=directory)
+    for i in range(requests):
+        registry.observe("GET", "/items/{item_id}", 200 if i % 10 else 404, 0.002 * (i % 7))
+    registry.in_flight = in_flight
+    registry.write_snapshot()
+
+
+async def run(requests: int):
+    registry = MetricsRegistry()
+    bare = await time_asgi(bare_app, requests)
+    wrapped = await time_asgi(MetricsMiddleware(bare_app, registry), requests)
+    print(f"bare ASGI app: {bare:.2f} us/request, with middleware: {wrapped:.2f} us/request "
+          f"-> overhead {wrapped - bare:.2f} us")
+
+    timings = await time_fastapi({"plain": build_app(), "measured": build_app(MetricsRegistry())}, requests // 50)
+    print(f"FastAPI via httpx: {timings['plain']:.1f} us/request, with middleware: {timings['measured']:.1f} "
+          f"us/request -> overhead {timings['measured'] - timings['plain']:.1f} us (noisy)")
+
+    directory = tempfile.mkdtemp()
+    processes = [
+        multiprocessing.Process(target=worker, args=(directory, 1000 * (n + 1), n + 1)) for n in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    scraper = MetricsRegistry(multiproc_dir=directory)
+    text = scraper.render()
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 5400' in text, text
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="404"} 600' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} 6000' in text
+    # The workers have exited, so their in-flight requests no longer count
+    assert "http_requests_in_flight 0" in text
+    print(f"3 workers aggregated: 6000 requests; render took "
+          f"{min(timed(scraper.render) for _ in range(20)):.2f} ms")
+
+
+def timed(function) -> float:
+    started = time.perf_counter()
+    function()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    asyncio.run(run(requests))
+
+
+if __name__ == "__main__":
+    main()
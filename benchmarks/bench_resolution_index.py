@@ -0,0 +1,190 @@
+"""
+Benchmark the resolution recommendation index.
+
+Usage:
+    python -m benchmarks.bench_resolution_index [resolutions] [database_url]
+
+Seeds resolutions for 10 companies (4 departments each plus company-wide
+ones), loads the index, times top-5 queries built from live-call utterances
+(directly and through POST /resolutions/recommend), then changes, deletes
+and adds rows and times the incremental refresh that picks them up.
+Defaults to 20,000 resolutions in a temporary SQLite file.
+"""
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_database_url
+from app.db.models import Company, Department, Resolution
+from app.resolutions import resolution_router
+
+COMPANIES = 10
+DEPARTMENTS_PER_COMPANY = 4
+TOPICS = {
+    "refund": "refund the duplicate charge to the original card within five business days",
+    "password": "send a password reset link and verify the account email address",
+    "delivery": "check the tracking number and open a carrier investigation for the late package",
+    "router": "power cycle the router and run a line test before booking a technician",
+    "invoice": "regenerate the invoice with the corrected billing address and resend it",
+    "upgrade": "apply the plan upgrade immediately and prorate the difference on the next bill",
+    "cancel": "process the subscription cancellation and confirm the final billing date",
+    "outage": "confirm the regional outage and add the customer to the restoration notification list",
+}
+FILLER = "customer account order system note follow step team policy case agent record update confirm".split()
+UTTERANCES = [
+    ["hi I was charged twice for my order last week", "can I get a refund for the duplicate charge"],
+    ["I cannot log in to my account", "the password reset email never arrived"],
+    ["my package is late", "the tracking page has not updated in days"],
+    ["the internet keeps dropping", "I already restarted the router twice"],
+    ["there is an outage in my area", "when will service be restored"],
+]
+
+
+def resolution_text(rng, topic: str) -> str:
+    words = TOPICS[topic].split() + rng.choices(FILLER, k=rng.randint(10, 40))
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+async def seed(engine, count: int):
+    rng = random.Random(11)
+    start = datetime.utcnow() - timedelta(minutes=count + 60)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(insert(Company.__table__), [
+            {"company_id": i, "company_name": f"Company {i}", "email": f"c{i}@example.com", "field": "support", "password": "x"}
+            for i in range(1, COMPANIES + 1)
+        ])
+        await connection.execute(insert(Department.__table__), [
+            {"department_id": (i - 1) * DEPARTMENTS_PER_COMPANY + d, "company_id": i, "department_name": f"Dept {d}"}
+            for i in range(1, COMPANIES + 1) for d in range(1, DEPARTMENTS_PER_COMPANY + 1)
+        ])
+        rows = []
+        for resolution_id in range(1, count + 1):
+            company_id = resolution_id % COMPANIES + 1
+            department = rng.randint(0, DEPARTMENTS_PER_COMPANY)
+            topic = rng.choice(list(TOPICS))
+            rows.append({
+                "resolution_id": resolution_id,
+                "company_id": company_id,
+                "department_id": (company_id - 1) * DEPARTMENTS_PER_COMPANY + department if department else None,
+                "rank": round(rng.random() * 5, 2),
+                "title": f"{topic.title()} {rng.choice(FILLER)}",
+                "resolution": resolution_text(rng, topic),
+                "created_at": start,
+                "updated_at": start + timedelta(minutes=resolution_id),
+            })
+        await connection.execute(insert(Resolution.__table__), rows)
+
+
+def timed(function, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)
+
+
+def report(name: str, timings: list):
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{name:>28}: p50 {statistics.median(timings):.2f} ms, p99 {p99:.2f} ms")
+
+
+async def run(count: int, url: str):
+    engine = create_async_engine(async_database_url(url))
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    index = resolution_router.resolution_index
+    try:
+        await seed(engine, count)
+        started = time.perf_counter()
+        await index.refresh(factory)
+        print(f"indexed {len(index)} resolutions in {time.perf_counter() - started:.2f}s")
+
+        rng = random.Random(5)
+        queries = [(rng.randint(1, COMPANIES), rng.choice(UTTERANCES)) for _ in range(500)]
+        it = iter(queries * 2)
+
+        def company_query():
+            company_id, segments = next(it)
+            index.search(company_id, segments, k=5)
+
+        def department_query():
+            company_id, segments = next(it)
+            index.search(company_id, segments, department_id=(company_id - 1) * DEPARTMENTS_PER_COMPANY + 1, k=5)
+
+        report("company-wide top-5", timed(company_query, 500))
+        report("department top-5", timed(department_query, 500))
+        top = index.search(1, UTTERANCES[0], k=3)
+        print("refund call ->", [(hit["title"], hit["score"]) for hit in top])
+
+        app = FastAPI()
+        app.include_router(resolution_router.router)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            timings = []
+            for company_id, segments in queries[:300]:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/resolutions/recommend", json={"company_id": company_id, "segments": segments, "k": 5}
+                )
+                response.raise_for_status()
+                timings.append((time.perf_counter() - started) * 1000)
+            report("POST /resolutions/recommend", sorted(timings))
+
+        # Incremental refresh: edit, soft-delete and add resolutions
+        now = datetime.utcnow()
+        edited, deleted = list(range(1, 501, 10)), list(range(2, 202, 20))
+        async with engine.begin() as connection:
+            await connection.execute(
+                update(Resolution.__table__)
+                .where(Resolution.__table__.c.resolution_id.in_(edited))
+                .values(title="Chargeback dispute", resolution="open a chargeback dispute with the card issuer", updated_at=now)
+            )
+            await connection.execute(
+                update(Resolution.__table__)
+                .where(Resolution.__table__.c.resolution_id.in_(deleted))
+                .values(deleted_at=now, updated_at=now)
+            )
+            await connection.execute(insert(Resolution.__table__), [
+                {"resolution_id": count + i, "company_id": 1, "rank": 4.0, "title": "Fraud hold",
+                 "resolution": "release the fraud hold after verifying identity", "updated_at": now}
+                for i in range(1, 21)
+            ])
+        started = time.perf_counter()
+        read = await index.refresh(factory)
+        print(f"incremental refresh: {read} rows read in {(time.perf_counter() - started) * 1000:.1f} ms, "
+              f"{len(index)} resolutions indexed")
+        hits = index.search(1, ["there is a fraud hold on my card"], k=3)
+        assert hits and hits[0]["title"] == "Fraud hold", hits
+        chargebacks = {hit["resolution_id"] for hit in index.search(2, ["I want to dispute this chargeback"], k=50)}
+        assert chargebacks and chargebacks <= set(edited), chargebacks
+        live = {hit["resolution_id"] for company in range(1, COMPANIES + 1) for hit in index.search(company, list(TOPICS), k=count)}
+        assert not live & set(deleted), live & set(deleted)
+        print("edits, deletes and inserts visible after refresh")
+
+        started = time.perf_counter()
+        read = await index.refresh(factory)
+        print(f"refresh with nothing changed: {read} rows re-read in {(time.perf_counter() - started) * 1000:.1f} ms")
+    finally:
+        await engine.dispose()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    asyncio.run(run(count, url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark response encoding for large payloads: a 10k-segment transcript,
+a page of transcript search hits with context, and a document list.
+
+Usage:
+    python -m benchmarks.bench_serialization [segments] [runs]
+
+Each payload is served by two routes through FastAPI in-process: the way
+the endpoints used to return it (response_model validation or
+jsonable_encoder, then the json module) and the way they do now
+(FastJSONResponse, or RawJSONResponse for a transcript that is already
+cached as JSON). Reports the median time per request and checks that both
+routes return the same JSON. Also times segment id generation (random
+uuid4 against uuid5 from job id and index) and checks the new ids are the
+same every time a transcript is grouped.
+"""
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse, RawJSONResponse, dumps
+from app.db.models.call_transcription import TranscriptionRole
+from app.schemas.document import DocumentResponse
+from app.schemas.transcription import CallTranscriptionType
+from app.transcribe.transcribe_router import group_transcript_items
+from benchmarks import synthetic
+
+
+def transcript(segments: int) -> dict:
+    """Raw Transcribe output that groups into at least `segments` phrases"""
+    words = segments * 4
+    while True:
+        output = synthetic.transcribe_output("transcribe_bench", words=words, seed=7)
+        if len(group_transcript_items(output)[0]) >= segments:
+            return output
+        words *= 2
+
+
+def search_page(hits: int = 100, context: int = 5) -> dict:
+    started = datetime(2025, 3, 1, 9, 30)
+    results = []
+    for hit in range(hits):
+        results.append({
+            "call_transcription_id": 10_000 + hit,
+            "call_session_id": 500 + hit // 4,
+            "company_id": 1,
+            "agent_id": 40 + hit % 7,
+            "call_date": started + timedelta(minutes=hit * 13),
+            "role": TranscriptionRole.CUSTOMER if hit % 2 else TranscriptionRole.AGENT,
+            "timestamp": 12.5 * hit,
+            "rank": 1.0 / (hit + 1),
+            "snippet": "I was charged <b>twice</b> for my order last week",
+            "context": [
+                {
+                    "call_transcription_id": 10_000 + hit + offset,
+                    "role": TranscriptionRole.AGENT,
+                    "timestamp": 12.5 * hit + offset,
+                    "transcription": synthetic.AGENT_LINES[(hit + offset) % len(synthetic.AGENT_LINES)],
+                    "match": offset == 0,
+                }
+                for offset in range(-context, context + 1)
+            ],
+        })
+    return {"query": "charged twice", "results": results, "took_ms": 3.2}
+
+
+def documents(count: int = 100) -> List[DocumentResponse]:
+    return [
+        DocumentResponse(id=uuid.UUID(int=index + 1), **document)
+        for index, document in enumerate(synthetic.documents(count, seed=3))
+    ]
+
+
+def build_app(segments: List[dict], cached: str, search: dict, docs: List[DocumentResponse]) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/before/transcript", response_model=List[CallTranscriptionType], response_class=JSONResponse)
+    async def transcript_before():
+        return segments
+
+    @app.get("/after/transcript")
+    async def transcript_after():
+        return FastJSONResponse(segments)
+
+    @app.get("/before/cached-transcript", response_model=List[CallTranscriptionType], response_class=JSONResponse)
+    async def cached_before():
+        return json.loads(cached)
+
+    @app.get("/after/cached-transcript")
+    async def cached_after():
+        return RawJSONResponse(cached)
+
+    @app.get("/before/search", response_class=JSONResponse)
+    async def search_before():
+        return search
+
+    @app.get("/after/search")
+    async def search_after():
+        return FastJSONResponse(search)
+
+    @app.get("/before/documents", response_model=List[DocumentResponse], response_class=JSONResponse)
+    async def documents_before():
+        return docs
+
+    @app.get("/after/documents")
+    async def documents_after():
+        return FastJSONResponse(docs)
+
+    return app
+
+
+async def time_routes(app: FastAPI, names: List[str], runs: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    timings = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in names:
+            before = await client.get(f"/before/{name}")
+            after = await client.get(f"/after/{name}")
+            assert before.status_code == after.status_code == 200, (before.status_code, after.status_code)
+            assert before.json() == after.json(), f"{name}: responses differ"
+            samples = {"before": [], "after": []}
+            # Alternate so drift in machine load hits both sides alike
+            for _ in range(runs):
+                for side in samples:
+                    started = time.perf_counter()
+                    response = await client.get(f"/{side}/{name}")
+                    samples[side].append(time.perf_counter() - started)
+            timings[name] = {
+                "bytes": len(after.content),
+                **{side: statistics.median(values) for side, values in samples.items()},
+            }
+    return timings
+
+
+def time_ids(output: dict, rounds: int = 5) -> tuple:
+    def best(job_id):
+        times = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            group_transcript_items(output, job_id)
+            times.append(time.perf_counter() - started)
+        return min(times)
+
+    first = [segment["id"] for segment in group_transcript_items(output, "transcribe_bench")[0]]
+    again = [segment["id"] for segment in group_transcript_items(output, "transcribe_bench")[0]]
+    assert first == again, "segment ids changed between groupings"
+    assert len(set(first)) == len(first), "duplicate segment ids"
+    return best(None), best("transcribe_bench"), len(first)
+
+
+def main():
+    segments_wanted = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    output = transcript(segments_wanted)
+    random_ids, derived_ids, grouped = time_ids(output)
+    print(f"grouping {grouped} segments: uuid4 ids {random_ids * 1000:.1f} ms, "
+          f"uuid5(job_id, index) ids {derived_ids * 1000:.1f} ms (stable across groupings)\n")
+
+    segments = group_transcript_items(output, "transcribe_bench")[0][:segments_wanted]
+    cached = dumps(segments).decode()
+    app = build_app(segments, cached, search_page(), documents())
+    timings = asyncio.run(time_routes(app, ["transcript", "cached-transcript", "search", "documents"], runs))
+
+    print(f"{'payload':<20} {'KB':>8} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name, result in timings.items():
+        print(f"{name:<20} {result['bytes'] / 1024:>8.0f} {result['before'] * 1000:>10.2f} "
+              f"{result['after'] * 1000:>10.2f} {result['before'] / result['after']:>7.1f}x")
+    print(f"\n{len(segments)} transcript segments; median of {runs} requests per route; responses identical")
+
+
+if __name__ == "__main__":
+    main()
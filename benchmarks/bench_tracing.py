@@ -0,0 +1,220 @@
+"""
+Benchmark outbound-call tracing and show a request waterfall.
+
+Usage:
+    python -m benchmarks.bench_tracing [requests]
+
+Starts a local stand-in for Transcribe, S3, CloudFront, the OpenAI
+Assistants API and an OTLP/HTTP collector (each answering after a fixed
+delay), then calls an endpoint that makes the same outbound calls as
+/transcribe/helper with instrumented clients. Prints one request's
+waterfall from /traces/{trace_id}, the outbound series of /metrics, what
+reached the JSONL file and the collector, and the cost of a span.
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+import httpx
+import requests
+from botocore.config import Config
+from botocore.stub import Stubber
+from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from openai import DefaultHttpxClient, OpenAI
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry
+from app.core.tracing import TraceExporter, TracingMiddleware, tracer
+from app.traces import trace_router
+
+DELAYS = {"transcribe": 0.02, "s3": 0.01, "cloudfront": 0.03, "openai": 0.015}
+TRANSCRIPT = {"results": {"items": [
+    {"type": "pronunciation", "start_time": "0.1", "speaker_label": "spk_0", "alternatives": [{"content": "hello"}]}
+]}}
+collected = []
+
+
+class FakeServices(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body, status=200, headers=None, delay=0.0):
+        time.sleep(delay)
+        payload = json.dumps(body).encode() if not isinstance(body, bytes) else body
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_GET(self):
+        if self.path.startswith("/transcriptions/"):
+            self._reply(TRANSCRIPT, delay=DELAYS["cloudfront"])
+        elif self.path.startswith("/v1/threads/") and "/runs/" in self.path:
+            self._reply({"id": "run_1", "object": "thread.run", "status": "completed"}, delay=DELAYS["openai"])
+        elif self.path.startswith("/v1/threads/") and self.path.endswith("/messages"):
+            self._reply({"object": "list", "data": [{
+                "id": "msg_2", "object": "thread.message", "role": "assistant",
+                "content": [{"type": "text", "text": {"value": "Offer a refund", "annotations": []}}]
+            }]}, delay=DELAYS["openai"])
+        else:
+            self._reply({"error": "not found"}, status=404)
+
+    def do_PUT(self):
+        self._body()
+        self._reply(b"", headers={"ETag": '"etag"'}, delay=DELAYS["s3"])
+
+    def do_POST(self):
+        body = self._body()
+        if self.path == "/v1/traces":
+            collected.append(json.loads(body))
+            self._reply({})
+        elif self.headers.get("X-Amz-Target", "").endswith("GetTranscriptionJob"):
+            self._reply(
+                {"TranscriptionJob": {"TranscriptionJobName": "job", "TranscriptionJobStatus": "COMPLETED"}},
+                headers={"Content-Type": "application/x-amz-json-1.1"},
+                delay=DELAYS["transcribe"]
+            )
+        elif self.path == "/v1/threads":
+            self._reply({"id": "thread_abc", "object": "thread", "created_at": 0, "metadata": {}}, delay=DELAYS["openai"])
+        elif self.path.endswith("/messages"):
+            self._reply({"id": "msg_1", "object": "thread.message", "role": "user", "content": []}, delay=DELAYS["openai"])
+        elif self.path.endswith("/runs"):
+            self._reply({"id": "run_1", "object": "thread.run", "status": "queued"}, delay=DELAYS["openai"])
+        else:
+            self._reply({"error": "not found"}, status=404)
+
+
+def build_app(base_url: str) -> FastAPI:
+    options = dict(aws_access_key_id="x", aws_secret_access_key="x", region_name="ap-southeast-1", endpoint_url=base_url)
+    transcribe = tracer.instrument_boto3(boto3.client("transcribe", **options))
+    s3 = tracer.instrument_boto3(boto3.client("s3", config=Config(s3={"addressing_style": "path"}), **options))
+    openai = OpenAI(
+        api_key="x",
+        base_url=f"{base_url}/v1",
+        http_client=DefaultHttpxClient(event_hooks=tracer.httpx_event_hooks("openai"))
+    )
+
+    def helper_calls(job_id: str) -> str:
+        transcribe.get_transcription_job(TranscriptionJobName=job_id)
+        s3.put_object(Bucket="bench", Key=f"notes/{job_id}.txt", Body=b"x" * 2048)
+        with tracer.span("cloudfront", "GET transcript") as span:
+            response = requests.get(f"{base_url}/transcriptions/{job_id}.json", timeout=10)
+            span.bytes_received = len(response.content)
+        thread = openai.beta.threads.create()
+        openai.beta.threads.messages.create(thread_id=thread.id, role="user", content="spk_0 - hello")
+        run = openai.beta.threads.runs.create(thread_id=thread.id, assistant_id="asst_bench")
+        openai.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
+        messages = openai.beta.threads.messages.list(thread_id=thread.id)
+        return messages.data[0].content[0].text.value
+
+    app = FastAPI()
+    registry = MetricsRegistry()
+    app.state.registry = registry
+
+    @app.get("/helper/{job_id}")
+    async def helper(job_id: str):
+        return {"assistant_response": await run_in_threadpool(helper_calls, job_id)}
+
+    app.include_router(trace_router.router)
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    return app
+
+
+def span_cost(rounds: int = 100000) -> float:
+    """Microseconds per span: an empty `with tracer.span(...)` block"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        with tracer.span("bench", "noop"):
+            pass
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def boto3_hook_cost(rounds: int = 2000) -> float:
+    """Microseconds the event hooks add to a (stubbed, network-free) boto3 call, median of alternating rounds"""
+    options = dict(aws_access_key_id="x", aws_secret_access_key="x", region_name="ap-southeast-1")
+    clients = [boto3.client("transcribe", **options), tracer.instrument_boto3(boto3.client("transcribe", **options))]
+    timings = [[], []]
+    for round_number in range(6):
+        for position, client in enumerate(clients):
+            with Stubber(client) as stubber:
+                for _ in range(rounds):
+                    stubber.add_response("get_transcription_job", {"TranscriptionJob": {"TranscriptionJobName": "job"}})
+                started = time.perf_counter()
+                for _ in range(rounds):
+                    client.get_transcription_job(TranscriptionJobName="job")
+                if round_number:
+                    timings[position].append((time.perf_counter() - started) / rounds * 1e6)
+    return statistics.median(timings[1]) - statistics.median(timings[0])
+
+
+async def run(count: int):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeServices)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    export_path = os.path.join(tempfile.mkdtemp(), "traces.jsonl")
+    tracer.exporter = TraceExporter(path=export_path, otlp_endpoint=f"{base_url}/v1/traces")
+    app = build_app(base_url)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30) as client:
+        trace_ids, timings = [], []
+        for i in range(count):
+            started = time.perf_counter()
+            response = await client.get(f"/helper/job_{i}")
+            response.raise_for_status()
+            timings.append((time.perf_counter() - started) * 1000)
+            trace_ids.append(response.headers["x-trace-id"])
+        print(f"{count} helper requests, median {sorted(timings)[count // 2]:.1f} ms")
+
+        waterfall = (await client.get(f"/traces/{trace_ids[-1]}")).json()
+        print(f"trace {waterfall['trace_id']}: {waterfall['duration_ms']} ms, "
+              f"{waterfall['spans']} outbound calls, {waterfall['outbound_ms']} ms outbound")
+        for span in waterfall["waterfall"]:
+            print(f"  {span['bar']} {span['offset_ms']:>7.1f} +{span['duration_ms']:>6.1f} ms "
+                  f"{span['dependency']:<10} {span['operation']}")
+        print("by dependency (ms):", waterfall["by_dependency_ms"])
+        listed = (await client.get("/traces/", params={"route": "/helper/{job_id}"})).json()["traces"]
+        assert len(listed) == count, len(listed)
+
+    text = tracer.registry.render()
+    print("\n".join(
+        line for line in text.splitlines()
+        if line.startswith(("outbound_request_duration_seconds_count", "outbound_request_sent_bytes"))
+    ))
+    assert 'outbound_request_sent_bytes_total{dependency="s3",operation="PutObject"} ' + str(2048 * count) in text
+
+    tracer.exporter.close()
+    with open(export_path) as file:
+        exported = [json.loads(line) for line in file]
+    spans = [span for payload in collected for resource in payload["resourceSpans"] for span in resource["scopeSpans"][0]["spans"]]
+    assert len(exported) == count, len(exported)
+    assert len(spans) == count * (1 + waterfall["spans"]), len(spans)
+    print(f"exported {len(exported)} traces to {export_path}; collector received {len(spans)} spans")
+
+    print(f"span overhead: {span_cost():.2f} us; boto3 hook overhead: {boto3_hook_cost():.1f} us per call")
+    server.shutdown()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    asyncio.run(run(count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark transcript partitioning and archival.
+
+Usage:
+    python -m benchmarks.bench_transcript_archival [calls_per_month] [database_url]
+
+Seeds 18 months of calls (100 segments each), then on Postgres converts
+calltranscription to monthly partitions and shows which partitions a
+transcript read scans. Every month older than the hot window is archived to
+Parquet, and transcripts are read back from both the database and the archive
+and compared with what was stored. Defaults to a temporary SQLite file.
+Needs pyarrow.
+"""
+import asyncio
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_database_url
+from app.db.archival import TranscriptArchiveStore, archive_month, cold_months
+from app.db.models import CallSession, CallTranscription, Company, TranscriptionRole
+from app.db.partitioning import add_months, convert_to_partitioned, is_partitioned
+from app.repositories.transcript_repository import TranscriptRepository
+
+MONTHS = 18
+HOT_MONTHS = 12
+SEGMENTS_PER_CALL = 100
+PARTITION = re.compile(r"\bcalltranscription_(?:y\d{4}m\d{2}|default)\b(?!_)")
+
+
+def seed(engine, calls_per_month: int) -> dict:
+    """Returns {month: [call_session_id, ...]}"""
+    first = add_months(date.today().replace(day=1), -(MONTHS - 1))
+    calls = {}
+    call_session_id = 0
+    with engine.begin() as connection:
+        SQLModel.metadata.create_all(connection)
+        connection.execute(insert(Company.__table__).values(
+            company_id=1, company_name="Company", email="c@example.com", field="support", password="x"
+        ))
+        for offset in range(MONTHS):
+            month = add_months(first, offset)
+            calls[month] = []
+            for call in range(calls_per_month):
+                call_session_id += 1
+                created_at = datetime(month.year, month.month, 1) + timedelta(hours=call % 600)
+                connection.execute(insert(CallSession.__table__).values(
+                    call_session_id=call_session_id, company_id=1, created_at=created_at, updated_at=created_at
+                ))
+                connection.execute(insert(CallTranscription.__table__), [
+                    {
+                        "call_session_id": call_session_id,
+                        "timestamp": timedelta(seconds=segment * 7),
+                        "transcription": f"segment {segment} of call {call_session_id}",
+                        "role": TranscriptionRole.AGENT if segment % 2 == 0 else TranscriptionRole.CUSTOMER,
+                        "call_file": f"transcriptions/bench_{call_session_id}.json",
+                        "created_at": created_at + timedelta(seconds=segment),
+                        "updated_at": created_at,
+                    }
+                    for segment in range(SEGMENTS_PER_CALL)
+                ])
+                calls[month].append(call_session_id)
+    return calls
+
+
+async def read_transcripts(async_engine, store, call_ids) -> dict:
+    transcripts, timings = {}, []
+    async with AsyncSession(async_engine) as session:
+        repository = TranscriptRepository(session, store)
+        for call_session_id in call_ids:
+            started = time.perf_counter()
+            transcripts[call_session_id] = await repository.call_transcript(call_session_id)
+            timings.append((time.perf_counter() - started) * 1000)
+    return {"transcripts": transcripts, "median_ms": statistics.median(timings)}
+
+
+def scanned_partitions(engine, call_session_id: int) -> list:
+    with engine.connect() as connection:
+        created_at = connection.execute(
+            select(CallSession.__table__.c.created_at)
+            .where(CallSession.__table__.c.call_session_id == call_session_id)
+        ).scalar()
+        plan = connection.execute(
+            text(
+                "EXPLAIN SELECT * FROM calltranscription "
+                "WHERE call_session_id = :call_session_id AND created_at >= :created_at"
+            ),
+            {"call_session_id": call_session_id, "created_at": created_at}
+        ).scalars().all()
+    return sorted({name for line in plan for name in PARTITION.findall(line)})
+
+
+async def run(calls_per_month: int, url: str):
+    engine = create_engine(url)
+    async_engine = create_async_engine(async_database_url(url))
+    store = TranscriptArchiveStore(tempfile.mkdtemp())
+    try:
+        started = time.perf_counter()
+        calls = seed(engine, calls_per_month)
+        months = sorted(calls)
+        print(f"seeded {len(months)} months x {calls_per_month} calls x {SEGMENTS_PER_CALL} segments "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        if engine.dialect.name == "postgresql":
+            started = time.perf_counter()
+            with engine.begin() as connection:
+                created = convert_to_partitioned(connection, months_ahead=3)
+            print(f"partitioned into {len(created)} months in {time.perf_counter() - started:.1f}s")
+            recent = calls[months[-1]][0]
+            print(f"transcript read for a current call scans: {scanned_partitions(engine, recent)}")
+
+        sample = [ids[len(ids) // 2] for ids in calls.values()]
+        before = await read_transcripts(async_engine, store, sample)
+        print(f"read {len(sample)} transcripts from the database: median {before['median_ms']:.1f} ms")
+
+        with engine.connect() as connection:
+            cold = cold_months(connection, HOT_MONTHS)
+        started = time.perf_counter()
+        archived_rows = 0
+        for month in cold:
+            result = archive_month(engine, month, store)
+            archived_rows += result["archived_rows"]
+        size = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(store.directory) for name in names
+        )
+        print(f"archived {len(cold)} months ({archived_rows} segments, {size / 1e6:.1f} MB Parquet) "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        with engine.connect() as connection:
+            remaining = connection.execute(select(func.count()).select_from(CallTranscription.__table__)).scalar()
+            partitioned = is_partitioned(connection)
+        print(f"{remaining} segments left in the database (partitioned: {partitioned})")
+
+        after = await read_transcripts(async_engine, store, sample)
+        archived_calls = [call_id for call_id in sample if after["transcripts"][call_id]["archived"]]
+        hot_calls = [call_id for call_id in sample if call_id not in archived_calls]
+        print(f"read {len(sample)} transcripts after archival: median {after['median_ms']:.1f} ms "
+              f"({len(archived_calls)} from Parquet, {len(hot_calls)} from the database)")
+        for call_id in sample:
+            if before["transcripts"][call_id]["segments"] != after["transcripts"][call_id]["segments"]:
+                raise AssertionError(f"Transcript of call {call_id} changed after archival")
+        print("transcripts identical before and after archival")
+    finally:
+        await async_engine.dispose()
+        engine.dispose()
+
+
+def main():
+    calls_per_month = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    asyncio.run(run(calls_per_month, url))
+
+
+if __name__ == "__main__":
+    main()
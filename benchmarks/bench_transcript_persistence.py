@@ -0,0 +1,62 @@
+"""
+Benchmark bulk persistence of grouped transcript segments into CallTranscription.
+
+Usage:
+    python -m benchmarks.bench_transcript_persistence [segments] [database_url]
+
+Defaults to 5,000 segments against a temporary SQLite file.
+"""
+import asyncio
+import sys
+import tempfile
+import time
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_database_url
+from app.db.models import CallSession, CallTranscription
+from app.services.transcript_persistence_service import TranscriptPersistenceService
+
+
+async def run(count: int, url: str):
+    engine = create_async_engine(async_database_url(url))
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        session_id = (await connection.execute(
+            insert(CallSession.__table__).values(status=None)
+        )).inserted_primary_key[0]
+
+    segments = [
+        {"id": str(i), "timestamp": "", "agent_name": f"spk_{i % 2}", "content": f"segment {i} " * 6}
+        for i in range(count)
+    ]
+    starts = [i * 1.7 for i in range(count)]
+
+    for run_number in range(3):
+        async with AsyncSession(engine) as session:
+            started = time.perf_counter()
+            written = await TranscriptPersistenceService(session).persist_job_segments(
+                session_id, "transcribe_bench", segments, starts
+            )
+            elapsed = time.perf_counter() - started
+        print(f"run {run_number}: {written} segments in {elapsed * 1000:.1f} ms")
+
+    async with engine.connect() as connection:
+        stored = (await connection.execute(
+            select(func.count()).select_from(CallTranscription.__table__)
+        )).scalar()
+    print(f"rows stored after repeated runs: {stored} (idempotent: {stored == count})")
+    await engine.dispose()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    asyncio.run(run(count, url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark full-text transcript search.
+
+Usage:
+    python -m benchmarks.bench_transcript_search [segments] [database_url]
+
+Defaults to 200,000 segments in a temporary SQLite file (FTS5). Pass a
+postgresql:// URL to benchmark the tsvector/GIN backend instead.
+"""
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import async_database_url
+from app.db.models import Agent, CallSession, CallTranscription, Company, TranscriptionRole
+from app.search.transcript_index import create_transcript_search_index
+from app.services.transcript_search_service import TranscriptSearchFilters, TranscriptSearchService
+
+SEGMENTS_PER_CALL = 100
+VOCABULARY = (
+    "account billing card charge refund order delivery package tracking password reset login "
+    "issue problem thanks please help check moment system update payment invoice plan upgrade "
+    "cancel subscription router internet connection slow outage technician appointment schedule"
+).split()
+RARE = ["error 504", "gateway timeout", "chargeback dispute", "fraudulent transaction"]
+
+
+async def seed(engine, count: int):
+    rng = random.Random(3)
+    calls = max(count // SEGMENTS_PER_CALL, 1)
+    start = datetime(2025, 1, 1)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+        await connection.execute(insert(Company.__table__), [
+            {"company_id": i, "company_name": f"Company {i}", "email": f"c{i}@example.com", "field": "support", "password": "x"}
+            for i in range(1, 6)
+        ])
+        await connection.execute(insert(Agent.__table__), [
+            {"agent_id": i, "company_id": i % 5 + 1, "agent_name": f"Agent {i}", "email": f"a{i}@example.com", "password": "x"}
+            for i in range(1, 41)
+        ])
+        await connection.execute(insert(CallSession.__table__), [
+            {
+                "call_session_id": i,
+                "company_id": i % 5 + 1,
+                "agent_id": i % 40 + 1,
+                "created_at": start + timedelta(hours=i),
+                "updated_at": start,
+            }
+            for i in range(1, calls + 1)
+        ])
+        for call in range(1, calls + 1):
+            rows = []
+            for segment in range(SEGMENTS_PER_CALL):
+                words = rng.choices(VOCABULARY, k=rng.randint(6, 25))
+                if rng.random() < 0.002:
+                    words.insert(rng.randrange(len(words)), rng.choice(RARE))
+                rows.append({
+                    "call_session_id": call,
+                    "timestamp": timedelta(seconds=segment * 7),
+                    "transcription": " ".join(words),
+                    "role": TranscriptionRole.AGENT if segment % 2 == 0 else TranscriptionRole.CUSTOMER,
+                    "call_file": f"transcriptions/bench_{call}.json",
+                    "created_at": start,
+                    "updated_at": start,
+                })
+            await connection.execute(insert(CallTranscription.__table__), rows)
+
+
+async def run(count: int, url: str):
+    engine = create_async_engine(async_database_url(url))
+    await seed(engine, count)
+    started = time.perf_counter()
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.run_sync(create_transcript_search_index)
+    print(f"indexed {count} segments in {time.perf_counter() - started:.1f}s")
+
+    cases = {
+        "rare word": ("504", TranscriptSearchFilters()),
+        "rare phrase": ('"gateway timeout"', TranscriptSearchFilters()),
+        "phrase + company + role": ('"chargeback dispute"', TranscriptSearchFilters(company_id=2, role=TranscriptionRole.CUSTOMER)),
+        "word + agent + dates": ("refund", TranscriptSearchFilters(agent_id=7, start=datetime(2025, 1, 10), end=datetime(2025, 3, 1))),
+        "two common words": ("billing refund", TranscriptSearchFilters()),
+    }
+    async with AsyncSession(engine) as session:
+        service = TranscriptSearchService(session)
+        for name, (query, filters) in cases.items():
+            timings = []
+            for _ in range(7):
+                started = time.perf_counter()
+                results = await service.search(query, filters, limit=20)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"{name:>24}: {len(results):>2} hits, median {statistics.median(timings):.1f} ms")
+        example = (await service.search("504", limit=1, context=1))[0]
+        print(example["snippet"], [segment["transcription"][:40] for segment in example["context"]])
+    await engine.dispose()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    asyncio.run(run(count, url))
+
+
+if __name__ == "__main__":
+    main()
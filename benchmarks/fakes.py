@@ -0,0 +1,282 @@
+"""
+In-process stand-ins for the external services the API talks to.
+
+Each fake sleeps for `latency` seconds per call to mimic a network round trip.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+import requests
+
+from benchmarks import synthetic
+
+
+def use_fake_settings() -> None:
+    """
+    Set the settings the app checks before it calls a service the fakes stand
+    in for (uploads are refused without AWS_BUCKET_NAME). Call it before
+    importing app modules; real values in the environment are kept.
+    """
+    os.environ.setdefault("AWS_BUCKET_NAME", "benchmark")
+
+
+class _FakeService:
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class FakeChimeClient(_FakeService):
+    """Subset of the boto3 chime-sdk-meetings client used by app.call."""
+
+    def __init__(self, latency: float = 0.05):
+        super().__init__(latency)
+        self.meetings = {}
+
+    def create_meeting(self, ClientRequestToken, MediaRegion, ExternalMeetingId, **kwargs):
+        self._round_trip()
+        meeting_id = str(uuid.uuid4())
+        meeting = {
+            "MeetingId": meeting_id,
+            "ExternalMeetingId": ExternalMeetingId,
+            "MediaRegion": MediaRegion,
+            "MediaPlacement": {"AudioHostUrl": f"{meeting_id}.k.m1.ap.app.chime.aws:3478"},
+        }
+        self.meetings[meeting_id] = meeting
+        return {"Meeting": meeting}
+
+    def _attendee(self, external_user_id):
+        return {
+            "ExternalUserId": external_user_id,
+            "AttendeeId": str(uuid.uuid4()),
+            "JoinToken": uuid.uuid4().hex,
+        }
+
+    def create_attendee(self, MeetingId, ExternalUserId, **kwargs):
+        self._round_trip()
+        return {"Attendee": self._attendee(ExternalUserId)}
+
+    def batch_create_attendee(self, MeetingId, Attendees, **kwargs):
+        self._round_trip()
+        return {
+            "Attendees": [self._attendee(attendee["ExternalUserId"]) for attendee in Attendees],
+            "Errors": [],
+        }
+
+    def delete_meeting(self, MeetingId):
+        self._round_trip()
+        self.meetings.pop(MeetingId, None)
+
+
+class FakeTranscribeClient(_FakeService):
+    """
+    Subset of the boto3 transcribe client used by app.transcribe.
+
+    Jobs it has not seen are reported COMPLETED, so any job id can be read
+    back; started jobs stay IN_PROGRESS for `in_progress_polls` status checks.
+    Listings page through started jobs newest first, like the real API.
+    """
+
+    class exceptions:
+        class BadRequestException(Exception):
+            pass
+
+    def __init__(self, latency: float = 0.05, in_progress_polls: int = 0):
+        super().__init__(latency)
+        self.in_progress_polls = in_progress_polls
+        self.jobs = {}
+        self.created = {}
+
+    def _job(self, name: str) -> dict:
+        polls = self.jobs.get(name)
+        status = "IN_PROGRESS" if polls is not None and polls < self.in_progress_polls else "COMPLETED"
+        if polls is not None:
+            self.jobs[name] = polls + 1
+        return {
+            "TranscriptionJobName": name,
+            "TranscriptionJobStatus": status,
+            "CreationTime": self.created.get(name, datetime.now(timezone.utc)),
+        }
+
+    def start_transcription_job(self, TranscriptionJobName, **kwargs):
+        self._round_trip()
+        self.jobs[TranscriptionJobName] = 0
+        self.created[TranscriptionJobName] = datetime.now(timezone.utc)
+        return {
+            "TranscriptionJob": {
+                "TranscriptionJobName": TranscriptionJobName,
+                "TranscriptionJobStatus": "IN_PROGRESS",
+                "CreationTime": self.created[TranscriptionJobName],
+            }
+        }
+
+    def get_transcription_job(self, TranscriptionJobName):
+        self._round_trip()
+        return {"TranscriptionJob": self._job(TranscriptionJobName)}
+
+    def list_transcription_jobs(self, MaxResults=100, NextToken=None, **kwargs):
+        self._round_trip()
+        start = int(NextToken or 0)
+        names = list(reversed(self.jobs))[start:start + MaxResults]
+        page = {"TranscriptionJobSummaries": [self._job(name) for name in names]}
+        if start + MaxResults < len(self.jobs):
+            page["NextToken"] = str(start + MaxResults)
+        return page
+
+
+class FakeS3Client(_FakeService):
+    """Subset of the boto3 s3 client used by the multipart uploader; keeps object sizes, not content."""
+
+    def __init__(self, latency: float = 0.05):
+        super().__init__(latency)
+        self.objects = {}
+        self._uploads = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self._round_trip()
+        self.objects[(Bucket, Key)] = len(Body)
+        return {"ETag": f'"{uuid.uuid4().hex}"'}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self._round_trip()
+        upload_id = uuid.uuid4().hex
+        self._uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, **kwargs):
+        self._round_trip()
+        self._uploads[UploadId][PartNumber] = len(Body)
+        return {"ETag": f'"{uuid.uuid4().hex}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload, **kwargs):
+        self._round_trip()
+        self.objects[(Bucket, Key)] = sum(self._uploads.pop(UploadId).values())
+        return {"Bucket": Bucket, "Key": Key}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId, **kwargs):
+        self._round_trip()
+        self._uploads.pop(UploadId, None)
+
+    def delete_object(self, Bucket, Key, **kwargs):
+        self._round_trip()
+        self.objects.pop((Bucket, Key), None)
+
+
+class FakeResponse:
+    """The parts of requests.Response the transcript download uses."""
+
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error", response=self)
+
+
+class FakeCloudFront(_FakeService):
+    """
+    Serves Transcribe output for /transcriptions/<job>.json in place of
+    requests.get. Transcripts are synthetic, `words` long and deterministic
+    per job, and cached once generated, as the CDN would.
+    """
+
+    def __init__(self, latency: float = 0.05, words: int = 1000, transcript: Optional[Callable[[str], dict]] = None):
+        super().__init__(latency)
+        self.words = words
+        self.transcript = transcript or (lambda job_id: synthetic.transcribe_output(job_id, words=self.words))
+        self._cache = {}
+
+    def get(self, url: str, timeout: Optional[float] = None, **kwargs) -> FakeResponse:
+        self._round_trip()
+        name = url.rsplit("/", 1)[-1]
+        if not name.endswith(".json"):
+            return FakeResponse(b"", status_code=404)
+        job_id = name[:-len(".json")]
+        body = self._cache.get(job_id)
+        if body is None:
+            body = self._cache[job_id] = json.dumps(self.transcript(job_id)).encode()
+        return FakeResponse(body)
+
+
+class FakeOpenAI(_FakeService):
+    """
+    Subset of the OpenAI client used by app.transcribe: client.beta.threads
+    with messages and runs. Runs stay "in_progress" for `run_polls` retrieves.
+    """
+
+    def __init__(self, latency: float = 0.05, run_polls: int = 0, reply: str = "Offer a refund for the duplicate charge."):
+        super().__init__(latency)
+        self.run_polls = run_polls
+        self.reply = reply
+        self.threads = {}
+        self._runs = {}
+        self._ids = itertools.count(1)
+        threads = SimpleNamespace(
+            create=self._create_thread,
+            messages=SimpleNamespace(create=self._create_message, list=self._list_messages),
+            runs=SimpleNamespace(create=self._create_run, retrieve=self._retrieve_run, cancel=self._cancel_run),
+        )
+        self.beta = SimpleNamespace(threads=threads)
+
+    def _id(self, prefix: str) -> str:
+        return f"{prefix}_{next(self._ids):08d}"
+
+    def _message(self, thread_id: str, role: str, content: str):
+        text = SimpleNamespace(type="text", text=SimpleNamespace(value=content, annotations=[]))
+        return SimpleNamespace(id=self._id("msg"), object="thread.message", thread_id=thread_id, role=role, content=[text])
+
+    def _create_thread(self, **kwargs):
+        self._round_trip()
+        thread_id = self._id("thread")
+        self.threads[thread_id] = []
+        return SimpleNamespace(id=thread_id, object="thread")
+
+    def _create_message(self, thread_id: str, role: str, content: str, **kwargs):
+        self._round_trip()
+        message = self._message(thread_id, role, content)
+        self.threads[thread_id].append(message)
+        return message
+
+    def _create_run(self, thread_id: str, assistant_id: str, **kwargs):
+        self._round_trip()
+        run_id = self._id("run")
+        self._runs[run_id] = 0
+        return SimpleNamespace(id=run_id, object="thread.run", thread_id=thread_id, status="queued", last_error=None)
+
+    def _retrieve_run(self, thread_id: str, run_id: str):
+        self._round_trip()
+        polls = self._runs[run_id]
+        self._runs[run_id] = polls + 1
+        if polls < self.run_polls:
+            return SimpleNamespace(id=run_id, status="in_progress", last_error=None)
+        messages = self.threads[thread_id]
+        if not messages or messages[-1].role != "assistant":
+            messages.append(self._message(thread_id, "assistant", self.reply))
+        return SimpleNamespace(id=run_id, status="completed", last_error=None)
+
+    def _cancel_run(self, thread_id: str, run_id: str):
+        self._round_trip()
+        return SimpleNamespace(id=run_id, status="cancelling", last_error=None)
+
+    def _list_messages(self, thread_id: str, **kwargs):
+        self._round_trip()
+        # Newest first, like the API
+        return SimpleNamespace(object="list", data=list(reversed(self.threads[thread_id])))
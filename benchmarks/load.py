@@ -0,0 +1,243 @@
+"""
+Fixed-concurrency load runner for the ASGI app, with JSON results that can
+be compared between commits.
+
+Usage:
+    python -m benchmarks.load <baseline.json> <candidate.json> [threshold_percent]
+
+Scenarios (see bench_load.py) are async functions taking a LoadSession and a
+request number. They make their requests through the session, which records
+each one under "<METHOD> <path template>" so per-endpoint p50/p95/p99 and
+requests/sec come out even when one scenario calls several endpoints.
+
+The app runs in-process through httpx.ASGITransport, on the same event loop
+as the load generator, so anything that blocks the loop shows up as latency.
+"""
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, seconds: float) -> dict:
+        ordered = sorted(self.latencies)
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "requests_per_second": round(len(ordered) / seconds, 2) if seconds else 0.0,
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        }
+
+
+class LoadSession:
+    """An httpx client that times every request by endpoint"""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.recording = True
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    async def request(self, method: str, template: str, expect: tuple = (200,), **kwargs) -> httpx.Response:
+        """
+        Send `method` to `template` formatted with `path` (a dict of path
+        parameters); other keyword arguments go to httpx. Statuses outside
+        `expect` and transport errors count as errors.
+        """
+        url = template.format(**kwargs.pop("path", {}))
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception:
+            self._record(method, template, time.perf_counter() - started, error=True)
+            raise
+        self._record(method, template, time.perf_counter() - started, error=response.status_code not in expect)
+        return response
+
+    def _record(self, method: str, template: str, seconds: float, error: bool) -> None:
+        if not self.recording:
+            return
+        stats = self.endpoints.setdefault(f"{method} {template}", EndpointStats())
+        stats.latencies.append(seconds)
+        stats.errors += error
+
+    async def get(self, template: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", template, **kwargs)
+
+    async def post(self, template: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", template, **kwargs)
+
+
+Scenario = Callable[[LoadSession, int], Awaitable[None]]
+
+
+async def run_scenario(
+        app,
+        scenario: Scenario,
+        concurrency: int,
+        requests: int,
+        warmup: int = 0
+) -> dict:
+    """
+    Run `requests` iterations of `scenario` with `concurrency` of them in
+    flight at any time, after `warmup` unrecorded iterations. Failed
+    iterations are counted, not raised.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        session = LoadSession(client)
+        failures: List[str] = []
+
+        async def drive(numbers: List[int]):
+            position = 0
+
+            async def worker():
+                nonlocal position
+                while position < len(numbers):
+                    number = numbers[position]
+                    position += 1
+                    try:
+                        await scenario(session, number)
+                    except Exception as e:
+                        failures.append(f"{type(e).__name__}: {e}")
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        session.recording = False
+        await drive(list(range(warmup)))
+        failures.clear()
+        session.recording = True
+        started = time.perf_counter()
+        await drive(list(range(warmup, warmup + requests)))
+        seconds = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "iterations": requests,
+        "failed_iterations": len(failures),
+        "first_failure": failures[0] if failures else None,
+        "duration_seconds": round(seconds, 3),
+        "iterations_per_second": round(requests / seconds, 2) if seconds else 0.0,
+        "endpoints": {name: stats.summary(seconds) for name, stats in sorted(session.endpoints.items())},
+    }
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, parameters: dict, scenarios: Dict[str, dict]) -> dict:
+    """Write a results document (commit, environment, parameters, scenarios) to `path`"""
+    results = {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parameters": parameters,
+        "scenarios": scenarios,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(results, file, indent=2)
+    return results
+
+
+def default_results_path() -> str:
+    commit = (_git("rev-parse", "--short", "HEAD") or "unknown") + ("-dirty" if _git("status", "--porcelain", "--untracked-files=no") else "")
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", f"load-{commit}.json")
+
+
+def print_report(scenarios: Dict[str, dict]) -> None:
+    print(f"{'scenario / endpoint':<62} {'req':>6} {'err':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, scenario in scenarios.items():
+        failed = f", {scenario['failed_iterations']} failed ({scenario['first_failure']})" if scenario["failed_iterations"] else ""
+        print(f"{name} (concurrency {scenario['concurrency']}, {scenario['iterations_per_second']} iterations/s{failed})")
+        for endpoint, stats in scenario["endpoints"].items():
+            print(f"  {endpoint:<60} {stats['requests']:>6} {stats['errors']:>4} {stats['requests_per_second']:>8.1f} "
+                  f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+
+
+def compare(baseline: dict, candidate: dict, threshold: float = 10.0) -> List[str]:
+    """
+    Print per-endpoint changes between two results documents and return the
+    regressions: p50/p95/p99 up, or requests/sec down, by more than
+    `threshold` percent, or new errors.
+    """
+    regressions = []
+    print(f"baseline {str(baseline.get('commit'))[:10]} -> candidate {str(candidate.get('commit'))[:10]}")
+    for name, scenario in candidate["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name}: not in baseline")
+            continue
+        for endpoint, stats in scenario["endpoints"].items():
+            old = before["endpoints"].get(endpoint)
+            if old is None:
+                continue
+            changes = []
+            for metric, worse in (("p50_ms", 1), ("p95_ms", 1), ("p99_ms", 1), ("requests_per_second", -1)):
+                if not old[metric]:
+                    continue
+                change = (stats[metric] - old[metric]) / old[metric] * 100
+                changes.append(f"{metric} {old[metric]:.2f}->{stats[metric]:.2f} ({change:+.1f}%)")
+                if change * worse > threshold:
+                    regressions.append(f"{name} {endpoint} {metric} {change:+.1f}%")
+            if stats["errors"] > old["errors"]:
+                regressions.append(f"{name} {endpoint} errors {old['errors']}->{stats['errors']}")
+            print(f"{name} {endpoint}: " + ", ".join(changes))
+    return regressions
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(2)
+    with open(sys.argv[1]) as file:
+        baseline = json.load(file)
+    with open(sys.argv[2]) as file:
+        candidate = json.load(file)
+    threshold = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    regressions = compare(baseline, candidate, threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {threshold}%:")
+        print("\n".join(f"  {line}" for line in regressions))
+        sys.exit(1)
+    print(f"\nno regressions over {threshold}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Deterministic synthetic data for the benchmarks: AWS Transcribe output of
+any length, knowledge-base documents and audio uploads. The same arguments
+always produce the same data, so runs on different commits compare.
+"""
+import random
+import struct
+from typing import List
+
+AGENT_LINES = [
+    "thank you for calling how can I help you today",
+    "I can see the duplicate charge on your account",
+    "let me check the tracking number for that order",
+    "I have sent a password reset link to your email",
+    "the refund will reach your card within five business days",
+    "is there anything else I can help you with",
+    "I will open a ticket with our technical team",
+    "can you confirm the email address on the account",
+]
+CUSTOMER_LINES = [
+    "hi I was charged twice for my order last week",
+    "my package still has not arrived",
+    "I cannot log in to my account",
+    "the internet keeps dropping every evening",
+    "yes that is the right address",
+    "okay thank you that helps a lot",
+    "I already restarted the router twice",
+    "when will the refund show up",
+]
+DOCUMENT_TOPICS = {
+    "Refund policy": "refunds duplicate charges card statement billing cycle chargeback dispute",
+    "Password resets": "password reset link email verification account lockout two factor",
+    "Delivery delays": "tracking number carrier investigation late package delivery window",
+    "Router troubleshooting": "power cycle router line test technician visit outage restoration",
+    "Plan changes": "upgrade downgrade proration next bill subscription cancellation",
+}
+FILLER = "the a customer agent please note that when if then order account team policy step".split()
+
+
+def transcribe_output(job_id: str, words: int = 1000, speakers: int = 2, seed: int = 0) -> dict:
+    """
+    Raw AWS Transcribe output (the JSON written to the output bucket) for a
+    call of about `words` spoken words, alternating between `speakers`.
+
+    Turns have natural pauses, some long enough to split a phrase, and a few
+    overlapping starts (interruptions), so grouping and conversation
+    analytics do real work.
+    """
+    rng = random.Random(f"{seed}:{job_id}")
+    items, segments, spoken = [], [], []
+    clock = rng.uniform(0.2, 1.0)
+    speaker = 0
+    while len(spoken) < words:
+        lines = AGENT_LINES if speaker == 0 else CUSTOMER_LINES
+        turn = " ".join(rng.choice(lines) for _ in range(rng.randint(1, 3))).split()[:words - len(spoken)]
+        label = f"spk_{speaker}"
+        turn_start = clock
+        turn_items = []
+        for position, word in enumerate(turn):
+            if position and rng.random() < 0.03:
+                # Mid-turn hesitation, longer than the phrase grouping threshold
+                clock += rng.uniform(1.1, 2.0)
+            start, end = clock, clock + rng.uniform(0.15, 0.55)
+            clock = end + rng.uniform(0.0, 0.12)
+            items.append({
+                "id": len(items),
+                "type": "pronunciation",
+                "alternatives": [{"confidence": f"{rng.uniform(0.85, 1.0):.4f}", "content": word}],
+                "start_time": f"{start:.3f}",
+                "end_time": f"{end:.3f}",
+                "speaker_label": label,
+            })
+            turn_items.append({"start_time": f"{start:.3f}", "end_time": f"{end:.3f}", "speaker_label": label})
+            spoken.append(word)
+        items.append({
+            "id": len(items),
+            "type": "punctuation",
+            "alternatives": [{"confidence": "0.0", "content": "."}],
+            "speaker_label": label,
+        })
+        segments.append({
+            "start_time": f"{turn_start:.3f}",
+            "end_time": turn_items[-1]["end_time"],
+            "speaker_label": label,
+            "items": turn_items,
+        })
+        speaker = (speaker + 1) % speakers
+        # Usually a pause before the other side answers, sometimes they talk over the end
+        clock += rng.uniform(-0.4, 0.0) if rng.random() < 0.1 else rng.uniform(0.2, 1.5)
+
+    return {
+        "jobName": job_id,
+        "accountId": "000000000000",
+        "status": "COMPLETED",
+        "results": {
+            "transcripts": [{"transcript": " ".join(spoken)}],
+            "speaker_labels": {"channel_label": "ch_0", "speakers": speakers, "segments": segments},
+            "items": items,
+        },
+    }
+
+
+def documents(count: int, words: int = 200, seed: int = 0) -> List[dict]:
+    """Knowledge-base documents (DocumentCreate payloads) of about `words` words each"""
+    rng = random.Random(seed)
+    topics = list(DOCUMENT_TOPICS.items())
+    result = []
+    for i in range(count):
+        title, vocabulary = topics[i % len(topics)]
+        body = rng.choices(vocabulary.split() + FILLER, k=words)
+        result.append({"title": f"{title} #{i}", "content": " ".join(body), "source": "Synthetic KB"})
+    return result
+
+
+def wav_bytes(size: int, seed: int = 0) -> bytes:
+    """A `size`-byte mono 16 kHz PCM WAV file of noise; different seeds give different content hashes"""
+    data = random.Random(seed).randbytes(max(0, size - 44))
+    header = b"RIFF" + struct.pack("<I", 36 + len(data)) + b"WAVEfmt " + struct.pack(
+        "<IHHIIHH", 16, 1, 1, 16000, 32000, 2, 16
+    ) + b"data" + struct.pack("<I", len(data))
+    return header + data
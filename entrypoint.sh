@@ -1,7 +1,21 @@
 #!/bin/sh
 
+# Gunicorn workers share /metrics through per-worker snapshot files; start each run clean
+reset_metrics_dir() {
+    export METRICS_MULTIPROC_DIR="${METRICS_MULTIPROC_DIR:-/tmp/nexus-metrics}"
+    rm -rf "$METRICS_MULTIPROC_DIR"
+    mkdir -p "$METRICS_MULTIPROC_DIR"
+}
+
+# ROLE=worker runs the job worker instead of the API (same image and settings)
+if [ "$ROLE" = "worker" ]; then
+    echo "Running the job worker"
+    exec python -m app.jobs.worker
+fi
+
 if [ "$ENV" = "production" ]; then
     echo "Running in production mode with Gunicorn"
+    reset_metrics_dir
     exec gunicorn -k uvicorn.workers.UvicornWorker main:app \
         --bind 0.0.0.0:8003 \
         --workers 1 \
@@ -9,6 +23,7 @@ if [ "$ENV" = "production" ]; then
         --timeout 120
 elif [ "$ENV" = "testing" ]; then
     echo "Running in testing mode with Gunicorn"
+    reset_metrics_dir
     exec gunicorn -k uvicorn.workers.UvicornWorker main:app \
         --bind 0.0.0.0:8002 \
         --workers 1 \
@@ -1,20 +1,127 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
 from sqlmodel import SQLModel
 
 from app.api.v1.endpoints import documents as documents_v1, helloGemini
 from app.call import call_router
+from app.core.admission import AdmissionMiddleware, admission
+from app.core.clients import clients
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import get_async_engine, get_async_session_factory
+from app.core.log import configure_logging
+from app.core.metrics import MetricsMiddleware, metrics_registry
+from app.core.responses import FastJSONResponse
+from app.core.tracing import TracingMiddleware, tracer
+from app.core.warmup import warmup
+from app.dashboard import dashboard_router
+from app.jobs import job_router
+from app.kpi import kpi_router
+from app.resolutions import resolution_router
+from app.search import search_router
+from app.traces import trace_router
 from app.transcribe import transcribe_router
 
+# JSON log lines written off the request path; uvicorn's access log goes through the same handler
+configure_logging()
+
 # def init_db():
 #     if settings.ENV == "development":
 #         SQLModel.metadata.create_all(engine)
 #
 # init_db()
+
+
+async def warm_database():
+    """Open pooled connections now so the first requests do not pay for connecting"""
+    engine = get_async_engine()
+
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(max(1, min(settings.WARMUP_DB_CONNECTIONS, settings.DB_POOL_SIZE)))))
+
+
+async def warm_resolution_index():
+    """Load the recommendation index and run a sample query against the largest shards"""
+    index = resolution_router.resolution_index
+    await index.ensure_loaded(get_async_session_factory())
+    for company_id, department_id in index.shard_keys()[:3]:
+        index.search(company_id, [settings.WARMUP_RESOLUTION_QUERY], department_id)
+
+
+async def warm_clients():
+    """Build the AWS and OpenAI clients (service models, connection pools) without calling them"""
+    errors = await run_in_threadpool(clients.create_all)
+    if errors:
+        raise RuntimeError("; ".join(f"{name}: {error}" for name, error in errors.items()))
+
+
+async def warm_meeting_pool():
+    pool = call_router.meeting_pool
+    while pool.available < pool.size:
+        await asyncio.sleep(0.05)
+
+
+async def warm_requests():
+    """Replay representative GETs in-process; they skip the middleware, so they are not in request metrics"""
+    import httpx
+
+    async def router(scope, receive, send):
+        scope["app"] = app
+        await app.router(scope, receive, send)
+
+    transport = httpx.ASGITransport(app=router)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        for path in settings.WARMUP_PATHS:
+            try:
+                status_code = (await client.get(path)).status_code
+            except HTTPException as e:
+                # Without the exception middleware an HTTPException reaches us as raised
+                status_code = e.status_code
+            if status_code >= 500:
+                raise RuntimeError(f"GET {path} returned {status_code}")
+
+
+warmup.add("database", warm_database)
+warmup.add("resolution_index", warm_resolution_index)
+warmup.add("clients", warm_clients, required=False)
+if call_router.meeting_pool:
+    warmup.add("meeting_pool", warm_meeting_pool, required=False)
+warmup.add("requests", warm_requests, required=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background helpers on startup and stop them on shutdown"""
+    await metrics_registry.start()
+    if call_router.meeting_pool:
+        await call_router.meeting_pool.start()
+    await resolution_router.resolution_index.start(get_async_session_factory())
+    # Serves right away but reports unready on /health/ready until warmup is done
+    await warmup.start()
+    yield
+    await warmup.stop()
+    await resolution_router.resolution_index.stop()
+    if call_router.meeting_pool:
+        await call_router.meeting_pool.stop()
+    await transcribe_router.job_tracker.stop()
+    await metrics_registry.stop()
+    await run_in_threadpool(tracer.exporter.close)
+    await run_in_threadpool(clients.close)
+
+
 # Initialize FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
+    # orjson encoding for every endpoint that returns plain data
+    default_response_class=FastJSONResponse,
     title=settings.APP_NAME,
     version=settings.PROJECT_VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json", # Standard OpenAPI doc path
@@ -45,6 +152,10 @@ origins = [
 
 ]
 
+# Admission control for expensive endpoint classes (uploads, LLM calls). Added
+# before CORS so it runs inside it: shed responses still carry CORS headers
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins, # Specific origins allowed
@@ -53,6 +164,10 @@ app.add_middleware(
     allow_headers=["*"],    # Allows all headers
 )
 
+# Added last so they wrap everything else and time the full request
+app.add_middleware(TracingMiddleware, tracer=tracer)
+app.add_middleware(MetricsMiddleware, registry=metrics_registry)
+
 # Include API routers
 # All document-related endpoints will be prefixed with /api/v1/documents
 app.include_router(
@@ -64,6 +179,12 @@ app.include_router(
 app.include_router(helloGemini.router)
 app.include_router(call_router.router)
 app.include_router(transcribe_router.router)
+app.include_router(kpi_router.router)
+app.include_router(dashboard_router.router)
+app.include_router(search_router.router)
+app.include_router(resolution_router.router)
+app.include_router(trace_router.router)
+app.include_router(job_router.router)
 
 # Root endpoint for basic API health check or welcome message
 @app.get("/", tags=["Root"])
@@ -77,22 +198,29 @@ async def read_root():
         "documentation_url": "/docs" # FastAPI's default Swagger UI
     }
 
+# Prometheus scrape endpoint (all workers when METRICS_MULTIPROC_DIR is set)
+@app.get("/metrics", tags=["Health Check"], response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(
+        await metrics_registry.render_async(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+# Liveness probe: the process is serving; never depends on warmup or backing services
+@app.get("/health/live", tags=["Health Check"])
+async def liveness():
+    return {"status": "alive"}
+
+# Readiness probe: 503 until warmup has finished (and while draining), so the
+# load balancer only sends traffic to warm workers
+@app.get("/health/ready", tags=["Health Check"])
+async def readiness():
+    return JSONResponse(warmup.status(), status_code=200 if warmup.ready else 503)
+
 # A simple status endpoint within your API version prefix
 @app.get(f"{settings.API_V1_STR}/status", tags=["Health Check"])
 async def get_api_status():
     """
     Provides a simple status check for the API, confirming it's operational.
     """
-    return {"status": "NEXUS API v1 is up and running!"}
-
-# Placeholder for application startup/shutdown events (e.g., init DB connections, ML models)
-# @app.on_event("startup")
-# async def on_startup():
-#     print("NEXUS API starting up...")
-#     # PlaceholderDBDocument.initialize_dummy_data() # Ensure dummy data if using in-memory store
-#     # Initialize database connection pools, load ML models, etc.
-#
-# @app.on_event("shutdown")
-# async def on_shutdown():
-#     print("NEXUS API shutting down...")
-#     # Clean up resources, close database connections, etc.
\ No newline at end of file
+    return {"status": "NEXUS API v1 is up and running!", "ready": warmup.ready, "admission": admission.status()}